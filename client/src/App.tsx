@@ -1,3 +1,4 @@
+import AutosaveFailures from "./components/autosavefailures";
 import LiberationMap from "./components/liberationmap";
 import useEventStream from "./hooks/useEventSteam";
 import useInitialGameState from "./hooks/useInitialGameState";
@@ -9,6 +10,7 @@ function App() {
   return (
     <div className="App">
       <LiberationMap />
+      <AutosaveFailures />
     </div>
   );
 }
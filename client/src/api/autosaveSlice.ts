@@ -0,0 +1,40 @@
+import { RootState } from "../app/store";
+import { gameUnloaded } from "./actions";
+import { PayloadAction, createSlice } from "@reduxjs/toolkit";
+
+interface AutosaveState {
+  failed: string[];
+}
+
+const initialState: AutosaveState = {
+  failed: [],
+};
+
+export const autosaveSlice = createSlice({
+  name: "autosave",
+  initialState,
+  reducers: {
+    failed: (state, action: PayloadAction<string[]>) => {
+      for (const name of action.payload) {
+        if (!state.failed.includes(name)) {
+          state.failed.push(name);
+        }
+      }
+    },
+    dismissed: (state) => {
+      state.failed = initialState.failed;
+    },
+  },
+  extraReducers: (builder) => {
+    builder.addCase(gameUnloaded, (state) => {
+      state.failed = initialState.failed;
+    });
+  },
+});
+
+export const { failed: autosavesFailed, dismissed: autosaveFailuresDismissed } =
+  autosaveSlice.actions;
+
+export const selectFailedAutosaves = (state: RootState) => state.autosave.failed;
+
+export default autosaveSlice.reducer;
@@ -13,6 +13,6 @@ export const backend = axios.create({
   baseURL: HTTP_URL,
 });
 
-export const WEBSOCKET_URL = `ws://${backendAddr}/eventstream`;
+export const WEBSOCKET_URL = `ws://${backendAddr}/eventstream?format=compact`;
 
 export default backend;
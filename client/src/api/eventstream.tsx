@@ -1,5 +1,6 @@
 import { AppDispatch } from "../app/store";
 import { gameUnloaded } from "./actions";
+import { autosavesFailed } from "./autosaveSlice";
 import Combat from "./combat";
 import { endCombats, newCombats, updateCombats } from "./combatSlice";
 import { updateControlPoint } from "./controlPointsSlice";
@@ -55,8 +56,54 @@ interface GameUpdateEvents {
   reset_on_map_center: LatLng | null;
   game_unloaded: boolean;
   new_turn: boolean;
+  autosaves_completed: string[];
+  autosaves_failed: string[];
 }
 
+// The compact event stream format omits empty fields and sends flight positions as
+// flat arrays. See game/server/eventstream/wireformat.py.
+interface CompactGameUpdateEvents
+  extends Partial<Omit<GameUpdateEvents, "updated_flight_positions">> {
+  flight_positions?: { ids: string[]; coords: number[] };
+}
+
+export const decodeCompactEvents = (
+  events: CompactGameUpdateEvents
+): GameUpdateEvents => {
+  const positions: { [id: string]: LatLng } = {};
+  if (events.flight_positions) {
+    const { ids, coords } = events.flight_positions;
+    ids.forEach((id, i) => {
+      positions[id] = { lat: coords[2 * i], lng: coords[2 * i + 1] } as LatLng;
+    });
+  }
+  return {
+    updated_flight_positions: positions,
+    new_combats: events.new_combats ?? [],
+    updated_combats: events.updated_combats ?? [],
+    ended_combats: events.ended_combats ?? [],
+    navmesh_updates: events.navmesh_updates ?? [],
+    updated_unculled_zones: events.updated_unculled_zones ?? [],
+    threat_zones_updated: events.threat_zones_updated ?? [],
+    new_flights: events.new_flights ?? [],
+    updated_flights: events.updated_flights ?? [],
+    deleted_flights: events.deleted_flights ?? [],
+    selected_flight: events.selected_flight ?? null,
+    deselected_flight: events.deselected_flight ?? false,
+    updated_front_lines: events.updated_front_lines ?? [],
+    deleted_front_lines: events.deleted_front_lines ?? [],
+    updated_tgos: events.updated_tgos ?? [],
+    updated_control_points: events.updated_control_points ?? [],
+    updated_iads: events.updated_iads ?? [],
+    deleted_iads: events.deleted_iads ?? [],
+    reset_on_map_center: events.reset_on_map_center ?? null,
+    game_unloaded: events.game_unloaded ?? false,
+    new_turn: events.new_turn ?? false,
+    autosaves_completed: events.autosaves_completed ?? [],
+    autosaves_failed: events.autosaves_failed ?? [],
+  };
+};
+
 export const handleStreamedEvents = (
   dispatch: AppDispatch,
   events: GameUpdateEvents
@@ -146,4 +193,8 @@ export const handleStreamedEvents = (
   if (events.new_turn) {
     reloadGameState(dispatch, true);
   }
+
+  if (events.autosaves_failed.length > 0) {
+    dispatch(autosavesFailed(events.autosaves_failed));
+  }
 };
@@ -1,3 +1,4 @@
+import autosaveReducer from "../api/autosaveSlice";
 import { baseApi } from "../api/baseApi";
 import combatReducer from "../api/combatSlice";
 import controlPointsReducer from "../api/controlPointsSlice";
@@ -19,6 +20,7 @@ import {
 } from "@reduxjs/toolkit";
 
 const rootReducer = combineReducers({
+  autosave: autosaveReducer,
   combat: combatReducer,
   controlPoints: controlPointsReducer,
   flights: flightsReducer,
@@ -0,0 +1,27 @@
+import { autosavesFailed } from "../../api/autosaveSlice";
+import { renderWithProviders } from "../../testutils";
+import AutosaveFailures from "./AutosaveFailures";
+import { act, fireEvent, screen } from "@testing-library/react";
+
+describe("AutosaveFailures", () => {
+  it("is hidden until a save fails", () => {
+    const { store } = renderWithProviders(<AutosaveFailures />);
+    expect(screen.queryByRole("alert")).toBeNull();
+
+    act(() => {
+      store.dispatch(autosavesFailed(["start_of_turn.liberation"]));
+    });
+    expect(screen.getByRole("alert")).toHaveTextContent(
+      "start_of_turn.liberation"
+    );
+  });
+
+  it("can be dismissed", () => {
+    const { store } = renderWithProviders(<AutosaveFailures />);
+    act(() => {
+      store.dispatch(autosavesFailed(["last_turn.liberation"]));
+    });
+    fireEvent.click(screen.getByText("Dismiss"));
+    expect(screen.queryByRole("alert")).toBeNull();
+  });
+});
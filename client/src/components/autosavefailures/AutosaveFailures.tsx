@@ -0,0 +1,22 @@
+import {
+  autosaveFailuresDismissed,
+  selectFailedAutosaves,
+} from "../../api/autosaveSlice";
+import { useAppDispatch, useAppSelector } from "../../app/hooks";
+import "./AutosaveFailures.css";
+
+export default function AutosaveFailures() {
+  const dispatch = useAppDispatch();
+  const failed = useAppSelector(selectFailedAutosaves);
+  if (failed.length === 0) {
+    return <></>;
+  }
+  return (
+    <div className="autosave-failures" role="alert">
+      Failed to write {failed.join(", ")}. See the log for details.
+      <button onClick={() => dispatch(autosaveFailuresDismissed())}>
+        Dismiss
+      </button>
+    </div>
+  );
+}
@@ -1,71 +1,37 @@
-import { useGetTerrainZonesQuery } from "../../api/liberationApi";
-import { LatLngLiteral } from "leaflet";
-import { LayerGroup, LayersControl, Polygon } from "react-leaflet";
+import { HTTP_URL } from "../../api/backend";
+import { selectMapCenter } from "../../api/mapSlice";
+import { useAppSelector } from "../../app/hooks";
+import { LayersControl, TileLayer } from "react-leaflet";
 
 interface TerrainZoneLayerProps {
-  zones: LatLngLiteral[][][];
-  color: string;
-  fillColor: string;
+  layer: string;
 }
 
+// The landmaps are drawn from tiles rendered by the server. The detailed landmaps
+// have far too many points to draw as polygons.
 function TerrainZoneLayer(props: TerrainZoneLayerProps) {
+  // Tile URLs are the same for every game, so include the map center to make Leaflet
+  // load new tiles when a game with a different theater is loaded.
+  const center = useAppSelector(selectMapCenter);
   return (
-    <LayerGroup>
-      {props.zones.map((poly, idx) => {
-        return (
-          <Polygon
-            key={idx}
-            positions={poly}
-            color={props.color}
-            fillColor={props.fillColor}
-            fillOpacity={1}
-            interactive={false}
-          />
-        );
-      })}
-    </LayerGroup>
+    <TileLayer
+      url={`${HTTP_URL}map-zones/terrain/tiles/{z}/{x}/{y}.png?layer=${props.layer}&center=${center.lat},${center.lng}`}
+    />
   );
 }
 
 export default function TerrainZonesLayers() {
-  const { data, error, isLoading } = useGetTerrainZonesQuery();
-  var exclusion = <></>;
-  var inclusion = <></>;
-  var sea = <></>;
-
-  if (error) {
-    console.error("Error while loading terrain zones", error);
-  } else if (isLoading) {
-  } else if (!data) {
-    console.log("Empty response when loading terrain zones");
-  } else {
-    exclusion = (
-      <TerrainZoneLayer
-        zones={data.exclusion}
-        color="#969696"
-        fillColor="#303030"
-      />
-    );
-    inclusion = (
-      <TerrainZoneLayer
-        zones={data.inclusion}
-        color="#969696"
-        fillColor="#4b4b4b"
-      />
-    );
-    sea = (
-      <TerrainZoneLayer zones={data.sea} color="#344455" fillColor="#344455" />
-    );
-  }
   return (
     <>
       <LayersControl.Overlay name="Inclusion zones">
-        {inclusion}
+        <TerrainZoneLayer layer="inclusion" />
       </LayersControl.Overlay>
       <LayersControl.Overlay name="Exclusion zones">
-        {exclusion}
+        <TerrainZoneLayer layer="exclusion" />
+      </LayersControl.Overlay>
+      <LayersControl.Overlay name="Sea zones">
+        <TerrainZoneLayer layer="sea" />
       </LayersControl.Overlay>
-      <LayersControl.Overlay name="Sea zones">{sea}</LayersControl.Overlay>
     </>
   );
 }
@@ -1,4 +1,7 @@
-import { handleStreamedEvents } from "../api/eventstream";
+import {
+  decodeCompactEvents,
+  handleStreamedEvents,
+} from "../api/eventstream";
 import { useAppDispatch } from "../app/hooks";
 import { useSocket } from "./useSocket";
 import { useCallback, useEffect } from "react";
@@ -9,7 +12,10 @@ export const useEventStream = () => {
 
   const onMessage = useCallback(
     (message: MessageEvent) => {
-      handleStreamedEvents(dispatch, JSON.parse(message.data));
+      handleStreamedEvents(
+        dispatch,
+        decodeCompactEvents(JSON.parse(message.data))
+      );
     },
     [dispatch]
   );
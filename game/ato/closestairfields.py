@@ -1,43 +1,171 @@
 """Objective adjacency lists."""
 from __future__ import annotations
 
-from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import Iterator, List, Optional, TYPE_CHECKING, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
 
 from game.utils import Distance
 
 if TYPE_CHECKING:
     from game.theater import ConflictTheater, ControlPoint, MissionTarget
 
+MissionTargetT = TypeVar("MissionTargetT", bound="MissionTarget")
 
-class ClosestAirfields:
-    """Precalculates which control points are closes to the given target."""
+
+def target_coords(targets: Iterable[MissionTarget]) -> NDArray[np.float64]:
+    return np.array(
+        [(t.position.x, t.position.y) for t in targets], dtype=float
+    ).reshape(-1, 2)
+
+
+class ControlPointDistances:
+    """Distances between mission targets and every control point in the theater.
+
+    The distances from every TGO, control point and front line are computed together
+    when the matrix is built. Distances from any other target are computed when they
+    are queried. Carriers and front lines move between turns, so the matrix is rebuilt
+    each turn.
+
+    Whether each control point is operational is kept in a bitmask rather than checked
+    whenever the closest operational airfields are searched, since checking a carrier
+    means searching its group for a living carrier. The bitmask is updated when a
+    runway is damaged or repaired. Carriers and FOBs only stop being operational as the
+    result of a mission, after which the matrix is rebuilt for the next turn.
+    """
 
     def __init__(
-        self, target: MissionTarget, all_control_points: List[ControlPoint]
+        self, control_points: List[ControlPoint], targets: Iterable[MissionTarget]
     ) -> None:
-        self.target = target
-        # This cache is configured once on load, so it's important that it is
-        # complete and deterministic to avoid different behaviors across loads.
-        # E.g. https://github.com/dcs-liberation/dcs_liberation/issues/819
-        self.closest_airfields: List[ControlPoint] = sorted(
-            all_control_points, key=lambda c: self.target.distance_to(c)
+        self.control_points = control_points
+        self._columns = {id(cp): i for i, cp in enumerate(control_points)}
+        self._control_point_coords = target_coords(control_points)
+        # Targets are keyed by identity rather than by name because the buildings of
+        # an objective share a name. The targets are kept referenced so that their IDs
+        # are not reused while the matrix exists.
+        self._targets = list(targets)
+        self._rows = {id(t): i for i, t in enumerate(self._targets)}
+        self._matrix = self._compute(target_coords(self._targets))
+        self._operational = 0
+        for control_point in control_points:
+            self.update_operational_status(control_point)
+
+    @classmethod
+    def for_theater(cls, theater: ConflictTheater) -> ControlPointDistances:
+        targets: list[MissionTarget] = list(theater.controlpoints)
+        targets.extend(theater.ground_objects)
+        targets.extend(theater.conflicts())
+        return ControlPointDistances(list(theater.controlpoints), targets)
+
+    def update_operational_status(self, control_point: ControlPoint) -> None:
+        bit = 1 << self._columns[id(control_point)]
+        if control_point.runway_is_operational():
+            self._operational |= bit
+        else:
+            self._operational &= ~bit
+
+    def is_operational(self, index: int) -> bool:
+        """True if the control point at the given index is operational."""
+        return bool(self._operational >> index & 1)
+
+    def _compute(self, coords: NDArray[np.float64]) -> NDArray[np.float64]:
+        deltas = coords[:, np.newaxis, :] - self._control_point_coords[np.newaxis]
+        return np.hypot(deltas[..., 0], deltas[..., 1])
+
+    def distances(self, targets: Sequence[MissionTarget]) -> NDArray[np.float64]:
+        """Returns the distance in meters from each target to each control point.
+
+        The result has a row for each target and a column for each control point, in
+        the order of the theater's control points.
+        """
+        known: list[int] = []
+        known_rows: list[int] = []
+        unknown: list[int] = []
+        for i, target in enumerate(targets):
+            row = self._rows.get(id(target))
+            if row is None:
+                unknown.append(i)
+            else:
+                known.append(i)
+                known_rows.append(row)
+        if not unknown:
+            return self._matrix[known_rows]
+        result = np.empty((len(targets), len(self.control_points)))
+        result[known] = self._matrix[known_rows]
+        result[unknown] = self._compute(target_coords(targets[i] for i in unknown))
+        return result
+
+    def _column_mask(self, control_points: Iterable[ControlPoint]) -> NDArray[np.bool_]:
+        mask = np.zeros(len(self.control_points), dtype=bool)
+        mask[[self._columns[id(cp)] for cp in control_points]] = True
+        return mask
+
+    def nearest_distances(
+        self,
+        targets: Sequence[MissionTarget],
+        control_points: Iterable[ControlPoint],
+    ) -> NDArray[np.float64]:
+        """Returns the distance from each target to the closest of control_points.
+
+        The distance is infinite if control_points is empty.
+        """
+        mask = self._column_mask(control_points)
+        if not targets or not mask.any():
+            return np.full(len(targets), np.inf)
+        return self.distances(targets)[:, mask].min(axis=1)
+
+    def sorted_by_distance(
+        self,
+        targets: Iterable[MissionTargetT],
+        control_points: Iterable[ControlPoint],
+    ) -> list[MissionTargetT]:
+        """Sorts the targets by their distance to the closest of control_points.
+
+        Targets that are the same distance away keep their order.
+        """
+        targets = list(targets)
+        order = np.argsort(
+            self.nearest_distances(targets, control_points), kind="stable"
         )
+        return [targets[i] for i in order]
+
+
+class ClosestAirfields:
+    """The control points in order of their distance from the given target."""
+
+    def __init__(self, target: MissionTarget, distances: ControlPointDistances) -> None:
+        self.target = target
+        self._distances = distances
+        row = distances.distances([target])[0]
+        order = np.argsort(row, kind="stable")
+        self._order: list[int] = order.tolist()
+        self._sorted_distances: list[float] = row[order].tolist()
+
+    @property
+    def closest_airfields(self) -> List[ControlPoint]:
+        return [self._distances.control_points[i] for i in self._order]
+
+    def _airfields(self, operational: bool) -> Iterator[tuple[float, ControlPoint]]:
+        control_points = self._distances.control_points
+        for index, distance in zip(self._order, self._sorted_distances):
+            if not operational or self._distances.is_operational(index):
+                yield distance, control_points[index]
 
     @property
     def operational_airfields(self) -> Iterator[ControlPoint]:
-        return (c for c in self.closest_airfields if c.runway_is_operational())
+        return (cp for _, cp in self._airfields(operational=True))
 
     def _airfields_within(
         self, distance: Distance, operational: bool
     ) -> Iterator[ControlPoint]:
-        airfields = (
-            self.operational_airfields if operational else self.closest_airfields
-        )
-        for cp in airfields:
-            if cp.distance_to(self.target) < distance.meters:
-                yield cp
-            else:
+        for cp_distance, cp in self._airfields(operational):
+            if cp_distance >= distance.meters:
                 break
+            yield cp
 
     def operational_airfields_within(
         self, distance: Distance
@@ -59,22 +187,56 @@ def all_airfields_within(self, distance: Distance) -> Iterator[ControlPoint]:
 
 
 class ObjectiveDistanceCache:
+    #: The closest airfields are cached for the targets that were most recently
+    #: queried. Front lines and transfers are new targets every turn, so an unbounded
+    #: cache would grow for the length of the campaign.
+    MAX_CACHED_TARGETS = 1024
+
     theater: Optional[ConflictTheater] = None
-    closest_airfields: Dict[str, ClosestAirfields] = {}
+    closest_airfields: OrderedDict[str, ClosestAirfields] = OrderedDict()
+    _distances: Optional[ControlPointDistances] = None
+    _lock = threading.Lock()
 
     @classmethod
     def set_theater(cls, theater: ConflictTheater) -> None:
-        if cls.theater is not None:
-            cls.closest_airfields = {}
         cls.theater = theater
+        cls.invalidate_distances()
 
     @classmethod
-    def get_closest_airfields(cls, location: MissionTarget) -> ClosestAirfields:
+    def distances(cls) -> ControlPointDistances:
+        """Returns the distance matrix between mission targets and control points."""
         if cls.theater is None:
             raise RuntimeError("Call ObjectiveDistanceCache.set_theater before using")
+        if cls._distances is None:
+            cls._distances = ControlPointDistances.for_theater(cls.theater)
+        return cls._distances
 
-        if location.name not in cls.closest_airfields:
-            cls.closest_airfields[location.name] = ClosestAirfields(
-                location, cls.theater.controlpoints
-            )
-        return cls.closest_airfields[location.name]
+    @classmethod
+    def invalidate_distances(cls) -> None:
+        """Discards the distance matrix so that it is rebuilt when next used.
+
+        Called at the start of each turn, since carriers and front lines move, and
+        front lines are created and removed when bases change hands.
+        """
+        cls._distances = None
+        cls.closest_airfields = OrderedDict()
+
+    @classmethod
+    def update_operational_status(cls, control_point: ControlPoint) -> None:
+        """Updates the distance matrix after a runway is damaged or repaired."""
+        if cls._distances is not None:
+            cls._distances.update_operational_status(control_point)
+
+    @classmethod
+    def get_closest_airfields(cls, location: MissionTarget) -> ClosestAirfields:
+        # Both coalitions' threat zones may be computed at once.
+        with cls._lock:
+            closest = cls.closest_airfields.get(location.name)
+            if closest is None:
+                closest = ClosestAirfields(location, cls.distances())
+                cls.closest_airfields[location.name] = closest
+                if len(cls.closest_airfields) > cls.MAX_CACHED_TARGETS:
+                    cls.closest_airfields.popitem(last=False)
+            else:
+                cls.closest_airfields.move_to_end(location.name)
+            return closest
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime
 from typing import Any, Optional, TYPE_CHECKING, Dict
 
@@ -10,6 +11,7 @@
 from game.campaignloader.defaultsquadronassigner import DefaultSquadronAssigner
 from game.commander import TheaterCommander
 from game.commander.missionscheduler import MissionScheduler
+from game.commander.theatercommander import PlanningRound
 from game.income import Income
 from game.navmesh import NavMesh
 from game.orderedset import OrderedSet
@@ -107,7 +109,10 @@ def __getstate__(self) -> dict[str, Any]:
 
     def __setstate__(self, state: dict[str, Any]) -> None:
         self.__dict__.update(state)
-        # Regenerate any state that was not persisted.
+        # Regenerate any state that was not persisted. The threat zones and navmesh
+        # are recomputed by Game.on_load.
+        self._threat_zone = None
+        self._navmesh = None
         self.on_load()
 
     def on_load(self) -> None:
@@ -131,6 +136,14 @@ def compute_threat_zones(self, events: GameUpdateEvents) -> None:
         events.update_threat_zones(self.player, self._threat_zone)
 
     def compute_nav_meshes(self, events: GameUpdateEvents) -> None:
+        if self._navmesh is not None:
+            stats = self._navmesh.path_cache_stats
+            logging.debug(
+                "%s navmesh path cache had %d hits and %d misses",
+                "Blue" if self.player else "Red",
+                stats.hits,
+                stats.misses,
+            )
         self._navmesh = NavMesh.from_threat_zones(
             self.opponent.threat_zone, self.game.theater
         )
@@ -177,6 +190,13 @@ def initialize_turn(self, is_turn_0: bool) -> None:
         For more information on turn initialization in general, see the documentation
         for `Game.initialize_turn`.
         """
+        self.prepare_turn()
+        if not is_turn_0:
+            self.plan_missions(self.game.conditions.start_time)
+        self.plan_procurement()
+
+    def prepare_turn(self) -> None:
+        """Clears the previous plans of the coalition and plans its transports."""
         # Needs to happen *before* planning transfers so we don't cancel them.
         self.ato.clear()
         self.air_wing.reset()
@@ -190,10 +210,6 @@ def initialize_turn(self, is_turn_0: bool) -> None:
         with logged_duration("Transport planning"):
             self.transfers.plan_transports(self.game.conditions.start_time)
 
-        if not is_turn_0:
-            self.plan_missions(self.game.conditions.start_time)
-        self.plan_procurement()
-
     def refund_outstanding_orders(self) -> None:
         # TODO: Split orders between air and ground units.
         # This isn't quite right. If the player has ground purchases automated we should
@@ -207,12 +223,30 @@ def refund_outstanding_orders(self) -> None:
         for squadron in self.air_wing.iter_squadrons():
             squadron.refund_orders()
 
-    def plan_missions(self, now: datetime) -> None:
+    def search_missions(self, now: datetime) -> PlanningRound:
+        """Finds the first mission plan of the turn without executing it.
+
+        See TheaterCommander.begin_planning. The plan is executed by plan_missions.
+        """
         color = "Blue" if self.player else "Red"
-        with MultiEventTracer() as tracer:
+        tracer = MultiEventTracer()
+        with tracer.trace(f"{color} mission search"):
+            return TheaterCommander(self.game, self.player).begin_planning(now, tracer)
+
+    def plan_missions(
+        self, now: datetime, first_round: Optional[PlanningRound] = None
+    ) -> None:
+        color = "Blue" if self.player else "Red"
+        if first_round is None:
+            tracer = MultiEventTracer()
+        else:
+            tracer = first_round.start.context.tracer
+        with tracer:
             with tracer.trace(f"{color} mission planning"):
                 with tracer.trace(f"{color} mission identification"):
-                    TheaterCommander(self.game, self.player).plan_missions(now, tracer)
+                    TheaterCommander(self.game, self.player).plan_missions(
+                        now, tracer, first_round
+                    )
                 with tracer.trace(f"{color} mission scheduling"):
                     MissionScheduler(
                         self, self.game.settings.desired_player_mission_duration
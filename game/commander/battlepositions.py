@@ -18,11 +18,11 @@ def in_priority_order(self) -> Iterator[VehicleGroupGroundObject]:
         yield from self.blocking_capture
         yield from self.defending_front_line
 
-    def eliminate(self, battle_position: VehicleGroupGroundObject) -> None:
-        if battle_position in self.blocking_capture:
-            self.blocking_capture.remove(battle_position)
-        if battle_position in self.defending_front_line:
-            self.defending_front_line.remove(battle_position)
+    def without(self, battle_position: VehicleGroupGroundObject) -> BattlePositions:
+        return BattlePositions(
+            [bp for bp in self.blocking_capture if bp != battle_position],
+            [bp for bp in self.defending_front_line if bp != battle_position],
+        )
 
     def __contains__(self, item: VehicleGroupGroundObject) -> bool:
         return item in self.in_priority_order
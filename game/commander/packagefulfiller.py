@@ -3,7 +3,7 @@
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Iterable, Optional, Set, TYPE_CHECKING
+from typing import Dict, Iterable, Mapping, Optional, Set, TYPE_CHECKING
 
 from game.ato.airtaaskingorder import AirTaskingOrder
 from game.ato.closestairfields import ObjectiveDistanceCache
@@ -16,8 +16,8 @@
 from game.procurement import AircraftProcurementRequest
 from game.profiling import MultiEventTracer
 from game.settings import Settings
-from game.squadrons import AirWing
-from game.theater import ConflictTheater
+from game.squadrons import AirWing, Squadron
+from game.theater import ConflictTheater, ControlPoint
 from game.threatzones import ThreatZones
 
 if TYPE_CHECKING:
@@ -94,14 +94,19 @@ def plan_flight(
     ) -> None:
         if not builder.plan_flight(flight):
             missing_types.add(flight.task)
-            purchase_order = AircraftProcurementRequest(
-                near=mission.location,
-                task_capability=flight.task,
-                number=flight.num_aircraft * purchase_multiplier,
-            )
-            # Reserves are planned for critical missions, so prioritize those orders
-            # over aircraft needed for non-critical missions.
-            self.add_procurement_request(purchase_order)
+            self.request_aircraft(mission, flight, purchase_multiplier)
+
+    def request_aircraft(
+        self, mission: ProposedMission, flight: ProposedFlight, purchase_multiplier: int
+    ) -> None:
+        purchase_order = AircraftProcurementRequest(
+            near=mission.location,
+            task_capability=flight.task,
+            number=flight.num_aircraft * purchase_multiplier,
+        )
+        # Reserves are planned for critical missions, so prioritize those orders
+        # over aircraft needed for non-critical missions.
+        self.add_procurement_request(purchase_order)
 
     def scrub_mission_missing_aircraft(
         self,
@@ -128,17 +133,130 @@ def scrub_mission_missing_aircraft(
 
     def check_needed_escorts(self, builder: PackageBuilder) -> Dict[EscortType, bool]:
         threats = defaultdict(bool)
-        for flight in builder.package.flights:
-            if self.threat_zones.waypoints_threatened_by_aircraft(
-                flight.flight_plan.escorted_waypoints()
-            ):
-                threats[EscortType.AirToAir] = True
-            if self.threat_zones.waypoints_threatened_by_radar_sam(
-                list(flight.flight_plan.escorted_waypoints())
-            ):
-                threats[EscortType.Sead] = True
+        paths = [
+            self.threat_zones.waypoint_coords(flight.flight_plan.escorted_waypoints())
+            for flight in builder.package.flights
+        ]
+        if self.threat_zones.paths_threatened_by_aircraft(paths).any():
+            threats[EscortType.AirToAir] = True
+        if self.threat_zones.paths_threatened_by_radar_sam(paths).any():
+            threats[EscortType.Sead] = True
         return threats
 
+    def estimate_squadron(
+        self,
+        mission: ProposedMission,
+        flight: ProposedFlight,
+        reserved: Mapping[Squadron, int],
+    ) -> Optional[Squadron]:
+        """Returns the squadron that would most likely be used for the flight.
+
+        This is the squadron that PackageBuilder.plan_flight would choose, except that
+        aircraft reserved for other packages are not considered available.
+        """
+        for squadron in self.air_wing.best_squadrons_for(
+            mission.location, flight.task, flight.num_aircraft, this_turn=True
+        ):
+            if squadron.can_fulfill_flight(
+                flight.num_aircraft + reserved.get(squadron, 0)
+            ):
+                return squadron
+        return None
+
+    def estimate_escorts_needed(
+        self, mission: ProposedMission, origins: Iterable[ControlPoint]
+    ) -> Dict[EscortType, bool]:
+        """Estimates which escorts a package would need without a flight plan.
+
+        The direct routes from the package's bases to the target are checked against
+        the threat zones, rather than the escorted parts of the flight plans.
+        """
+        target = mission.location.position
+        paths = [
+            [(origin.position.x, origin.position.y), (target.x, target.y)]
+            for origin in origins
+        ]
+        return {
+            EscortType.AirToAir: bool(
+                self.threat_zones.paths_threatened_by_aircraft(paths).any()
+            ),
+            EscortType.Sead: bool(
+                self.threat_zones.paths_threatened_by_radar_sam(paths).any()
+            ),
+        }
+
+    def estimate_mission(
+        self,
+        mission: ProposedMission,
+        purchase_multiplier: int,
+        reserved: Mapping[Squadron, int],
+    ) -> Optional[dict[Squadron, int]]:
+        """Estimates whether plan_mission would be able to plan the mission.
+
+        This checks the same squadron availability and range as plan_mission without
+        creating flights or flight plans. Whether escorts are needed is estimated from
+        the threats on the direct route to the target, so plan_mission may still fail
+        if the flight plans require escorts that are not available.
+
+        Aircraft in reserved are treated as already tasked. If the mission is
+        plannable, returns the number of aircraft it would use from each squadron.
+        Otherwise the missing aircraft are requested for purchase as plan_mission
+        would and None is returned.
+        """
+        reservations: dict[Squadron, int] = defaultdict(int)
+        reservations.update(reserved)
+        missing: list[ProposedFlight] = []
+        escorts = []
+        origins = []
+        for proposed_flight in mission.flights:
+            if not self.air_wing_can_plan(proposed_flight.task):
+                continue
+            if proposed_flight.escort_type is not None:
+                escorts.append(proposed_flight)
+                continue
+            squadron = self.estimate_squadron(mission, proposed_flight, reservations)
+            if squadron is None:
+                missing.append(proposed_flight)
+                continue
+            reservations[squadron] += proposed_flight.num_aircraft
+            origins.append(squadron.location)
+
+        if missing:
+            # As in scrub_mission_missing_aircraft, check the escorts too so that
+            # every missing type is purchased.
+            for escort in escorts:
+                if self.estimate_squadron(mission, escort, reservations) is None:
+                    missing.append(escort)
+            for proposed_flight in missing:
+                self.request_aircraft(mission, proposed_flight, purchase_multiplier)
+            return None
+
+        if not origins:
+            return None
+
+        needed_escorts = self.estimate_escorts_needed(mission, origins)
+        for escort in escorts:
+            assert escort.escort_type is not None
+            if not needed_escorts[escort.escort_type]:
+                continue
+            # Escorts that are unavailable do not fail the estimate, since the
+            # estimated need for escorts is only approximate. plan_mission decides
+            # whether the package can go without them.
+            squadron = self.estimate_squadron(mission, escort, reservations)
+            if squadron is not None:
+                reservations[squadron] += escort.num_aircraft
+
+        if self.max_active_aircraft < self.tasked_aircraft() + sum(
+            reservations.values()
+        ):
+            return None
+
+        return {
+            squadron: count - reserved.get(squadron, 0)
+            for squadron, count in reservations.items()
+            if count > reserved.get(squadron, 0)
+        }
+
     def plan_mission(
         self,
         mission: ProposedMission,
@@ -0,0 +1,79 @@
+"""Headless micro-benchmark of the theater commander's HTN planner.
+
+Times TheaterCommander.plan for each coalition, starting from the current state of the
+game. Only the search for the first plan of the turn is timed. Package planning tasks
+only estimate whether their packages can be planned, and none of the tasks are
+executed, so the game is not modified other than by the procurement requests that the
+estimates make for missing aircraft.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, TYPE_CHECKING
+
+from game.commander.theatercommander import TheaterCommander
+from game.commander.theaterstate import TheaterState
+from game.profiling import MultiEventTracer, Timer
+
+if TYPE_CHECKING:
+    from game import Game
+
+
+@dataclass
+class PlannerTiming:
+    coalition: str
+    iterations: int
+    planned_tasks: int
+    total_seconds: float
+    average_seconds: float
+    fastest_seconds: float
+
+
+@dataclass
+class PlannerBenchmarkReport:
+    coalitions: list[PlannerTiming] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class PlannerBenchmark:
+    def __init__(self, game: Game, iterations: int) -> None:
+        self.game = game
+        self.iterations = iterations
+
+    def run(self) -> PlannerBenchmarkReport:
+        report = PlannerBenchmarkReport()
+        with MultiEventTracer() as tracer:
+            for player in (True, False):
+                report.coalitions.append(self.benchmark_coalition(player, tracer))
+        return report
+
+    def benchmark_coalition(
+        self, player: bool, tracer: MultiEventTracer
+    ) -> PlannerTiming:
+        color = "Blue" if player else "Red"
+        logging.info("Benchmarking %s planner", color.lower())
+        commander = TheaterCommander(self.game, player)
+        now = self.game.conditions.start_time
+        durations = []
+        planned_tasks = 0
+        for _ in range(self.iterations):
+            # Every iteration starts from a new state, since planning modifies the
+            # state and the persistent properties that are shared with its clones.
+            state = TheaterState.from_game(self.game, player, now, tracer)
+            timer = Timer()
+            with timer:
+                result = commander.plan(state)
+            durations.append(timer.duration.total_seconds())
+            planned_tasks = 0 if result is None else len(result.tasks)
+        total = sum(durations)
+        return PlannerTiming(
+            color,
+            self.iterations,
+            planned_tasks,
+            total,
+            total / len(durations),
+            min(durations),
+        )
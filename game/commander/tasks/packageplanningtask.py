@@ -13,6 +13,7 @@
 from game.commander.packagefulfiller import PackageFulfiller
 from game.commander.tasks.theatercommandertask import TheaterCommanderTask
 from game.commander.theaterstate import TheaterState
+from game.profiling import TraceRegistry
 from game.settings import AutoAtoBehavior
 from game.settings.settings import AutoAtoTasking
 from game.theater import MissionTarget
@@ -54,11 +55,22 @@ def preconditions_met(self, state: TheaterState) -> bool:
             return False
         if not self.should_plan(state):
             return False
+        if state.context.defer_flight_plans:
+            return self.estimate_mission(state)
         return self.fulfill_mission(state)
 
+    def realize(self, state: TheaterState) -> bool:
+        if self.package is not None:
+            return True
+        if not self.fulfill_mission(state):
+            state.unplannable_tasks.add(self.unplannable_key)
+            return False
+        return True
+
     def execute(self, coalition: Coalition) -> None:
         if self.package is None:
             raise RuntimeError("Attempted to execute failed package planning task")
+        TraceRegistry.get().increment("Package plans kept")
         coalition.ato.add_package(self.package)
 
     @abstractmethod
@@ -98,15 +110,46 @@ def purchase_multiplier(self) -> int:
         """
         return 1
 
-    def fulfill_mission(self, state: TheaterState) -> bool:
-        color = "blue" if state.context.coalition.player else "red"
-        self.propose_flights()
-        fulfiller = PackageFulfiller(
+    @property
+    def unplannable_key(self) -> tuple[type, int]:
+        return type(self), id(self.target)
+
+    def _fulfiller(self, state: TheaterState) -> PackageFulfiller:
+        if not self.flights:
+            self.propose_flights()
+        return PackageFulfiller(
             state.context.coalition,
             state.context.theater,
             state.context.game_db.flights,
             state.context.settings,
         )
+
+    def estimate_mission(self, state: TheaterState) -> bool:
+        """Estimates whether the package can be planned without planning it.
+
+        If it can, the aircraft it needs are reserved in the state so that later
+        estimates do not count them as available.
+        """
+        if self.unplannable_key in state.unplannable_tasks:
+            return False
+        color = "blue" if state.context.coalition.player else "red"
+        fulfiller = self._fulfiller(state)
+        with state.context.tracer.trace(f"{color} {self.flights[0].task} estimate"):
+            reservations = fulfiller.estimate_mission(
+                ProposedMission(self.target, self.flights),
+                self.purchase_multiplier,
+                state.reserved_aircraft,
+            )
+        if reservations is None:
+            return False
+        for squadron, count in reservations.items():
+            state.reserve_aircraft(squadron, count)
+        return True
+
+    def fulfill_mission(self, state: TheaterState) -> bool:
+        color = "blue" if state.context.coalition.player else "red"
+        fulfiller = self._fulfiller(state)
+        TraceRegistry.get().increment("Package plans generated")
         with state.context.tracer.trace(f"{color} {self.flights[0].task} planning"):
             self.package = fulfiller.plan_mission(
                 ProposedMission(self.target, self.flights),
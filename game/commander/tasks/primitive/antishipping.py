@@ -21,7 +21,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.enemy_shipping.remove(self.target)
+        state.remove_cargo_ship(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.ANTISHIP, 2)
@@ -38,7 +38,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
 
     def apply_effects(self, state: TheaterState) -> None:
         if not self.saturate:
-            state.vulnerable_front_lines.remove(self.target)
+            state.remove_vulnerable_front_line(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.CAS, 2)
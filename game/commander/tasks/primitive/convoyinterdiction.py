@@ -22,7 +22,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.enemy_convoys.remove(self.target)
+        state.remove_convoy(self.target)
 
     def propose_flights(self) -> None:
         self.propose_flight(FlightType.BAI, 2)
@@ -22,7 +22,7 @@ def preconditions_met(self, state: TheaterState) -> bool:
         return super().preconditions_met(state)
 
     def apply_effects(self, state: TheaterState) -> None:
-        state.oca_targets.remove(self.target)
+        state.remove_oca_target(self.target)
 
     def propose_flights(self) -> None:
         if self.target.runway_is_operational():
@@ -11,6 +11,14 @@
 
 
 class TheaterCommanderTask(PrimitiveTask[TheaterState]):
+    def realize(self, state: TheaterState) -> bool:
+        """Completes any planning that was deferred while searching for a plan.
+
+        Called for each task of the chosen plan before it is executed. Returns False
+        if the task cannot be executed after all.
+        """
+        return True
+
     @abstractmethod
     def execute(self, coalition: Coalition) -> None:
         ...
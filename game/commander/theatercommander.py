@@ -54,23 +54,39 @@
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING, Sequence
+from typing import Optional, TYPE_CHECKING, Sequence
 
 from game.ato import Flight
 from game.ato.starttype import StartType
 from game.commander.tasks.compound.nextaction import PlanNextAction
 from game.commander.tasks.theatercommandertask import TheaterCommanderTask
 from game.commander.theaterstate import TheaterState
-from game.htn import Planner
+from game.htn import Planner, PlanningResult
 from game.profiling import MultiEventTracer
 
 if TYPE_CHECKING:
     from game import Game
 
 
+@dataclass(frozen=True)
+class PlanningRound:
+    """A plan that has been found but not yet executed.
+
+    The state the plan was found from is kept so that the round can be planned again
+    if one of its packages cannot be planned after all. The result is None if no more
+    tasks could be planned.
+    """
+
+    start: TheaterState
+    result: Optional[PlanningResult[TheaterState, TheaterCommanderTask]]
+
+
 class TheaterCommander(Planner[TheaterState, TheaterCommanderTask]):
-    def __init__(self, game: Game, player: bool) -> None:
+    def __init__(
+        self, game: Game, player: bool, defer_flight_plans: bool = True
+    ) -> None:
         super().__init__(
             PlanNextAction(
                 aircraft_cold_start=game.settings.default_start_type is StartType.COLD
@@ -78,17 +94,63 @@ def __init__(self, game: Game, player: bool) -> None:
         )
         self.game = game
         self.player = player
+        self.defer_flight_plans = defer_flight_plans
+
+    def plan_round(self, state: TheaterState) -> PlanningRound:
+        # The planner modifies the state it is given.
+        round_start = state.clone()
+        return PlanningRound(round_start, self.plan(state))
+
+    def begin_planning(self, now: datetime, tracer: MultiEventTracer) -> PlanningRound:
+        """Finds the first plan of the turn without executing it.
 
-    def plan_missions(self, now: datetime, tracer: MultiEventTracer) -> None:
-        state = TheaterState.from_game(self.game, self.player, now, tracer)
-        while True:
-            result = self.plan(state)
-            if result is None:
-                # Planned all viable tasks this turn.
-                break
+        The search only estimates packages, and only modifies the planning state and
+        this coalition's procurement requests, so the first round of both coalitions
+        may be searched at the same time. The round is executed by plan_missions.
+        """
+        return self.plan_round(
+            TheaterState.from_game(
+                self.game, self.player, now, tracer, self.defer_flight_plans
+            )
+        )
+
+    def plan_missions(
+        self,
+        now: datetime,
+        tracer: MultiEventTracer,
+        first_round: Optional[PlanningRound] = None,
+    ) -> None:
+        """Plans and executes tasks until no more tasks can be planned.
+
+        With deferred flight plans, package planning tasks only estimate whether their
+        package can be planned while searching for a plan, since many of the tasks
+        that are considered are discarded when the search backtracks. The packages are
+        planned when the tasks of the chosen plan are executed. If one of them cannot
+        be planned after all, the rest of the plan was chosen based on a wrong
+        estimate, so the plan is discarded and planned again without that task.
+
+        If first_round is given, it must have been found by begin_planning this turn.
+        """
+        if first_round is None:
+            first_round = self.begin_planning(now, tracer)
+        planning_round = first_round
+        coalition = self.game.coalition_for(self.player)
+        while (result := planning_round.result) is not None:
+            executed: list[TheaterCommanderTask] = []
             for task in result.tasks:
-                task.execute(self.game.coalition_for(self.player))
-            state = result.end_state
+                if not task.realize(result.end_state):
+                    state = planning_round.start
+                    for executed_task in executed:
+                        executed_task.apply_effects(state)
+                    break
+                task.execute(coalition)
+                executed.append(task)
+            else:
+                state = result.end_state
+            # Reserved aircraft have either been tasked or released by now.
+            state.release_reserved_aircraft()
+            planning_round = self.plan_round(state)
+        # Planned all viable tasks this turn.
         self.fill_mission_reserves()
 
     @staticmethod
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import dataclasses
-import itertools
+import copy
 import math
 from collections.abc import Iterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING, Union
+from typing import Any, ClassVar, Optional, TYPE_CHECKING, Union
 
 from game.commander.battlepositions import BattlePositions
 from game.commander.objectivefinder import ObjectiveFinder
@@ -28,6 +27,7 @@
 if TYPE_CHECKING:
     from game import Game
     from game.coalition import Coalition
+    from game.squadrons import Squadron
     from game.transfers import Convoy, CargoShip
 
 
@@ -40,10 +40,43 @@ class PersistentContext:
     now: datetime
     settings: Settings
     tracer: MultiEventTracer
+    #: If True, package planning tasks only estimate whether their package can be
+    #: planned, and the packages are planned once the final plan has been chosen.
+    defer_flight_plans: bool
 
 
 @dataclass
 class TheaterState(WorldState["TheaterState"]):
+    """The planner's view of the theater.
+
+    The planner clones the state each time it expands a compound task, and most clones
+    are discarded without being modified, so cloning does not copy anything. Instead
+    the containers listed in COPY_ON_WRITE_FIELDS are shared with the clone until one
+    of the states modifies them, at which point that state copies the container it is
+    modifying. Those containers must only be modified through the methods of this
+    class.
+    """
+
+    COPY_ON_WRITE_FIELDS: ClassVar[frozenset[str]] = frozenset(
+        {
+            "barcaps_needed",
+            "active_front_lines",
+            "front_line_stances",
+            "vulnerable_front_lines",
+            "aewc_targets",
+            "refueling_targets",
+            "enemy_air_defenses",
+            "enemy_convoys",
+            "enemy_shipping",
+            "enemy_ships",
+            "enemy_battle_positions",
+            "oca_targets",
+            "strike_targets",
+            "enemy_barcaps",
+            "reserved_aircraft",
+        }
+    )
+
     context: PersistentContext
     barcaps_needed: dict[ControlPoint, int]
     active_front_lines: list[FrontLine]
@@ -62,37 +95,96 @@ class TheaterState(WorldState["TheaterState"]):
     strike_targets: list[TheaterGroundObject]
     enemy_barcaps: list[ControlPoint]
     threat_zones: ThreatZones
+    #: Aircraft promised to packages that have been estimated to be plannable but
+    #: which have not yet been planned.
+    reserved_aircraft: dict[Squadron, int]
+    #: Tasks which were estimated to be plannable but could not be planned. Contains
+    #: the type of the task and the ID of its target.
+    unplannable_tasks: set[tuple[type, int]]
+    #: The copy-on-write containers that this state shares with another state.
+    _shared: frozenset[str] = field(default=frozenset(), repr=False, compare=False)
 
-    def _rebuild_threat_zones(self) -> None:
-        """Recreates the theater's threat zones based on the current planned state."""
-        self.threat_zones = ThreatZones.for_threats(
-            self.context.theater,
-            self.context.coalition.opponent.doctrine,
-            barcap_locations=self.enemy_barcaps,
-            air_defenses=itertools.chain(self.enemy_air_defenses, self.enemy_ships),
-        )
+    def _writable(self, name: str) -> Any:
+        """Returns the named container, copying it first if it is shared."""
+        container = getattr(self, name)
+        if name in self._shared:
+            container = copy.copy(container)
+            setattr(self, name, container)
+            self._shared = self._shared - {name}
+        return container
+
+    def _remove_threat(self, target: TheaterGroundObject) -> None:
+        """Removes the threat projected by an eliminated target from the threat zones.
+
+        The threat zones are shared with cloned states, so this replaces them rather
+        than modifying them in place.
+        """
+        with self.context.tracer.trace("Threat zone update"):
+            self.threat_zones = self.threat_zones.without_air_defense(target)
 
     def eliminate_air_defense(self, target: IadsGroundObject) -> None:
         if target in self.threatening_air_defenses:
             self.threatening_air_defenses.remove(target)
         if target in self.detecting_air_defenses:
             self.detecting_air_defenses.remove(target)
-        self.enemy_air_defenses.remove(target)
-        self._rebuild_threat_zones()
+        self._writable("enemy_air_defenses").remove(target)
+        self._remove_threat(target)
 
     def eliminate_ship(self, target: NavalGroundObject) -> None:
         if target in self.threatening_air_defenses:
             self.threatening_air_defenses.remove(target)
         if target in self.detecting_air_defenses:
             self.detecting_air_defenses.remove(target)
-        self.enemy_ships.remove(target)
-        self._rebuild_threat_zones()
+        self._writable("enemy_ships").remove(target)
+        self._remove_threat(target)
 
     def has_battle_position(self, target: VehicleGroupGroundObject) -> bool:
         return target in self.enemy_battle_positions[target.control_point]
 
     def eliminate_battle_position(self, target: VehicleGroupGroundObject) -> None:
-        self.enemy_battle_positions[target.control_point].eliminate(target)
+        battle_positions = self._writable("enemy_battle_positions")
+        cp = target.control_point
+        battle_positions[cp] = battle_positions[cp].without(target)
+
+    def cover_barcap_target(self, target: ControlPoint) -> None:
+        self._writable("barcaps_needed")[target] -= 1
+
+    def set_front_line_stance(
+        self, front_line: FrontLine, stance: CombatStance
+    ) -> None:
+        self._writable("front_line_stances")[front_line] = stance
+
+    def remove_active_front_line(self, front_line: FrontLine) -> None:
+        self._writable("active_front_lines").remove(front_line)
+
+    def remove_vulnerable_front_line(self, front_line: FrontLine) -> None:
+        self._writable("vulnerable_front_lines").remove(front_line)
+
+    def remove_aewc_target(self, target: MissionTarget) -> None:
+        self._writable("aewc_targets").remove(target)
+
+    def remove_refueling_target(self, target: MissionTarget) -> None:
+        self._writable("refueling_targets").remove(target)
+
+    def remove_convoy(self, convoy: Convoy) -> None:
+        self._writable("enemy_convoys").remove(convoy)
+
+    def remove_cargo_ship(self, ship: CargoShip) -> None:
+        self._writable("enemy_shipping").remove(ship)
+
+    def remove_oca_target(self, target: ControlPoint) -> None:
+        self._writable("oca_targets").remove(target)
+
+    def remove_strike_target(self, target: TheaterGroundObject) -> None:
+        self._writable("strike_targets").remove(target)
+
+    def reserve_aircraft(self, squadron: Squadron, count: int) -> None:
+        reserved = self._writable("reserved_aircraft")
+        reserved[squadron] = reserved.get(squadron, 0) + count
+
+    def release_reserved_aircraft(self) -> None:
+        self.reserved_aircraft = {}
+        self._shared = self._shared - {"reserved_aircraft"}
 
     def ammo_dumps_at(
         self, control_point: ControlPoint
@@ -107,39 +199,27 @@ def ammo_dumps_at(
     def clone(self) -> TheaterState:
         # Do not use copy.deepcopy. Copying every TGO, control point, etc is absurdly
         # expensive.
-        return TheaterState(
-            context=self.context,
-            barcaps_needed=dict(self.barcaps_needed),
-            active_front_lines=list(self.active_front_lines),
-            front_line_stances=dict(self.front_line_stances),
-            vulnerable_front_lines=list(self.vulnerable_front_lines),
-            aewc_targets=list(self.aewc_targets),
-            refueling_targets=list(self.refueling_targets),
-            enemy_air_defenses=list(self.enemy_air_defenses),
-            enemy_convoys=list(self.enemy_convoys),
-            enemy_shipping=list(self.enemy_shipping),
-            enemy_ships=list(self.enemy_ships),
-            enemy_battle_positions={
-                cp: dataclasses.replace(g)
-                for cp, g in self.enemy_battle_positions.items()
-            },
-            oca_targets=list(self.oca_targets),
-            strike_targets=list(self.strike_targets),
-            enemy_barcaps=list(self.enemy_barcaps),
-            threat_zones=self.threat_zones,
-            # Persistent properties are not copied. These are a way for failed subtasks
-            # to communicate requirements to other tasks. For example, the task to
-            # attack enemy battle_positions might fail because the target area has IADS
-            # protection. In that case, the preconditions of PlanBai would fail, but
-            # would add the IADS that prevented it from being planned to the list of
-            # IADS threats so that DegradeIads will consider it a threat later.
-            threatening_air_defenses=self.threatening_air_defenses,
-            detecting_air_defenses=self.detecting_air_defenses,
-        )
+        #
+        # Persistent properties (threatening_air_defenses, detecting_air_defenses and
+        # unplannable_tasks) are shared and are never copied. These are a way for
+        # failed subtasks to communicate requirements to other tasks. For example, the
+        # task to attack enemy battle_positions might fail because the target area has
+        # IADS protection. In that case, the preconditions of PlanBai would fail, but
+        # would add the IADS that prevented it from being planned to the list of IADS
+        # threats so that DegradeIads will consider it a threat later.
+        clone = copy.copy(self)
+        self._shared = self.COPY_ON_WRITE_FIELDS
+        clone._shared = self.COPY_ON_WRITE_FIELDS
+        return clone
 
     @classmethod
     def from_game(
-        cls, game: Game, player: bool, now: datetime, tracer: MultiEventTracer
+        cls,
+        game: Game,
+        player: bool,
+        now: datetime,
+        tracer: MultiEventTracer,
+        defer_flight_plans: bool = True,
     ) -> TheaterState:
         coalition = game.coalition_for(player)
         finder = ObjectiveFinder(game, player)
@@ -153,6 +233,7 @@ def from_game(
             now,
             game.settings,
             tracer,
+            defer_flight_plans,
         )
 
         # Plan enough rounds of CAP that the target has coverage over the expected
@@ -194,4 +275,6 @@ def from_game(
             strike_targets=list(finder.strike_targets()),
             enemy_barcaps=list(game.theater.control_points_for(not player)),
             threat_zones=game.threat_zone_for(not player),
+            reserved_aircraft={},
+            unplannable_tasks=set(),
         )
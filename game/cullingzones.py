@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from dcs import Point
+
+
+@dataclass(frozen=True)
+class KdNode:
+    x: float
+    y: float
+    #: 0 if the node splits its children by x, 1 if by y.
+    axis: int
+    left: Optional[KdNode]
+    right: Optional[KdNode]
+
+    @staticmethod
+    def build(points: list[tuple[float, float]], depth: int = 0) -> Optional[KdNode]:
+        if not points:
+            return None
+        axis = depth % 2
+        points = sorted(points, key=lambda p: p[axis])
+        median = len(points) // 2
+        x, y = points[median]
+        return KdNode(
+            x,
+            y,
+            axis,
+            KdNode.build(points[:median], depth + 1),
+            KdNode.build(points[median + 1 :], depth + 1),
+        )
+
+
+class CullingZones:
+    """The points of interest around which units will not be culled.
+
+    Whether a unit is culled depends only on whether any zone is within some radius
+    of it, so the zones are indexed with a k-d tree to answer that in logarithmic time.
+    Mission generation checks every TGO against the zones, and there is a zone for
+    each package, so checking every zone for every TGO is slow on large campaigns.
+    """
+
+    def __init__(self, zones: list[Point]) -> None:
+        self.zones = zones
+        # Built lazily, since the zones may be recomputed several times before they are
+        # next queried.
+        self._index: Optional[KdNode] = None
+        self._index_built = False
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_index"] = None
+        state["_index_built"] = False
+        return state
+
+    def _ensure_index(self) -> Optional[KdNode]:
+        if not self._index_built:
+            self._index = KdNode.build([(z.x, z.y) for z in self.zones])
+            self._index_built = True
+        return self._index
+
+    def any_within(self, position: Point, radius: float) -> bool:
+        """True if any zone is closer to the position than the radius, in meters."""
+        x = position.x
+        y = position.y
+        radius_squared = radius * radius
+        stack = [self._ensure_index()]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            dx = x - node.x
+            dy = y - node.y
+            if dx * dx + dy * dy < radius_squared:
+                return True
+            split_distance = dx if node.axis == 0 else dy
+            if split_distance > 0:
+                near, far = node.right, node.left
+            else:
+                near, far = node.left, node.right
+            # Any zone on the other side of the split is at least as far away as the
+            # split itself.
+            if split_distance * split_distance < radius_squared:
+                stack.append(far)
+            stack.append(near)
+        return False
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-import yaml
 from typing import ClassVar
 
 from dataclasses import dataclass
 from datetime import timedelta
 
 from game.data.units import UnitClass
+from game.resourcecache import load_yaml
 from game.utils import Distance, feet, nautical_miles
 
 
@@ -122,8 +122,7 @@ def load_all(cls) -> None:
         if cls._loaded:
             return
         for doctrine_file_path in Path("resources/doctrines").glob("**/*.yaml"):
-            with doctrine_file_path.open(encoding="utf8") as doctrine_file:
-                data = yaml.safe_load(doctrine_file)
+            data = load_yaml(doctrine_file_path)
             cls.register(
                 Doctrine(
                     name=data["name"],
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 import luadata
@@ -24,26 +25,28 @@ def __init__(self, warehouses: Warehouses) -> None:
         self.warehouses = warehouses
 
     def add_to_warehouse(
-        self, airports: list[Airport], weapons: list[WeaponWSType]
+        self, airports: list[Airport], weapons: Sequence[WeaponWSType]
     ) -> None:
         modded_warehouses = luadata.unserialize(
             str(self.warehouses), encoding="utf-8", multival=False
         )
+        # The entries are the same for every airport, and are only read by the
+        # serializer, so they can be shared.
+        weapon_entries = [
+            {
+                WSTYPE: [
+                    weapon.wstype_1,
+                    weapon.wstype_2,
+                    weapon.wstype_3,
+                    weapon.wstype_4,
+                ],
+                INITIAL_AMOUNT: 1000,
+            }
+            for weapon in weapons
+        ]
         for airport in airports:
             modded_warehouses[AIRPORTS][airport.id][UNLIMITED_MUNITIONS] = False
-            for weapon in weapons:
-                weapon_dict = modded_warehouses[AIRPORTS][airport.id][WEAPONS]
-                weapon_dict.append(
-                    {
-                        WSTYPE: [
-                            weapon.wstype_1,
-                            weapon.wstype_2,
-                            weapon.wstype_3,
-                            weapon.wstype_4,
-                        ],
-                        INITIAL_AMOUNT: 1000,
-                    }
-                )
+            modded_warehouses[AIRPORTS][airport.id][WEAPONS].extend(weapon_entries)
         self.warehouses = "warehouses=\n" + luadata.serialize(
             modded_warehouses, encoding="utf-8", indent="\t", indent_level=2
         )
@@ -6,15 +6,15 @@
 import logging
 from dataclasses import dataclass, field
 from enum import unique, Enum
-from functools import cached_property
+from functools import cache, cached_property
 from pathlib import Path
 from typing import Iterator, Optional, Any, ClassVar
 
-import yaml
 from dcs.flyingunit import FlyingUnit
 from dcs.weapons_data import weapon_ids, Weapons
 
 from game.dcs.aircrafttype import AircraftType
+from game.resourcecache import load_yaml
 
 PydcsWeapon = Any
 PydcsWeaponAssignment = tuple[int, PydcsWeapon]
@@ -167,8 +167,7 @@ def named(cls, name: str) -> WeaponGroup:
     @classmethod
     def _each_weapon_group(cls) -> Iterator[WeaponGroup]:
         for group_file_path in Path("resources/weapons").glob("**/*.yaml"):
-            with group_file_path.open(encoding="utf8") as group_file:
-                data = yaml.safe_load(group_file)
+            data = load_yaml(group_file_path)
             name = data["name"]
             try:
                 weapon_type = WeaponType(data["type"])
@@ -318,7 +317,14 @@ def get_wstypes() -> list[WeaponWSType]:
         return dcs_weapons
 
     @staticmethod
+    @cache
     def get_clsid_mapping() -> dict[str, str]:
+        """Returns the CLSID of every pydcs weapon, keyed by lowercase weapon name.
+
+        Reflecting over the pydcs weapons is slow and the result never changes, so
+        this is computed only once. The returned dict is shared and must not be
+        modified.
+        """
         weapon_members = [
             attr
             for attr in dir(Weapons)
@@ -332,12 +338,10 @@ def get_clsid_mapping() -> dict[str, str]:
 
     def get_clsids(self, filter_unregistered: bool = True) -> list[str]:
         weapon_data = self.get_clsid_mapping()
-        weapon_names = [
-            weapon_name
-            for weapon_name in weapon_data.keys()
-            if self.name.lower() in weapon_name.lower()
+        name = self.name.lower()
+        clsids = [
+            clsid for weapon_name, clsid in weapon_data.items() if name in weapon_name
         ]
-        clsids = [weapon_data[weapon_name] for weapon_name in weapon_names]
         if filter_unregistered:
             return self.filter_unregistered_weapons(clsids)
         return clsids
@@ -376,10 +380,30 @@ def filter_unregistered_weapons(clsids: list[str]) -> list[str]:
 
     @staticmethod
     def populate_weapons() -> list[WeaponWSType]:
+        return list(WeaponWSType._populated_weapons())
+
+    @staticmethod
+    @cache
+    def _populated_weapons() -> tuple[WeaponWSType, ...]:
         dcs_weapons = WeaponWSType.get_wstypes()
         populated_weapons = list()
         for dcs_weapon in dcs_weapons:
             dcs_weapon.clsids = dcs_weapon.get_clsids()
             if dcs_weapon.clsids:
                 populated_weapons.append(dcs_weapon)
-        return populated_weapons
+        return tuple(populated_weapons)
+
+    @staticmethod
+    @cache
+    def available_weapons(
+        date: datetime.date, restrict_by_date: bool
+    ) -> tuple[WeaponWSType, ...]:
+        """Returns the weapons that may be stocked in warehouses on the given date.
+
+        The result is memoized since it is needed for every generated mission but only
+        changes when the date or the restriction setting does.
+        """
+        weapons = WeaponWSType._populated_weapons()
+        if not restrict_by_date:
+            return weapons
+        return tuple(weapon for weapon in weapons if weapon.available_on(date))
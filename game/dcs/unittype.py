@@ -7,10 +7,10 @@
 from pathlib import Path
 from typing import ClassVar, Generic, Iterator, Self, Type, TypeVar, Any
 
-import yaml
 from dcs.unittype import UnitType as DcsUnitType
 
 from game.data.units import UnitClass
+from game.resourcecache import load_yaml
 
 DcsUnitTypeT = TypeVar("DcsUnitTypeT", bound=Type[DcsUnitType])
 
@@ -64,8 +64,7 @@ def _each_variant_of(cls, unit: DcsUnitTypeT) -> Iterator[Self]:
             logging.warning(f"No data for {unit.id}; it will not be available")
             return
 
-        with data_path.open(encoding="utf-8") as data_file:
-            data = yaml.safe_load(data_file)
+        data = load_yaml(data_path)
 
         for variant_id, variant_data in data.get("variants", {unit.id: {}}).items():
             if variant_data is None:
@@ -3,9 +3,10 @@
 import itertools
 import logging
 import math
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time, timedelta
-from typing import Any, List, TYPE_CHECKING, Type, Union, cast
+from typing import Any, TYPE_CHECKING, Type, TypeVar, Union, cast
 
 from dcs.countries import Switzerland, USAFAggressors, UnitedNationsPeacekeepers
 from dcs.country import Country
@@ -22,6 +23,7 @@
 from .ato.flighttype import FlightType
 from .campaignloader import CampaignAirWingConfig
 from .coalition import Coalition
+from .cullingzones import CullingZones
 from .db.gamedb import GameDb
 from .infos.information import Information
 from .lasercodes.lasercoderegistry import LaserCodeRegistry
@@ -48,6 +50,8 @@
     from .squadrons import AirWing
     from .threatzones import ThreatZones
 
+ResultT = TypeVar("ResultT")
+
 COMMISION_UNIT_VARIETY = 4
 COMMISION_LIMITS_SCALE = 1.5
 COMMISION_LIMITS_FACTORS = {
@@ -107,7 +111,7 @@ def __init__(
         self.informations: list[Information] = []
         self.message("Game Start", "-" * 40)
         # Culling Zones are for areas around points of interest that contain things we may not wish to cull.
-        self.__culling_zones: List[Point] = []
+        self.__culling_zones = CullingZones([])
         self.__destroyed_units: list[dict[str, Union[float, str]]] = []
         self.save_manager = SaveManager(self)
         self.current_unit_id = 0
@@ -356,11 +360,12 @@ def pass_turn(self, no_action: bool = False) -> None:
         events = GameUpdateEvents()
 
         logging.info("Pass turn")
-        with logged_duration("Turn finalization"):
-            self.finish_turn(events, no_action)
+        with logged_duration("Pass turn"):
+            with logged_duration("Turn finalization"):
+                self.finish_turn(events, no_action)
 
-        with logged_duration("Turn initialization"):
-            self.initialize_turn(events)
+            with logged_duration("Turn initialization"):
+                self.initialize_turn(events)
 
         EventStream.put_nowait(events)
 
@@ -436,15 +441,20 @@ def initialize_turn(
         if turn_state in (TurnState.LOSS, TurnState.WIN):
             return self.process_win_loss(turn_state)
 
+        # Carriers and front lines have moved since the distances were last computed.
+        ObjectiveDistanceCache.invalidate_distances()
+
         # Plan flights & combat for next turn
         with logged_duration("Threat zone computation"):
             self.compute_threat_zones(events)
 
         # Plan Coalition specific turn
+        coalitions = []
         if for_blue:
-            self.blue.initialize_turn(self.turn == 0)
+            coalitions.append(self.blue)
         if for_red:
-            self.red.initialize_turn(self.turn == 0)
+            coalitions.append(self.red)
+        self.initialize_coalition_turns(coalitions)
 
         # Update cull zones
         with logged_duration("Computing culling positions"):
@@ -482,10 +492,64 @@ def compute_transit_network_for(self, player: bool) -> TransitNetwork:
         return TransitNetworkBuilder(self.theater, player).build()
 
     def compute_threat_zones(self, events: GameUpdateEvents) -> None:
-        self.blue.compute_threat_zones(events)
-        self.red.compute_threat_zones(events)
-        self.blue.compute_nav_meshes(events)
-        self.red.compute_nav_meshes(events)
+        # Each navmesh is built from the opposing threat zone, so every threat zone
+        # must be computed before either navmesh.
+        self.for_each_coalition(lambda c: c.compute_threat_zones(events))
+        with logged_duration("Navmesh computation"):
+            self.for_each_coalition(lambda c: c.compute_nav_meshes(events))
+
+    def initialize_coalition_turns(self, coalitions: list[Coalition]) -> None:
+        """Initializes the turn of each coalition in order.
+
+        With concurrent coalition planning, the first mission plan of each coalition is
+        searched for at the same time, since that search only estimates packages and
+        does not depend on the other coalition's plans. The plans are then executed
+        and procurement is planned one coalition at a time, in the same order as
+        without it.
+        """
+        is_turn_0 = self.turn == 0
+        if (
+            is_turn_0
+            or len(coalitions) < 2
+            or not self.settings.concurrent_coalition_planning
+        ):
+            for coalition in coalitions:
+                coalition.initialize_turn(is_turn_0)
+            return
+
+        now = self.conditions.start_time
+        for coalition in coalitions:
+            coalition.prepare_turn()
+        first_rounds = self.for_each_coalition(
+            lambda c: c.search_missions(now), coalitions
+        )
+        for coalition, first_round in zip(coalitions, first_rounds):
+            coalition.plan_missions(now, first_round)
+            coalition.plan_procurement()
+
+    def for_each_coalition(
+        self,
+        action: Callable[[Coalition], ResultT],
+        coalitions: list[Coalition] | None = None,
+    ) -> list[ResultT]:
+        """Runs action for each coalition in order, or for all at once if enabled.
+
+        Defaults to blue and then red. The results are returned in the same order as
+        the coalitions. Only safe for actions that do not modify state shared by the
+        coalitions. Most of the time spent building threat zones and navmeshes is in
+        shapely, which releases the GIL, so threads are enough to run them in parallel.
+        """
+        if coalitions is None:
+            coalitions = [self.blue, self.red]
+        if not self.settings.concurrent_coalition_planning:
+            return [action(c) for c in coalitions]
+
+        with ThreadPoolExecutor(
+            max_workers=len(coalitions), thread_name_prefix="CoalitionPlanning"
+        ) as executor:
+            futures = [executor.submit(action, c) for c in coalitions]
+            # Raises the first error, if any, in the same order as the serial path.
+            return [future.result() for future in futures]
 
     def threat_zone_for(self, player: bool) -> ThreatZones:
         return self.coalition_for(player).threat_zone
@@ -575,7 +639,7 @@ def compute_unculled_zones(self, events: GameUpdateEvents) -> None:
                 continue
             zones.append(package.target.position)
 
-        self.__culling_zones = zones
+        self.__culling_zones = CullingZones(zones)
         events.update_unculled_zones(zones)
 
     def add_destroyed_units(self, data: dict[str, Union[float, str]]) -> None:
@@ -596,10 +660,9 @@ def position_culled(self, pos: Point) -> bool:
         """
         if not self.settings.perf_culling:
             return False
-        for z in self.__culling_zones:
-            if z.distance_to_point(pos) < self.settings.perf_culling_distance * 1000:
-                return False
-        return True
+        return not self.__culling_zones.any_within(
+            pos, self.settings.perf_culling_distance * 1000
+        )
 
     def iads_considerate_culling(self, tgo: TheaterGroundObject) -> bool:
         if not self.settings.perf_do_not_cull_threatening_iads:
@@ -608,21 +671,19 @@ def iads_considerate_culling(self, tgo: TheaterGroundObject) -> bool:
             if self.settings.perf_culling:
                 if isinstance(tgo, EwrGroundObject):
                     max_detection_range = tgo.max_detection_range().meters
-                    for z in self.__culling_zones:
-                        seperation = z.distance_to_point(tgo.position)
-                        # Don't cull EWR if in detection range.
-                        if seperation < max_detection_range:
-                            return False
+                    # Don't cull EWR if in detection range.
+                    if self.__culling_zones.any_within(
+                        tgo.position, max_detection_range
+                    ):
+                        return False
                 if isinstance(tgo, SamGroundObject):
                     max_threat_range = tgo.max_threat_range().meters
-                    for z in self.__culling_zones:
-                        seperation = z.distance_to_point(tgo.position)
-                        # Create a 12nm buffer around nearby SAMs.
-                        respect_bubble = (
-                            max_threat_range + Distance.from_nautical_miles(12).meters
-                        )
-                        if seperation < respect_bubble:
-                            return False
+                    # Create a 12nm buffer around nearby SAMs.
+                    respect_bubble = (
+                        max_threat_range + Distance.from_nautical_miles(12).meters
+                    )
+                    if self.__culling_zones.any_within(tgo.position, respect_bubble):
+                        return False
             return self.position_culled(tgo.position)
 
     def get_culling_zones(self) -> list[Point]:
@@ -630,7 +691,7 @@ def get_culling_zones(self) -> list[Point]:
         Check culling points
         :return: List of culling zones
         """
-        return self.__culling_zones
+        return self.__culling_zones.zones
 
     def process_win_loss(self, turn_state: TurnState) -> None:
         if turn_state is TurnState.WIN:
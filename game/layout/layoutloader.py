@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import itertools
 import logging
+import os
 import pickle
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
 import dcs
-import yaml
 from dcs import Point
 from dcs.unitgroup import StaticGroup
 
@@ -28,10 +30,13 @@
 )
 from game.layout.layoutmapping import LayoutMapping
 from game.profiling import logged_duration
-from game.version import VERSION
+from game.resourcecache import load_yaml
 
 LAYOUT_DIR = "resources/layouts/"
 LAYOUT_DUMP = "Liberation/layouts.p"
+# Changes to the layout classes must increment this, since the dump is only otherwise
+# invalidated by changes to the layout files.
+LAYOUT_DUMP_FORMAT = 1
 
 LAYOUT_TYPES = {
     GroupRole.AIR_DEFENSE: AntiAirLayout,
@@ -42,6 +47,15 @@
 }
 
 
+@dataclass
+class MizLayouts:
+    """The layouts imported from a layout miz, and the hash of the files they were
+    imported from."""
+
+    content_hash: str
+    layouts: dict[str, TgoLayout]
+
+
 class LayoutLoader:
     # Map of all available layouts indexed by name
     _layouts: dict[str, TgoLayout] = {}
@@ -61,135 +75,189 @@ def layouts(self) -> Iterator[TgoLayout]:
 
     def load_templates(self) -> None:
         """This will load all pre-loaded layouts from a pickle file.
-        If pickle can not be loaded it will import and dump the layouts"""
+        Layouts of miz files which have changed since the dump are imported again"""
         # We use a pickle for performance reasons. Importing takes many seconds
         file = Path(persistence.base_path()) / LAYOUT_DUMP
+        cached: dict[str, MizLayouts] = {}
         if file.is_file():
             # Load from pickle if existing
             with file.open("rb") as f:
                 try:
-                    version, self._layouts = pickle.load(f)
-                    # Check if the game version of the dump is identical to the current
-                    if version == VERSION:
-                        return
+                    dump_format, dumped = pickle.load(f)
+                    if dump_format == LAYOUT_DUMP_FORMAT:
+                        cached = dumped
                 except Exception as e:
                     logging.exception(f"Error {e} reading layouts dump. Recreating.")
-        # If no dump is available or game version is different create a new dump
-        self.import_templates()
+        self.import_templates(cached)
 
-    def import_templates(self) -> None:
-        """This will import all layouts from the template folder
-        and dumps them to a pickle"""
-        self._layouts = {}
+    def import_templates(self, cached: dict[str, MizLayouts] | None = None) -> None:
+        """This will import the layouts from the template folder and dump them to a
+        pickle. Layouts in cached are reused if their miz and mapping files have not
+        changed"""
+        cached = cached or {}
         mappings: dict[str, list[LayoutMapping]] = defaultdict(list)
+        mapping_files: dict[str, list[Path]] = defaultdict(list)
         with logged_duration("Parsing mapping yamls"):
-            for file in Path(LAYOUT_DIR).rglob("*.yaml"):
+            for file in sorted(Path(LAYOUT_DIR).rglob("*.yaml")):
                 if not file.is_file():
                     raise RuntimeError(f"{file.name} is not a file")
-                with file.open("r", encoding="utf-8") as f:
-                    mapping_dict = yaml.safe_load(f)
+                mapping_dict = load_yaml(file)
 
-                template_map = LayoutMapping.from_dict(mapping_dict, f.name)
+                template_map = LayoutMapping.from_dict(mapping_dict, str(file))
                 mappings[template_map.layout_file].append(template_map)
+                mapping_files[template_map.layout_file].append(file)
+
+        imported: dict[str, MizLayouts] = {}
+        stale: dict[str, str] = {}
+        for miz, files in mapping_files.items():
+            content_hash = layout_content_hash(Path(miz), files)
+            if miz in cached and cached[miz].content_hash == content_hash:
+                imported[miz] = cached[miz]
+            else:
+                stale[miz] = content_hash
+
+        if stale:
+            with logged_duration(f"Parsing {len(stale)} layout miz"):
+                for miz, layouts in zip(stale, self._import_all(stale, mappings)):
+                    imported[miz] = MizLayouts(stale[miz], layouts)
 
-        with logged_duration(f"Parsing all layout miz multithreaded"):
-            with ThreadPoolExecutor() as exe:
-                exe.map(self._load_from_miz, mappings.keys(), mappings.values())
+        self._layouts = {}
+        for miz in mappings:
+            self._layouts.update(imported[miz].layouts)
 
-        # Sort al the LayoutGroups with the correct index
-        for layout in self._layouts.values():
-            layout.groups.sort(key=lambda g: g.group_index)
-            for group in layout.groups:
-                group.unit_groups.sort(key=lambda ug: ug.unit_index)
+        logging.info(
+            f"Imported {len(self._layouts)} layouts, {len(stale)} of "
+            f"{len(mappings)} layout miz changed"
+        )
+        if stale or imported.keys() != cached.keys():
+            self._dump_templates(imported)
 
-        logging.info(f"Imported {len(self._layouts)} layouts")
-        self._dump_templates()
+    @staticmethod
+    def _import_all(
+        mizs: Iterable[str], mappings: dict[str, list[LayoutMapping]]
+    ) -> list[dict[str, TgoLayout]]:
+        mizs = list(mizs)
+        if len(mizs) == 1:
+            return [import_layouts_from_miz(mizs[0], mappings[mizs[0]])]
+        # Loading a miz is CPU bound, so it only runs in parallel in separate
+        # processes.
+        with ProcessPoolExecutor(
+            max_workers=min(len(mizs), os.cpu_count() or 1)
+        ) as exe:
+            return list(
+                exe.map(import_layouts_from_miz, mizs, [mappings[m] for m in mizs])
+            )
 
-    def _dump_templates(self) -> None:
+    @staticmethod
+    def _dump_templates(imported: dict[str, MizLayouts]) -> None:
         file = Path(persistence.base_path()) / LAYOUT_DUMP
-        dump = (VERSION, self._layouts)
+        dump = (LAYOUT_DUMP_FORMAT, imported)
         with file.open("wb") as fdata:
             pickle.dump(dump, fdata)
 
-    def _load_from_miz(self, miz: str, mappings: list[LayoutMapping]) -> None:
-        template_position: dict[str, Point] = {}
-        temp_mis = dcs.Mission()
-        with logged_duration(f"Parsing {miz}"):
-            # The load_file takes a lot of time to compute. That's why the layouts
-            # are written to a pickle and can be reloaded from the ui
-            # Example the whole routine: 0:00:00.934417,
-            # the .load_file() method: 0:00:00.920409
-            temp_mis.load_file(miz)
-
-        for mapping in mappings:
-            # Find the group from the mapping in any coalition
-            for country in itertools.chain(
-                temp_mis.coalition["red"].countries.values(),
-                temp_mis.coalition["blue"].countries.values(),
+    def by_name(self, name: str) -> TgoLayout:
+        self.initialize()
+        return self._layouts[name]
+
+
+def layout_content_hash(miz: Path, mapping_files: Iterable[Path]) -> str:
+    """Hashes the contents of a layout miz and of the mappings of its layouts."""
+    content_hash = hashlib.sha256(miz.read_bytes())
+    for mapping_file in sorted(mapping_files):
+        content_hash.update(mapping_file.read_bytes())
+    return content_hash.hexdigest()
+
+
+def import_layouts_from_miz(
+    miz: str, mappings: list[LayoutMapping]
+) -> dict[str, TgoLayout]:
+    """Imports the layouts of the given mappings from the miz file.
+
+    This is run in worker processes, so the layouts are returned rather than added to
+    the loader.
+    """
+    layouts: dict[str, TgoLayout] = {}
+    template_position: dict[str, Point] = {}
+    temp_mis = dcs.Mission()
+    with logged_duration(f"Parsing {miz}"):
+        # The load_file takes a lot of time to compute. That's why the layouts
+        # are written to a pickle and can be reloaded from the ui
+        # Example the whole routine: 0:00:00.934417,
+        # the .load_file() method: 0:00:00.920409
+        temp_mis.load_file(miz)
+
+    for mapping in mappings:
+        # Find the group from the mapping in any coalition
+        for country in itertools.chain(
+            temp_mis.coalition["red"].countries.values(),
+            temp_mis.coalition["blue"].countries.values(),
+        ):
+            for dcs_group in itertools.chain(
+                temp_mis.country(country.name).vehicle_group,
+                temp_mis.country(country.name).ship_group,
+                temp_mis.country(country.name).static_group,
             ):
-                for dcs_group in itertools.chain(
-                    temp_mis.country(country.name).vehicle_group,
-                    temp_mis.country(country.name).ship_group,
-                    temp_mis.country(country.name).static_group,
-                ):
-                    try:
-                        g_id, u_id, group_name, group_mapping = mapping.group_for_name(
-                            dcs_group.name
-                        )
-                    except KeyError:
-                        continue
-
-                    if not isinstance(dcs_group, StaticGroup) and max(
-                        group_mapping.unit_count
-                    ) > len(dcs_group.units):
-                        logging.error(
-                            f"Incorrect unit_count found in Layout {mapping.name}-{group_mapping.name}"
-                        )
+                try:
+                    g_id, u_id, group_name, group_mapping = mapping.group_for_name(
+                        dcs_group.name
+                    )
+                except KeyError:
+                    continue
 
-                    layout = self._layouts.get(mapping.name, None)
-                    if layout is None:
-                        # Create a new template
-                        layout = LAYOUT_TYPES[mapping.primary_role](
-                            mapping.name, mapping.description
-                        )
-                        layout.generic = mapping.generic
-                        layout.tasks = mapping.tasks
-                        self._layouts[layout.name] = layout
-                    for i, unit in enumerate(dcs_group.units):
-                        unit_group = None
-                        for _unit_group in layout.all_unit_groups:
-                            if _unit_group.name == group_mapping.name:
-                                # We already have a layoutgroup for this dcs_group
-                                unit_group = _unit_group
-                        if not unit_group:
-                            unit_group = TgoLayoutUnitGroup(
-                                group_mapping.name,
-                                [],
-                                group_mapping.unit_count,
-                                group_mapping.unit_types,
-                                group_mapping.unit_classes,
-                                group_mapping.fallback_classes,
-                                u_id,
-                            )
-                            unit_group.optional = group_mapping.optional
-                            unit_group.fill = group_mapping.fill
-                            unit_group.sub_task = group_mapping.sub_task
-                            tgo_group = None
-                            for _tgo_group in layout.groups:
-                                if _tgo_group.group_name == group_name:
-                                    tgo_group = _tgo_group
-                            if tgo_group is None:
-                                tgo_group = TgoLayoutGroup(group_name, g_id)
-                                layout.groups.append(tgo_group)
-                            tgo_group.unit_groups.append(unit_group)
-                        layout_unit = LayoutUnit.from_unit(unit)
-                        if i == 0 and layout.name not in template_position:
-                            template_position[layout.name] = unit.position
-                        layout_unit.position = (
-                            layout_unit.position - template_position[layout.name]
+                if not isinstance(dcs_group, StaticGroup) and max(
+                    group_mapping.unit_count
+                ) > len(dcs_group.units):
+                    logging.error(
+                        f"Incorrect unit_count found in Layout {mapping.name}-{group_mapping.name}"
+                    )
+
+                layout = layouts.get(mapping.name, None)
+                if layout is None:
+                    # Create a new template
+                    layout = LAYOUT_TYPES[mapping.primary_role](
+                        mapping.name, mapping.description
+                    )
+                    layout.generic = mapping.generic
+                    layout.tasks = mapping.tasks
+                    layouts[layout.name] = layout
+                for i, unit in enumerate(dcs_group.units):
+                    unit_group = None
+                    for _unit_group in layout.all_unit_groups:
+                        if _unit_group.name == group_mapping.name:
+                            # We already have a layoutgroup for this dcs_group
+                            unit_group = _unit_group
+                    if not unit_group:
+                        unit_group = TgoLayoutUnitGroup(
+                            group_mapping.name,
+                            [],
+                            group_mapping.unit_count,
+                            group_mapping.unit_types,
+                            group_mapping.unit_classes,
+                            group_mapping.fallback_classes,
+                            u_id,
                         )
-                        unit_group.layout_units.append(layout_unit)
+                        unit_group.optional = group_mapping.optional
+                        unit_group.fill = group_mapping.fill
+                        unit_group.sub_task = group_mapping.sub_task
+                        tgo_group = None
+                        for _tgo_group in layout.groups:
+                            if _tgo_group.group_name == group_name:
+                                tgo_group = _tgo_group
+                        if tgo_group is None:
+                            tgo_group = TgoLayoutGroup(group_name, g_id)
+                            layout.groups.append(tgo_group)
+                        tgo_group.unit_groups.append(unit_group)
+                    layout_unit = LayoutUnit.from_unit(unit)
+                    if i == 0 and layout.name not in template_position:
+                        template_position[layout.name] = unit.position
+                    layout_unit.position = (
+                        layout_unit.position - template_position[layout.name]
+                    )
+                    unit_group.layout_units.append(layout_unit)
 
-    def by_name(self, name: str) -> TgoLayout:
-        self.initialize()
-        return self._layouts[name]
+    # Sort al the LayoutGroups with the correct index
+    for layout in layouts.values():
+        layout.groups.sort(key=lambda g: g.group_index)
+        for group in layout.groups:
+            group.unit_groups.sort(key=lambda ug: ug.unit_index)
+    return layouts
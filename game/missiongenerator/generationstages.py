@@ -0,0 +1,132 @@
+"""Runs the stages of mission generation in dependency order.
+
+Most stages of mission generation modify the pydcs Mission (allocating unit IDs,
+adding triggers, etc), so they must run one at a time and in a fixed order to
+generate the same mission each time. Those stages run on the calling thread in the
+order they were declared.
+
+A few stages only modify state that no other stage touches. Those are declared as
+concurrent, and run on a worker thread as soon as their dependencies have
+completed, alongside the rest of generation.
+"""
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from game.profiling import logged_duration
+
+
+@dataclass(frozen=True)
+class GenerationStage:
+    name: str
+    run: Callable[[], None]
+    depends_on: tuple[str, ...] = ()
+    #: True if the stage may run on a worker thread concurrently with other stages.
+    #: Only stages that do not modify state used by any other stage may do this.
+    concurrent: bool = False
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class StageReport:
+    dependencies: dict[str, tuple[str, ...]]
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    def critical_path(self) -> list[str]:
+        """Returns the longest chain of dependent stages, by duration.
+
+        This is the minimum time mission generation could take if every stage that
+        does not depend on another ran concurrently. Stages are checked in declaration
+        order, which is a topological order.
+        """
+        finish: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+        for name, dependencies in self.dependencies.items():
+            latest = max(dependencies, key=lambda d: finish[d], default=None)
+            previous[name] = latest
+            start = 0.0 if latest is None else finish[latest]
+            finish[name] = start + self.timings[name].duration
+
+        path = []
+        current = max(finish, key=lambda n: finish[n], default=None)
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        path.reverse()
+        return path
+
+    def to_json(self) -> dict[str, Any]:
+        critical_path = self.critical_path()
+        return {
+            "wall_seconds": self.wall_seconds,
+            "stages": {name: timing.duration for name, timing in self.timings.items()},
+            "critical_path": critical_path,
+            "critical_path_seconds": sum(
+                self.timings[n].duration for n in critical_path
+            ),
+        }
+
+
+class StageGraph:
+    def __init__(self, stages: Iterable[GenerationStage]) -> None:
+        self.stages: list[GenerationStage] = []
+        declared: set[str] = set()
+        for stage in stages:
+            if stage.name in declared:
+                raise ValueError(f"Duplicate mission generation stage {stage.name}")
+            # Requiring dependencies to be declared first makes the declaration order
+            # a topological order, and makes cycles impossible.
+            for dependency in stage.depends_on:
+                if dependency not in declared:
+                    raise ValueError(
+                        f"Mission generation stage {stage.name} depends on "
+                        f"{dependency}, which has not been declared before it"
+                    )
+            declared.add(stage.name)
+            self.stages.append(stage)
+
+    def run(self) -> StageReport:
+        report = StageReport({s.name: s.depends_on for s in self.stages})
+        start = timeit.default_timer()
+        futures: dict[str, Future[None]] = {}
+        with ThreadPoolExecutor(thread_name_prefix="MissionGeneration") as executor:
+            for stage in self.stages:
+                waits_for = [futures[d] for d in stage.depends_on if d in futures]
+                if stage.concurrent:
+                    futures[stage.name] = executor.submit(
+                        self._run_stage, stage, waits_for, report
+                    )
+                else:
+                    self._run_stage(stage, waits_for, report)
+            # Raise any errors from the concurrent stages.
+            for future in futures.values():
+                future.result()
+        report.wall_seconds = timeit.default_timer() - start
+        return report
+
+    @staticmethod
+    def _run_stage(
+        stage: GenerationStage, waits_for: list[Future[None]], report: StageReport
+    ) -> None:
+        for dependency in waits_for:
+            dependency.result()
+        with logged_duration(stage.name):
+            stage_start = timeit.default_timer()
+            stage.run()
+            report.timings[stage.name] = StageTiming(
+                stage_start, timeit.default_timer()
+            )
@@ -23,9 +23,14 @@
 aircraft will be able to see the enemy's kneeboard for the same airframe.
 """
 import datetime
+import logging
 import math
+import os
+import shutil
 import textwrap
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, TYPE_CHECKING, Tuple
@@ -39,6 +44,7 @@
 from game.ato.flightwaypointtype import FlightWaypointType
 from game.data.alic import AlicCodes
 from game.dcs.aircrafttype import AircraftType
+from game.profiling import logged_duration
 from game.radio.radios import RadioFrequency
 from game.runways import RunwayData
 from game.theater import TheaterGroundObject, TheaterUnit
@@ -54,9 +60,115 @@
     from game import Game
 
 
+@dataclass(frozen=True)
+class KneeboardFont:
+    path: str
+    size: int
+
+    def load(self) -> ImageFont.FreeTypeFont:
+        return load_font(self.path, self.size)
+
+
+_thread_fonts = threading.local()
+
+
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Loads a font, reusing the font if this thread has already loaded it.
+
+    Pages are rendered by several threads at once, and a FreeType font must not be
+    used by two threads at the same time, so each thread loads its own fonts.
+    """
+    fonts: dict[
+        tuple[str, int], ImageFont.FreeTypeFont
+    ] = _thread_fonts.__dict__.setdefault("fonts", {})
+    key = (path, size)
+    if key not in fonts:
+        fonts[key] = ImageFont.truetype(path, size)
+    return fonts[key]
+
+
+@dataclass(frozen=True)
+class KneeboardText:
+    text: str
+    font: KneeboardFont
+    fill: Tuple[int, int, int]
+    wrap: bool
+
+
+@dataclass(frozen=True)
+class KneeboardPageContent:
+    """Everything needed to render a kneeboard page.
+
+    This contains only the text of the page rather than the game objects it was
+    created from, so it can be rendered on another thread, and
+    pages with identical content compare (and hash) equal.
+    """
+
+    image_size: Tuple[int, int]
+    background_fill: Tuple[int, int, int]
+    page_margin: int
+    line_spacing: int
+    texts: Tuple[KneeboardText, ...]
+
+    def render(self) -> Image.Image:
+        image = Image.new("RGB", self.image_size, self.background_fill)
+        draw = ImageDraw.Draw(image)
+        x = y = self.page_margin
+        for text in self.texts:
+            font = text.font.load()
+            value = text.text
+            if text.wrap:
+                value = "\n".join(
+                    KneeboardPageWriter.wrap_line_with_font(
+                        line, self.image_size[0] - self.page_margin - x, font
+                    )
+                    for line in value.splitlines()
+                )
+
+            draw.text((x, y), value, font=font, fill=text.fill)
+            left, top, right, bottom = draw.textbbox((0, 0), value, font=font)
+            height = bottom - top
+            y += height + self.line_spacing
+        return image
+
+
+def render_kneeboard_page(content: KneeboardPageContent, path: Path) -> None:
+    content.render().save(path)
+
+
+def render_kneeboard_pages(pages: dict[KneeboardPageContent, Path]) -> None:
+    """Renders each of the given pages to its path.
+
+    Pillow releases the GIL while it rasterizes text and compresses the image, so the
+    pages are rendered in parallel by a thread pool. A process pool would also run the
+    layout code in parallel, but starting one costs more than rendering a typical
+    mission's pages, especially on Windows where each worker reimports the game.
+    """
+    workers = min(len(pages), os.cpu_count() or 1)
+    if workers <= 1:
+        for content, path in pages.items():
+            render_kneeboard_page(content, path)
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="Kneeboard"
+    ) as executor:
+        # Consume the results so that exceptions in the workers are raised here.
+        list(executor.map(render_kneeboard_page, pages.keys(), pages.values()))
+
+
 class KneeboardPageWriter:
     """Creates kneeboard images."""
 
+    # These font sizes create a relatively full page for current sorties. If we start
+    # generating more complicated flight plans, or start including more information in
+    # the comm ladder (the latter of which we should probably do), we'll need to split
+    # some of this information off into a second page.
+    TITLE_FONT = KneeboardFont("arial.ttf", 32)
+    HEADING_FONT = KneeboardFont("arial.ttf", 24)
+    CONTENT_FONT = KneeboardFont("arial.ttf", 16)
+    TABLE_FONT = KneeboardFont("resources/fonts/Inconsolata.otf", 20)
+
     def __init__(
         self, page_margin: int = 24, line_spacing: int = 12, dark_theme: bool = False
     ) -> None:
@@ -67,30 +179,18 @@ def __init__(
             self.foreground_fill = (15, 15, 15)
             self.background_fill = (255, 252, 252)
         self.image_size = (768, 1024)
-        self.image = Image.new("RGB", self.image_size, self.background_fill)
-        # These font sizes create a relatively full page for current sorties. If
-        # we start generating more complicated flight plans, or start including
-        # more information in the comm ladder (the latter of which we should
-        # probably do), we'll need to split some of this information off into a
-        # second page.
-        self.title_font = ImageFont.truetype("arial.ttf", 32)
-        self.heading_font = ImageFont.truetype("arial.ttf", 24)
-        self.content_font = ImageFont.truetype("arial.ttf", 16)
-        self.table_font = ImageFont.truetype("resources/fonts/Inconsolata.otf", 20)
-        self.draw = ImageDraw.Draw(self.image)
+        self.title_font = self.TITLE_FONT
+        self.heading_font = self.HEADING_FONT
+        self.content_font = self.CONTENT_FONT
+        self.table_font = self.TABLE_FONT
         self.page_margin = page_margin
-        self.x = page_margin
-        self.y = page_margin
         self.line_spacing = line_spacing
-
-    @property
-    def position(self) -> Tuple[int, int]:
-        return self.x, self.y
+        self.texts: list[KneeboardText] = []
 
     def text(
         self,
         text: str,
-        font: Optional[ImageFont.FreeTypeFont] = None,
+        font: Optional[KneeboardFont] = None,
         fill: Optional[Tuple[int, int, int]] = None,
         wrap: bool = False,
     ) -> None:
@@ -98,19 +198,7 @@ def text(
             font = self.content_font
         if fill is None:
             fill = self.foreground_fill
-
-        if wrap:
-            text = "\n".join(
-                self.wrap_line_with_font(
-                    line, self.image_size[0] - self.page_margin - self.x, font
-                )
-                for line in text.splitlines()
-            )
-
-        self.draw.text(self.position, text, font=font, fill=fill)
-        left, top, right, bottom = self.draw.textbbox((0, 0), text, font=font)
-        height = bottom - top
-        self.y += height + self.line_spacing
+        self.texts.append(KneeboardText(text, font, fill, wrap))
 
     def title(self, title: str) -> None:
         self.text(title, font=self.title_font, fill=self.foreground_fill)
@@ -122,7 +210,7 @@ def table(
         self,
         cells: List[List[str]],
         headers: Optional[List[str]] = None,
-        font: Optional[ImageFont.FreeTypeFont] = None,
+        font: Optional[KneeboardFont] = None,
     ) -> None:
         if headers is None:
             headers = []
@@ -131,8 +219,17 @@ def table(
         table = tabulate(cells, headers=headers, numalign="right")
         self.text(table, font, fill=self.foreground_fill)
 
+    def content(self) -> KneeboardPageContent:
+        return KneeboardPageContent(
+            self.image_size,
+            self.background_fill,
+            self.page_margin,
+            self.line_spacing,
+            tuple(self.texts),
+        )
+
     def write(self, path: Path) -> None:
-        self.image.save(path)
+        render_kneeboard_page(self.content(), path)
 
     @staticmethod
     def wrap_line(inputstr: str, max_length: int) -> str:
@@ -173,9 +270,13 @@ def wrap_line_with_font(
 class KneeboardPage:
     """Base class for all kneeboard pages."""
 
+    def layout(self) -> KneeboardPageWriter:
+        """Returns a writer containing the content of the kneeboard page."""
+        raise NotImplementedError
+
     def write(self, path: Path) -> None:
         """Writes the kneeboard page to the given path."""
-        raise NotImplementedError
+        self.layout().write(path)
 
 
 @dataclass(frozen=True)
@@ -321,11 +422,9 @@ def __init__(
         self.weather = weather
         self.start_time = start_time
         self.dark_kneeboard = dark_kneeboard
-        self.flight_plan_font = ImageFont.truetype(
-            "resources/fonts/Inconsolata.otf", 16
-        )
+        self.flight_plan_font = KneeboardFont("resources/fonts/Inconsolata.otf", 16)
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -414,7 +513,7 @@ def write(self, path: Path) -> None:
                 codes.append([str(idx), "" if code is None else str(code)])
             writer.table(codes, ["#", "Laser Code"])
 
-        writer.write(path)
+        return writer
 
     def airfield_info_row(
         self, row_title: str, runway: Optional[RunwayData]
@@ -489,7 +588,7 @@ def __init__(
         self.dark_kneeboard = dark_kneeboard
         self.comms.append(CommInfo("Flight", self.flight.intra_flight_channel))
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -561,7 +660,7 @@ def write(self, path: Path) -> None:
             )
         writer.table(jtacs, headers=["Callsign", "Region", "Laser Code", "FREQ"])
 
-        writer.write(path)
+        return writer
 
     def format_frequency(self, frequency: RadioFrequency) -> str:
         channel = self.flight.channel_for(frequency)
@@ -599,7 +698,7 @@ def alic_for(unit: TheaterUnit) -> str:
         except KeyError:
             return ""
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -613,7 +712,7 @@ def write(self, path: Path) -> None:
             headers=["Description", "ALIC", "Location"],
         )
 
-        writer.write(path)
+        return writer
 
     def target_info_row(self, unit: TheaterUnit) -> List[str]:
         ll = unit.position.latlng()
@@ -639,7 +738,7 @@ def targets(self) -> Iterator[NumberedWaypoint]:
             if waypoint.waypoint_type == FlightWaypointType.TARGET_POINT:
                 yield NumberedWaypoint(idx, waypoint)
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         if self.flight.custom_name is not None:
             custom_name_title = ' ("{}")'.format(self.flight.custom_name)
@@ -652,7 +751,7 @@ def write(self, path: Path) -> None:
             headers=["Steerpoint", "Description", "Location"],
         )
 
-        writer.write(path)
+        return writer
 
     @staticmethod
     def target_info_row(target: NumberedWaypoint) -> list[str]:
@@ -674,11 +773,11 @@ def __init__(
         self.notes = notes
         self.dark_kneeboard = dark_kneeboard
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         writer.title(f"Notes")
         writer.text(self.notes, wrap=True)
-        writer.write(path)
+        return writer
 
 
 class PackagePage(KneeboardPage):
@@ -691,7 +790,7 @@ def __init__(
         self.flights = flights
         self.dark_kneeboard = dark_kneeboard
 
-    def write(self, path: Path) -> None:
+    def layout(self) -> KneeboardPageWriter:
         writer = KneeboardPageWriter(dark_theme=self.dark_kneeboard)
         writer.title(
             f"Package {self.package.package_description} {self.package.target.name}"
@@ -718,7 +817,7 @@ def write(self, path: Path) -> None:
                 )
         writer.table(table, ["Aircraft", "Task", "Radio", "Laser code"])
 
-        writer.write(path)
+        return writer
 
 
 class KneeboardGenerator(MissionInfoGenerator):
@@ -734,14 +833,33 @@ def generate(self) -> None:
         """Generates a kneeboard per client flight."""
         temp_dir = Path("kneeboards")
         temp_dir.mkdir(exist_ok=True)
+        # Many pages (notes, package info) are identical for every flight that shows
+        # them. Each distinct page is rendered only once, and then copied to the paths
+        # of the other pages with the same content.
+        rendered: dict[KneeboardPageContent, Path] = {}
+        copies: list[tuple[Path, Path]] = []
         for aircraft, pages in self.pages_by_airframe().items():
             aircraft_dir = temp_dir / aircraft.dcs_unit_type.id
             aircraft_dir.mkdir(exist_ok=True)
             for idx, page in enumerate(pages):
                 page_path = aircraft_dir / f"page{idx:02}.png"
-                page.write(page_path)
+                content = page.layout().content()
+                if (original := rendered.get(content)) is None:
+                    rendered[content] = page_path
+                else:
+                    copies.append((original, page_path))
                 self.mission.add_aircraft_kneeboard(aircraft.dcs_unit_type, page_path)
 
+        logging.debug(
+            "Rendering %d distinct kneeboard pages of %d",
+            len(rendered),
+            len(rendered) + len(copies),
+        )
+        with logged_duration("Kneeboard rendering"):
+            render_kneeboard_pages(rendered)
+        for original, copy in copies:
+            shutil.copyfile(original, copy)
+
     def pages_by_airframe(self) -> Dict[AircraftType, List[KneeboardPage]]:
         """Returns a list of kneeboard pages per airframe in the mission.
 
@@ -33,6 +33,7 @@
 from .flotgenerator import FlotGenerator
 from .forcedoptionsgenerator import ForcedOptionsGenerator
 from .frontlineconflictdescription import FrontLineConflictDescription
+from .generationstages import GenerationStage, StageGraph, StageReport
 from .kneeboard import KneeboardGenerator
 from .luagenerator import LuaGenerator
 from .missiondata import MissionData
@@ -70,6 +71,7 @@ def __init__(self, game: Game, time: datetime) -> None:
         self.tacan_registry = TacanRegistry()
 
         self.generation_started = False
+        self.stage_report: StageReport | None = None
 
         with open("resources/default_options.lua", "r", encoding="utf-8") as f:
             self.mission.options.load_from_dict(dcs.lua.loads(f.read())["options"])
@@ -82,12 +84,19 @@ def generate_miz(self, output: Path) -> UnitMap:
             )
         self.generation_started = True
 
-        self.setup_mission_coalitions()
-        self.add_airfields_to_unit_map()
-        self.initialize_registries()
+        self.stage_report = StageGraph(self.generation_stages(output)).run()
+        logging.debug(
+            "Mission generation critical path: %s",
+            " -> ".join(self.stage_report.critical_path()),
+        )
+
+        return self.unit_map
 
-        EnvironmentGenerator(self.mission, self.game.conditions, self.time).generate()
+    def generation_stages(self, output: Path) -> list[GenerationStage]:
+        """Returns the stages of mission generation.
 
+        Stages that are not concurrent run in the order they are listed here.
+        """
         tgo_generator = TgoGenerator(
             self.mission,
             self.game,
@@ -96,34 +105,122 @@ def generate_miz(self, output: Path) -> UnitMap:
             self.unit_map,
             self.mission_data,
         )
-        tgo_generator.generate()
-
-        ConvoyGenerator(self.mission, self.game, self.unit_map).generate()
-        CargoShipGenerator(self.mission, self.game, self.unit_map).generate()
-
-        self.generate_destroyed_units()
-
-        # Generate ground conflicts first so the JTACs get the first laser code (1688)
-        # rather than the first player flight with a TGP.
-        self.generate_ground_conflicts()
-        self.generate_air_units(tgo_generator)
-
-        TriggerGenerator(self.mission, self.game).generate()
-        ForcedOptionsGenerator(self.mission, self.game).generate()
-        VisualsGenerator(self.mission, self.game).generate()
-        LuaGenerator(self.game, self.mission, self.mission_data).generate()
-        DrawingsGenerator(self.mission, self.game).generate()
-
-        self.setup_combined_arms()
-
-        self.notify_info_generators()
-
+        units = ("TGOs", "Convoys", "Cargo ships", "Ground conflicts", "Air units")
+        mission_data = ("TGOs", "Ground conflicts", "Air units")
+        stages = [
+            GenerationStage("Coalition setup", self.setup_mission_coalitions),
+            GenerationStage("Airfield unit map", self.add_airfields_to_unit_map),
+            GenerationStage("Registry initialization", self.initialize_registries),
+            GenerationStage(
+                "Environment",
+                lambda: EnvironmentGenerator(
+                    self.mission, self.game.conditions, self.time
+                ).generate(),
+            ),
+            GenerationStage(
+                "TGOs",
+                tgo_generator.generate,
+                depends_on=(
+                    "Coalition setup",
+                    "Airfield unit map",
+                    "Registry initialization",
+                ),
+            ),
+            GenerationStage(
+                "Convoys",
+                lambda: ConvoyGenerator(
+                    self.mission, self.game, self.unit_map
+                ).generate(),
+                depends_on=("Coalition setup",),
+            ),
+            GenerationStage(
+                "Cargo ships",
+                lambda: CargoShipGenerator(
+                    self.mission, self.game, self.unit_map
+                ).generate(),
+                depends_on=("Coalition setup",),
+            ),
+            GenerationStage(
+                "Destroyed units",
+                self.generate_destroyed_units,
+                depends_on=("Coalition setup",),
+            ),
+            # Generate ground conflicts first so the JTACs get the first laser code
+            # (1688) rather than the first player flight with a TGP.
+            GenerationStage(
+                "Ground conflicts",
+                self.generate_ground_conflicts,
+                depends_on=("Coalition setup", "Registry initialization"),
+            ),
+            GenerationStage(
+                "Air units",
+                lambda: self.generate_air_units(tgo_generator),
+                depends_on=("TGOs", "Ground conflicts"),
+            ),
+            GenerationStage(
+                "Triggers",
+                lambda: TriggerGenerator(self.mission, self.game).generate(),
+                depends_on=units,
+            ),
+            GenerationStage(
+                "Forced options",
+                lambda: ForcedOptionsGenerator(self.mission, self.game).generate(),
+            ),
+            GenerationStage(
+                "Visuals",
+                lambda: VisualsGenerator(self.mission, self.game).generate(),
+                depends_on=("Coalition setup",),
+            ),
+            GenerationStage(
+                "Lua",
+                lambda: LuaGenerator(
+                    self.game, self.mission, self.mission_data
+                ).generate(),
+                depends_on=units,
+            ),
+            # The drawings and kneeboards only read the game and the mission data, and
+            # each writes to a part of the mission that nothing else touches.
+            GenerationStage(
+                "Drawings",
+                lambda: DrawingsGenerator(self.mission, self.game).generate(),
+                concurrent=True,
+            ),
+            GenerationStage("Combined arms", self.setup_combined_arms),
+            GenerationStage(
+                "Kneeboards",
+                lambda: self.generate_mission_info(
+                    KneeboardGenerator(self.mission, self.game)
+                ),
+                depends_on=("Environment",) + mission_data,
+                concurrent=True,
+            ),
+            GenerationStage(
+                "Briefing",
+                lambda: self.generate_mission_info(
+                    BriefingGenerator(self.mission, self.game)
+                ),
+                depends_on=mission_data,
+            ),
+        ]
         # TODO: Shouldn't this be first?
-        namegen.reset_numbers()
-        self.setup_mission_warehouses()
-        self.mission.save(output)
-
-        return self.unit_map
+        stages.append(
+            GenerationStage(
+                "Name reset",
+                namegen.reset_numbers,
+                depends_on=tuple(s.name for s in stages if not s.concurrent),
+            )
+        )
+        stages.append(
+            GenerationStage("Warehouses", self.setup_mission_warehouses),
+        )
+        stages.append(
+            GenerationStage(
+                "Mission save",
+                lambda: self.mission.save(output),
+                depends_on=tuple(s.name for s in stages),
+            )
+        )
+        return stages
 
     def setup_mission_coalitions(self) -> None:
         self.mission.coalition["blue"] = Coalition(
@@ -161,12 +258,10 @@ def setup_mission_warehouses(self) -> None:
             for control_point in self.game.theater.controlpoints
             if control_point.dcs_airport
         ]
-        # All weapons liberation is aware of
-        all_weapons = allowed_weapons = WeaponWSType.populate_weapons()
         if self.game.settings.restrict_weapons_by_date:
-            allowed_weapons = [
-                weapon for weapon in all_weapons if weapon.available_on(self.game.date)
-            ]
+            allowed_weapons = WeaponWSType.available_weapons(
+                self.game.date, restrict_by_date=True
+            )
             warehouse.add_to_warehouse(all_airports, allowed_weapons)
         self.mission.warehouses = warehouse.warehouses
 
@@ -340,34 +435,27 @@ def generate_destroyed_units(self) -> None:
                     dead=True,
                 )
 
-    def notify_info_generators(
-        self,
-    ) -> None:
-        """Generates subscribed MissionInfoGenerator objects."""
+    def generate_mission_info(self, gen: MissionInfoGenerator) -> None:
+        """Generates a MissionInfoGenerator from the mission data."""
         mission_data = self.mission_data
-        gens: list[MissionInfoGenerator] = [
-            KneeboardGenerator(self.mission, self.game),
-            BriefingGenerator(self.mission, self.game),
-        ]
-        for gen in gens:
-            for dynamic_runway in mission_data.runways:
-                gen.add_dynamic_runway(dynamic_runway)
+        for dynamic_runway in mission_data.runways:
+            gen.add_dynamic_runway(dynamic_runway)
 
-            for tanker in mission_data.tankers:
-                if tanker.blue:
-                    gen.add_tanker(tanker)
+        for tanker in mission_data.tankers:
+            if tanker.blue:
+                gen.add_tanker(tanker)
 
-            for aewc in mission_data.awacs:
-                if aewc.blue:
-                    gen.add_awacs(aewc)
+        for aewc in mission_data.awacs:
+            if aewc.blue:
+                gen.add_awacs(aewc)
 
-            for jtac in mission_data.jtacs:
-                if jtac.blue:
-                    gen.add_jtac(jtac)
+        for jtac in mission_data.jtacs:
+            if jtac.blue:
+                gen.add_jtac(jtac)
 
-            for package in mission_data.briefing_data:
-                gen.add_package_briefing_data(package)
-            gen.generate()
+        for package in mission_data.briefing_data:
+            gen.add_package_briefing_data(package)
+        gen.generate()
 
     def setup_combined_arms(self) -> None:
         self.mission.groundControl.blue_game_masters = (
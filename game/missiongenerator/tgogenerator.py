@@ -63,6 +63,7 @@
 from game.radio.tacan import TacanBand, TacanChannel, TacanRegistry, TacanUsage
 from game.runways import RunwayData
 from game.theater import ControlPoint, TheaterGroundObject, TheaterUnit
+from game.theater.landmap import LandClass
 from game.theater.theatergroundobject import (
     CarrierGroundObject,
     GenericCarrierGroundObject,
@@ -628,11 +629,15 @@ def steam_into_wind(self, group: ShipGroup) -> Optional[Heading]:
         brc = Heading.from_degrees(wind.direction).opposite
         # Aim for 25kts over the deck.
         carrier_speed = knots(25) - mps(wind.speed)
-        for attempt in range(5):
-            point = group.points[0].position.point_from_heading(
+        points = [
+            group.points[0].position.point_from_heading(
                 brc.degrees, 100000 - attempt * 20000
             )
-            if self.game.theater.is_in_sea(point):
+            for attempt in range(5)
+        ]
+        classes = self.game.theater.classify_points(points)
+        for point, land_class in zip(points, classes):
+            if land_class == LandClass.SEA:
                 group.points[0].speed = carrier_speed.meters_per_second
                 group.add_waypoint(point, carrier_speed.kph)
                 # Rotate the whole ground object to the new course
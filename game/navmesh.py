@@ -4,9 +4,12 @@
 import math
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
+import numpy as np
+import shapely
 from dcs.mapping import Point
+from shapely import STRtree
 from shapely.geometry import (
     LineString,
     MultiPolygon,
@@ -16,6 +19,7 @@
 )
 from shapely.ops import nearest_points, triangulate
 
+from game.profiling import TraceRegistry
 from game.theater import ConflictTheater
 from game.threatzones import ThreatZones
 from game.utils import nautical_miles
@@ -70,6 +74,15 @@ def __str__(self) -> str:
         return f"{self.point} in {self.poly.ident}"
 
 
+@dataclass
+class PathCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+PathCacheKey = Tuple[NavMeshPoly, NavMeshPoly, int, int, int, int]
+
+
 @dataclass(frozen=True, order=True)
 class FrontierNode:
     cost: float
@@ -94,20 +107,38 @@ class NavMesh:
     def __init__(self, polys: List[NavMeshPoly], theater: ConflictTheater) -> None:
         self.polys = polys
         self.theater = theater
+        self._index = STRtree([p.poly for p in polys])
+        # Paths are cached for the lifetime of the mesh. The mesh is rebuilt whenever
+        # the threat zones change, which discards the cache along with it.
+        self._path_cache: Dict[PathCacheKey, List[Point]] = {}
+        self.path_cache_stats = PathCacheStats()
 
     def localize(self, point: Point) -> Optional[NavMeshPoly]:
-        # This is a naive implementation but it's O(n). Runs at about 10k
-        # lookups a second on a 5950X. Flights usually have 5-10 waypoints, so
-        # that's 1k-2k flights before we lose a full second to localization as a
-        # part of flight plan creation.
-        #
-        # Can improve the algorithm later if needed, but that seems unnecessary
-        # currently.
-        p = ShapelyPoint(point.x, point.y)
-        for navpoly in self.polys:
-            if navpoly.poly.intersects(p):
-                return navpoly
-        return None
+        return self.localize_many([point])[0]
+
+    def localize_many(self, points: Iterable[Point]) -> List[Optional[NavMeshPoly]]:
+        """Finds the nav poly containing each of the given points.
+
+        The lookup is backed by an STRtree built when the mesh is constructed, so
+        each point only tests the handful of polys whose bounding boxes contain it
+        rather than every poly in the mesh. Points that fall on a shared edge
+        resolve to the first matching poly in the mesh, the same result a linear
+        scan would give.
+
+        Returns a list the same length as the input. Points that are outside the
+        mesh are localized to None.
+        """
+        coords = np.array([(p.x, p.y) for p in points], dtype=float).reshape(-1, 2)
+        if not len(coords):
+            return []
+        point_indices, poly_indices = self._index.query(
+            shapely.points(coords), predicate="intersects"
+        )
+        # Keep the lowest matching poly index for each point. Points with no match
+        # are left at len(self.polys), which is out of range and means no poly.
+        best = np.full(len(coords), len(self.polys))
+        np.minimum.at(best, point_indices, poly_indices)
+        return [self.polys[i] if i < len(self.polys) else None for i in best]
 
     @staticmethod
     def travel_cost(a: NavPoint, b: NavPoint) -> float:
@@ -144,19 +175,41 @@ def dcs_to_shapely_point(point: Point) -> ShapelyPoint:
         return ShapelyPoint(point.x, point.y)
 
     def shortest_path(self, origin: Point, destination: Point) -> List[Point]:
-        origin_poly = self.localize(origin)
+        origin_poly, destination_poly = self.localize_many([origin, destination])
         if origin_poly is None:
             raise NavMeshError(f"Origin point {origin} is outside the navmesh")
-        destination_poly = self.localize(destination)
         if destination_poly is None:
             raise NavMeshError(
                 f"Destination point {destination} is outside the navmesh"
             )
 
-        return self._shortest_path(
-            NavPoint(self.dcs_to_shapely_point(origin), origin_poly),
-            NavPoint(self.dcs_to_shapely_point(destination), destination_poly),
+        key = (
+            origin_poly,
+            destination_poly,
+            round(origin.x),
+            round(origin.y),
+            round(destination.x),
+            round(destination.y),
         )
+        path = self._path_cache.get(key)
+        if path is None:
+            self.path_cache_stats.misses += 1
+            TraceRegistry.get().increment("Navmesh path cache misses")
+            path = self._shortest_path(
+                NavPoint(self.dcs_to_shapely_point(origin), origin_poly),
+                NavPoint(self.dcs_to_shapely_point(destination), destination_poly),
+            )
+            self._path_cache[key] = path
+        else:
+            self.path_cache_stats.hits += 1
+            TraceRegistry.get().increment("Navmesh path cache hits")
+
+        # The cached path may have been found for endpoints that differ by a
+        # fraction of a meter, so use the exact endpoints that were requested. Also
+        # protects the cached path from modification by the caller.
+        if len(path) < 2:
+            return list(path)
+        return [origin] + path[1:-1] + [destination]
 
     def _shortest_path(self, origin: NavPoint, destination: NavPoint) -> List[Point]:
         # Adapted from
@@ -218,8 +271,10 @@ def map_bounds(theater: ConflictTheater) -> Polygon:
     def create_navpolys(
         polys: List[Polygon], threat_zones: ThreatZones
     ) -> List[NavMeshPoly]:
+        threatened = threat_zones.geometries_threatened(polys)
         return [
-            NavMeshPoly(i, p, threat_zones.threatened(p)) for i, p in enumerate(polys)
+            NavMeshPoly(i, p, bool(t))
+            for i, (p, t) in enumerate(zip(polys, threatened))
         ]
 
     @staticmethod
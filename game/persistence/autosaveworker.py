@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from game.profiling import TraceRegistry
+
+
+@dataclass
+class PendingSave:
+    bundle_path: Path
+    name: str
+    write: Callable[[], None]
+
+
+class AutosaveWorker:
+    """Writes automatic saves on a background thread.
+
+    The caller is responsible for snapshotting the game (pickling it) before
+    submitting the save, since the game will continue to be modified while the save is
+    pending. Compressing and writing the snapshot is done by the worker so that the UI
+    isn't blocked by it.
+
+    Saves are written one at a time in the order they were submitted. If a save of the
+    same bundle member is submitted while an earlier one is still waiting to be
+    written, the earlier one is dropped since it would be overwritten anyway.
+
+    The worker is shared by the whole process rather than owned by the SaveManager
+    because the SaveManager is pickled with the game.
+    """
+
+    _instance: Optional[AutosaveWorker] = None
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._pending: dict[tuple[Path, str], PendingSave] = {}
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> AutosaveWorker:
+        if cls._instance is None:
+            cls._instance = AutosaveWorker()
+        return cls._instance
+
+    def submit(self, bundle_path: Path, name: str, write: Callable[[], None]) -> None:
+        with self._condition:
+            key = (bundle_path, name)
+            if key in self._pending:
+                logging.debug("Dropping superseded save of %s to %s", name, bundle_path)
+                TraceRegistry.get().increment("Autosaves coalesced")
+            self._pending[key] = PendingSave(bundle_path, name, write)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="Autosave", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Blocks until all submitted saves have been written."""
+        with self._condition:
+            if threading.current_thread() is self._thread:
+                return
+            self._condition.wait_for(lambda: not self._pending and not self._busy)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: bool(self._pending))
+                save = self._pending.pop(next(iter(self._pending)))
+                self._busy = True
+            try:
+                save.write()
+            except Exception:
+                logging.exception(
+                    "Failed to write %s to %s", save.name, save.bundle_path
+                )
+                self._report(save.name, failed=True)
+            else:
+                self._report(save.name, failed=False)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    @staticmethod
+    def _report(name: str, failed: bool) -> None:
+        from game.server import EventStream
+        from game.sim import GameUpdateEvents
+
+        events = GameUpdateEvents()
+        if failed:
+            events.fail_autosave(name)
+        else:
+            events.complete_autosave(name)
+        EventStream.put_nowait(events)
@@ -31,5 +31,13 @@ def mission_path_for(name: str) -> Path:
     return Path(base_path()) / "Missions" / name
 
 
+def resource_data_cache_path() -> Path:
+    return liberation_user_dir() / "Cache/resources.p"
+
+
+def terrain_tile_cache_dir() -> Path:
+    return liberation_user_dir() / "Cache/TerrainTiles"
+
+
 def waypoint_debug_directory() -> Path:
     return liberation_user_dir() / "Debug/Waypoints"
@@ -4,22 +4,53 @@
 import pickle
 import shutil
 from pathlib import Path
+from dataclasses import dataclass
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING
-from zipfile import ZIP_LZMA, ZipFile
+from typing import Optional, TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile
 
 from game.profiling import logged_duration
 from game.zipfileext import ZipFileExt
+from .autosaveworker import AutosaveWorker
 
 if TYPE_CHECKING:
     from game import Game
 
 
+@dataclass(frozen=True)
+class SaveCodec:
+    """The compression used for a member of the save game bundle.
+
+    Loading does not need to know the codec, since each zip member records how it was
+    compressed. Saves written with older codecs (LZMA prior to 10.0) remain loadable.
+    """
+
+    compression: int
+    compresslevel: Optional[int] = None
+
+    @staticmethod
+    def lzma() -> SaveCodec:
+        """Smallest output, but very slow for multi-MB pickles."""
+        return SaveCodec(ZIP_LZMA)
+
+    @staticmethod
+    def zlib(level: int = 6) -> SaveCodec:
+        return SaveCodec(ZIP_DEFLATED, level)
+
+    @staticmethod
+    def uncompressed() -> SaveCodec:
+        return SaveCodec(ZIP_STORED)
+
+
 class SaveGameBundle:
     """The bundle of saved game assets.
 
     A save game bundle includes the pickled game object (as well as some backups of
     other game states, like the turn start and previous turn) and the state.json.
+
+    Each member is appended to the bundle when it is updated rather than rewriting the
+    whole bundle, so saving one checkpoint does not recompress the others. The stale
+    copies are dropped once they take up more space than the live members.
     """
 
     MANUAL_SAVE_NAME = "player.liberation"
@@ -27,8 +58,21 @@ class SaveGameBundle:
     START_OF_TURN_SAVE_NAME = "start_of_turn.liberation"
     PRE_SIM_CHECKPOINT_SAVE_NAME = "pre_sim_checkpoint.liberation"
 
-    def __init__(self, bundle_path: Path) -> None:
+    # The player save is the one most likely to be kept around or shared, so it is
+    # worth a bit more time compressing it. The checkpoints are written several times
+    # per turn and are usually overwritten before they are ever loaded.
+    DEFAULT_PLAYER_CODEC = SaveCodec.zlib(6)
+    DEFAULT_CHECKPOINT_CODEC = SaveCodec.zlib(1)
+
+    def __init__(
+        self,
+        bundle_path: Path,
+        player_codec: SaveCodec = DEFAULT_PLAYER_CODEC,
+        checkpoint_codec: SaveCodec = DEFAULT_CHECKPOINT_CODEC,
+    ) -> None:
         self.bundle_path = bundle_path
+        self.player_codec = player_codec
+        self.checkpoint_codec = checkpoint_codec
 
     def save_player(self, game: Game, copy_from: SaveGameBundle | None) -> None:
         """Writes the save game manually created by the player.
@@ -36,9 +80,11 @@ def save_player(self, game: Game, copy_from: SaveGameBundle | None) -> None:
         This save is the one created whenever the player presses save or save-as.
         """
         with logged_duration("Saving game"):
-            self._update_bundle_member(game, self.MANUAL_SAVE_NAME, copy_from)
+            self._update_bundle_member(
+                game, self.MANUAL_SAVE_NAME, copy_from, self.player_codec
+            )
 
-    def save_last_turn(self, game: Game) -> None:
+    def save_last_turn(self, game: Game, background: bool = False) -> None:
         """Writes the save for the state of the previous turn.
 
         This save is the state of the game before the state.json changes are applied.
@@ -46,9 +92,11 @@ def save_last_turn(self, game: Game) -> None:
         transition, but can also be used by players to "rewind" to the previous turn.
         """
         with logged_duration("Saving last turn"):
-            self._update_bundle_member(game, self.LAST_TURN_SAVE_NAME, copy_from=self)
+            self._update_bundle_member(
+                game, self.LAST_TURN_SAVE_NAME, self, self.checkpoint_codec, background
+            )
 
-    def save_start_of_turn(self, game: Game) -> None:
+    def save_start_of_turn(self, game: Game, background: bool = False) -> None:
         """Writes the save for the state at the start of the turn.
 
         This save is the state of the game immediately after the state.json is applied.
@@ -56,10 +104,14 @@ def save_start_of_turn(self, game: Game) -> None:
         """
         with logged_duration("Saving start of turn"):
             self._update_bundle_member(
-                game, self.START_OF_TURN_SAVE_NAME, copy_from=self
+                game,
+                self.START_OF_TURN_SAVE_NAME,
+                self,
+                self.checkpoint_codec,
+                background,
             )
 
-    def save_pre_sim_checkpoint(self, game: Game) -> None:
+    def save_pre_sim_checkpoint(self, game: Game, background: bool = False) -> None:
         """Writes the save file for the state before beginning simulation.
 
         This save is the state of the game after the player presses "TAKE OFF", but
@@ -69,7 +121,11 @@ def save_pre_sim_checkpoint(self, game: Game) -> None:
         """
         with logged_duration("Saving pre-sim checkpoint"):
             self._update_bundle_member(
-                game, self.PRE_SIM_CHECKPOINT_SAVE_NAME, copy_from=self
+                game,
+                self.PRE_SIM_CHECKPOINT_SAVE_NAME,
+                self,
+                self.checkpoint_codec,
+                background,
             )
 
     def load_player(self) -> Game:
@@ -89,6 +145,7 @@ def load_pre_sim_checkpoint(self) -> Game:
         return self._load_from(self.PRE_SIM_CHECKPOINT_SAVE_NAME)
 
     def _load_from(self, name: str) -> Game:
+        AutosaveWorker.get().flush()
         with ZipFile(self.bundle_path) as zip_bundle:
             with zip_bundle.open(name, "r") as save:
                 game = pickle.load(save)
@@ -96,7 +153,41 @@ def _load_from(self, name: str) -> Game:
                 return game
 
     def _update_bundle_member(
-        self, game: Game, name: str, copy_from: SaveGameBundle | None
+        self,
+        game: Game,
+        name: str,
+        copy_from: SaveGameBundle | None,
+        codec: SaveCodec,
+        background: bool = False,
+    ) -> None:
+        """Saves the game to the named member of the bundle.
+
+        The game is always pickled on the calling thread, since it may be modified as
+        soon as this returns. If background is True, the rest of the save is done by the
+        AutosaveWorker and this returns without waiting for it.
+        """
+        # Pickle before touching any files so that a failure to pickle doesn't leave
+        # anything behind.
+        with logged_duration(f"Pickling {name}"):
+            data = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if background:
+            AutosaveWorker.get().submit(
+                self.bundle_path,
+                name,
+                lambda: self._write_bundle_member(name, data, copy_from, codec),
+            )
+        else:
+            # Don't race with the worker for the bundle we're copying from or writing.
+            AutosaveWorker.get().flush()
+            self._write_bundle_member(name, data, copy_from, codec)
+
+    def _write_bundle_member(
+        self,
+        name: str,
+        data: bytes,
+        copy_from: SaveGameBundle | None,
+        codec: SaveCodec,
     ) -> None:
         # Perform all save work in a copy of the current save to avoid corrupting the
         # save if there's an error while saving.
@@ -107,17 +198,28 @@ def _update_bundle_member(
 
         # We don't have all the state to create the temporary save from scratch (no last
         # turn, start of turn, etc.), so copy the existing save to create the temp save.
+        # The new member is appended rather than replacing the old one, which would
+        # require rewriting the whole archive. The old copy is shadowed by the new one
+        # and is dropped when the archive is compacted.
         #
-        # Python doesn't actually support overwriting or removing zipfile members, so we
-        # have to create a new zipfile and copy over only the files that we won't be
-        # writing.
+        # Copying the bundle is a cost we accept for every checkpoint. Appending to the
+        # bundle in place would avoid it, but ZipFile overwrites the central directory
+        # when it appends, so a crash while writing would leave the player with a
+        # corrupt save. A plain file copy is cheap compared to compressing the pickle.
         if copy_from is not None and copy_from.bundle_path.exists():
             shutil.copy(copy_from.bundle_path, temp_file_path)
-            ZipFileExt.remove_member(temp_file_path, name, missing_ok=True)
+        else:
+            with ZipFile(temp_file_path, "w"):
+                pass
 
-        with ZipFile(temp_file_path, "a", compression=ZIP_LZMA) as zip_bundle:
-            with zip_bundle.open(name, "w") as entry:
-                pickle.dump(game, entry)
+        with logged_duration(f"Writing {name}"):
+            ZipFileExt.replace_member(
+                temp_file_path, name, data, codec.compression, codec.compresslevel
+            )
+        shadowed, live = ZipFileExt.shadowed_bytes(temp_file_path)
+        if shadowed > live:
+            with logged_duration("Compacting save game bundle"):
+                ZipFileExt.compact(temp_file_path)
 
         try:
             temp_file_path.replace(self.bundle_path)
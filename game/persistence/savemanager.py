@@ -45,15 +45,15 @@ def save_player(self, override_destination: Path | None = None) -> None:
 
     def save_last_turn(self) -> None:
         with self._save_bundle_context() as bundle:
-            bundle.save_last_turn(self.game)
+            bundle.save_last_turn(self.game, background=True)
 
     def save_start_of_turn(self) -> None:
         with self._save_bundle_context() as bundle:
-            bundle.save_start_of_turn(self.game)
+            bundle.save_start_of_turn(self.game, background=True)
 
     def save_pre_sim_checkpoint(self) -> None:
         with self._save_bundle_context() as bundle:
-            bundle.save_pre_sim_checkpoint(self.game)
+            bundle.save_pre_sim_checkpoint(self.game, background=True)
 
     def set_loaded_from(self, bundle: SaveGameBundle) -> None:
         """Reconfigures this save manager based on the loaded game.
@@ -1,21 +1,238 @@
 from __future__ import annotations
 
 import logging
+import math
+import threading
 import timeit
-from collections import defaultdict
+from collections import defaultdict, deque
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 from types import TracebackType
-from typing import Iterator, Optional, Type
+from typing import Any, ClassVar, Iterable, Iterator, Optional, Type
 
 
 @contextmanager
 def logged_duration(event: str) -> Iterator[None]:
-    timer = Timer()
-    with timer:
+    with TraceRegistry.get().span(event) as span:
         yield
-    logging.debug("%s took %s", event, timer.duration)
+    logging.debug("%s took %s", event, span.duration)
+
+
+@dataclass
+class Span:
+    name: str
+    thread_id: int
+    start: float
+    end: Optional[float] = None
+    children: list[Span] = field(default_factory=list)
+    #: The number of spans that were folded into this one, including itself.
+    count: int = 1
+    #: The time spent in the spans that were folded into this one, excluding itself.
+    folded_seconds: float = 0.0
+
+    #: Once a span has this many children, further children are folded into an
+    #: earlier child with the same name. Some spans time thousands of small events,
+    #: such as every estimate made by the mission planner, and the most recent root
+    #: spans are kept for the whole session.
+    MAX_CHILDREN: ClassVar[int] = 64
+
+    @property
+    def duration(self) -> timedelta:
+        if self.end is None:
+            raise RuntimeError("Cannot query the duration of a span that is still open")
+        return timedelta(seconds=self.end - self.start + self.folded_seconds)
+
+    def add_child(self, child: Span) -> None:
+        if len(self.children) >= self.MAX_CHILDREN:
+            for sibling in reversed(self.children):
+                if sibling.name == child.name:
+                    sibling.fold(child)
+                    return
+        self.children.append(child)
+
+    def fold(self, other: Span) -> None:
+        """Adds the time and children of another span with the same name to this one."""
+        self.count += other.count
+        self.folded_seconds += other.duration.total_seconds()
+        for child in other.children:
+            self.add_child(child)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "thread_id": self.thread_id,
+            "start": self.start,
+            "duration": None if self.end is None else self.duration.total_seconds(),
+            "count": self.count,
+            "children": [c.to_json() for c in self.children],
+        }
+
+    def iter_spans(self) -> Iterator[Span]:
+        yield self
+        for child in self.children:
+            yield from child.iter_spans()
+
+    def format_tree(self, depth: int = 0) -> str:
+        """Formats the span and its children as an indented list of durations."""
+        if self.end is None:
+            duration = "unfinished"
+        else:
+            duration = f"{self.duration.total_seconds():.3f}s"
+        if self.count > 1:
+            duration += f" ({self.count} times)"
+        lines = [f"{'  ' * depth}{self.name}: {duration}"]
+        lines.extend(child.format_tree(depth + 1) for child in self.children)
+        return "\n".join(lines)
+
+
+@dataclass
+class Histogram:
+    """Distribution of observed values, bucketed by powers of two."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    buckets: dict[float, int] = field(default_factory=lambda: defaultdict(int))
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        # Each bucket counts the values that are no greater than its bound and
+        # greater than the bound of the bucket before it.
+        bound = 2.0 ** math.ceil(math.log2(value)) if value > 0 else 0.0
+        self.buckets[bound] += 1
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+            "mean": self.total / self.count if self.count else None,
+            "buckets": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+
+class TraceRegistry:
+    """Process-wide record of timed spans, counters and histograms.
+
+    Spans are timed with logged_duration or MultiEventTracer.trace, and spans opened
+    while another span is open on the same thread are recorded as its children. Only
+    the most recent root spans are kept so that memory use stays bounded. The duration
+    of every span is also added to a histogram with the span's name, so timings can be
+    aggregated across turns.
+    """
+
+    _instance: Optional[TraceRegistry] = None
+
+    MAX_ROOT_SPANS = 256
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.root_spans: deque[Span] = deque(maxlen=self.MAX_ROOT_SPANS)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.histograms: dict[str, Histogram] = defaultdict(Histogram)
+
+    @classmethod
+    def get(cls) -> TraceRegistry:
+        if cls._instance is None:
+            cls._instance = TraceRegistry()
+        return cls._instance
+
+    def _stack(self) -> list[Span]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        stack = self._stack()
+        span = Span(name, threading.get_ident(), timeit.default_timer())
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = timeit.default_timer()
+            stack.pop()
+            duration = span.duration
+            with self._lock:
+                if stack:
+                    # Spans are only added to their parent once they end, since the
+                    # parent may fold them into an earlier span.
+                    stack[-1].add_child(span)
+                else:
+                    self.root_spans.append(span)
+                self.histograms[name].observe(duration.total_seconds())
+            DurationRecorder.record_all(name, duration)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def observe(self, histogram: str, value: float) -> None:
+        with self._lock:
+            self.histograms[histogram].observe(value)
+
+    def recent_root_spans(self) -> list[Span]:
+        with self._lock:
+            return list(self.root_spans)
+
+    def last_span(self, name: str) -> Optional[Span]:
+        """Returns the most recently completed span with the given name.
+
+        The span may have been recorded at any depth of the span tree.
+        """
+        for root in reversed(self.recent_root_spans()):
+            matches = [s for s in root.iter_spans() if s.name == name]
+            if matches:
+                return matches[-1]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.root_spans.clear()
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_json(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {k: v.to_json() for k, v in self.histograms.items()},
+            }
+
+    @staticmethod
+    def to_chrome_trace(spans: Iterable[Span]) -> dict[str, Any]:
+        """Exports the spans in the Chrome trace event format.
+
+        The output can be loaded by chrome://tracing or https://ui.perfetto.dev.
+        """
+        events = []
+        for root in spans:
+            for span in root.iter_spans():
+                if span.end is None:
+                    continue
+                events.append(
+                    {
+                        "name": span.name,
+                        "ph": "X",
+                        "ts": span.start * 1_000_000,
+                        # Folded spans are drawn as one span that starts with the
+                        # first of them.
+                        "dur": span.duration.total_seconds() * 1_000_000,
+                        "pid": 0,
+                        "tid": span.thread_id,
+                        "args": {"count": span.count},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
 
 
 @dataclass
@@ -32,6 +249,37 @@ def average(self) -> timedelta:
         return self.duration / self.count
 
 
+class DurationRecorder:
+    """Collects the durations of all events timed while the recorder is active.
+
+    Every span recorded by the TraceRegistry is reported to the active recorders. A
+    recorder aggregates them by name so they can be reported for a specific period,
+    as is done by the turn benchmark.
+    """
+
+    _active: list[DurationRecorder] = []
+
+    def __init__(self) -> None:
+        self.events: dict[str, CountedEvent] = defaultdict(CountedEvent)
+
+    def __enter__(self) -> DurationRecorder:
+        self._active.append(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self._active.remove(self)
+
+    @classmethod
+    def record_all(cls, event: str, duration: timedelta) -> None:
+        for recorder in cls._active:
+            recorder.events[event].increment(duration)
+
+
 class MultiEventTracer:
     def __init__(self) -> None:
         self.events: dict[str, CountedEvent] = defaultdict(CountedEvent)
@@ -56,10 +304,9 @@ def __exit__(
 
     @contextmanager
     def trace(self, event: str) -> Iterator[None]:
-        timer = Timer()
-        with timer:
+        with TraceRegistry.get().span(event) as span:
             yield
-        self.events[event].increment(timer.duration)
+        self.events[event].increment(span.duration)
 
 
 class Timer:
@@ -0,0 +1,180 @@
+"""Cache of the parsed YAML data in the resources directory.
+
+Unit, faction, squadron, campaign, weapon, doctrine, weather, group and layout data
+are all YAML files in resources/, and parsing the more than a thousand of them was
+most of the time spent loading that data. Parsed documents are cached in the
+Liberation user directory between launches, so a warm start only has to unpickle
+them.
+
+Each document is stored with the modification time and size of the file it was
+parsed from, so edited files are parsed again. Documents are stored pickled and
+unpickled for each load, so callers are free to modify the data they get.
+
+YAML files outside of resources/ (user factions, campaigns and squadrons) are not
+cached, but are parsed with the same loader.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from game.profiling import TraceRegistry, logged_duration
+
+RESOURCES_DIR = Path("resources")
+
+#: Incremented whenever the format of the cache changes.
+CACHE_FORMAT = 1
+
+#: The C loader is an order of magnitude faster than the pure Python one, but is not
+#: available if PyYAML was built without libyaml.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+#: Parsing with the pure Python loader is slow enough that parsing many files is
+#: worth the cost of starting a process pool. Starting the pool costs more than
+#: parsing every resource with the C loader.
+PARALLEL_PARSE_THRESHOLD = 64
+
+
+def parse_yaml(path: Path) -> Any:
+    with path.open(encoding="utf-8") as yaml_file:
+        return yaml.load(yaml_file, Loader=YamlLoader)
+
+
+def _parse_pickled(path: Path) -> bytes:
+    return pickle.dumps(parse_yaml(path), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    mtime_ns: int
+    size: int
+    data: bytes
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+
+class ResourceDataCache:
+    _instance: Optional[ResourceDataCache] = None
+
+    def __init__(self, root: Path = RESOURCES_DIR) -> None:
+        self.root = root.resolve()
+        self._lock = threading.Lock()
+        self._documents: dict[str, CachedDocument] = {}
+        self._dirty = False
+
+    @classmethod
+    def get(cls) -> ResourceDataCache:
+        if cls._instance is None:
+            cls._instance = ResourceDataCache()
+        return cls._instance
+
+    def _key(self, path: Path) -> Optional[str]:
+        try:
+            return path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def load(self, path: Path) -> Any:
+        """Returns the parsed contents of the YAML file at the given path."""
+        key = self._key(path)
+        if key is None:
+            return parse_yaml(path)
+
+        stat = path.stat()
+        with self._lock:
+            document = self._documents.get(key)
+        if document is None or not document.matches(stat):
+            TraceRegistry.get().increment("Resource data cache misses")
+            document = CachedDocument(
+                stat.st_mtime_ns, stat.st_size, _parse_pickled(path)
+            )
+            with self._lock:
+                self._documents[key] = document
+                self._dirty = True
+        return pickle.loads(document.data)
+
+    def preload(self, cache_path: Optional[Path]) -> None:
+        """Loads every YAML file in the resources directory into the cache.
+
+        Documents are read from the cache file at cache_path if they are still
+        current, and any others are parsed. If anything had to be parsed the cache
+        file is rewritten.
+        """
+        with logged_duration("Loading resource data"):
+            if cache_path is not None:
+                self._read(cache_path)
+
+            stale: list[tuple[str, Path, os.stat_result]] = []
+            documents = {}
+            for path in self.root.rglob("*.yaml"):
+                key = path.relative_to(self.root).as_posix()
+                stat = path.stat()
+                document = self._documents.get(key)
+                if document is not None and document.matches(stat):
+                    documents[key] = document
+                else:
+                    stale.append((key, path, stat))
+
+            if stale:
+                logging.info("Parsing %d changed resource files", len(stale))
+                parsed = self._parse_all([path for _, path, _ in stale])
+                for (key, _, stat), data in zip(stale, parsed):
+                    documents[key] = CachedDocument(
+                        stat.st_mtime_ns, stat.st_size, data
+                    )
+
+            with self._lock:
+                # Files that have been deleted are dropped from the cache.
+                self._dirty |= bool(stale) or len(documents) != len(self._documents)
+                self._documents = documents
+
+            if cache_path is not None and self._dirty:
+                self._write(cache_path)
+
+    @staticmethod
+    def _parse_all(paths: list[Path]) -> list[bytes]:
+        if YamlLoader is yaml.SafeLoader and len(paths) >= PARALLEL_PARSE_THRESHOLD:
+            with ProcessPoolExecutor() as executor:
+                return list(executor.map(_parse_pickled, paths, chunksize=16))
+        return [_parse_pickled(p) for p in paths]
+
+    def _read(self, cache_path: Path) -> None:
+        try:
+            with cache_path.open("rb") as cache_file:
+                version, documents = pickle.load(cache_file)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logging.exception("Error reading %s. Recreating.", cache_path)
+            return
+        if version != (CACHE_FORMAT, yaml.__version__):
+            logging.info("Resource data cache is out of date. Recreating.")
+            return
+        with self._lock:
+            self._documents = documents | self._documents
+
+    def _write(self, cache_path: Path) -> None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(".tmp")
+        with self._lock:
+            dump = ((CACHE_FORMAT, yaml.__version__), dict(self._documents))
+            self._dirty = False
+        try:
+            with temp_path.open("wb") as cache_file:
+                pickle.dump(dump, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            logging.exception("Could not write resource data cache to %s", cache_path)
+
+
+def load_yaml(path: Path) -> Any:
+    return ResourceDataCache.get().load(path)
@@ -11,6 +11,7 @@
     iadsnetwork,
     mapzones,
     navmesh,
+    profiling,
     qt,
     supplyroutes,
     tgos,
@@ -27,6 +28,7 @@
 app.include_router(game.router)
 app.include_router(mapzones.router)
 app.include_router(navmesh.router)
+app.include_router(profiling.router)
 app.include_router(qt.router)
 app.include_router(supplyroutes.router)
 app.include_router(tgos.router)
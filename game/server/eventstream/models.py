@@ -42,6 +42,8 @@ class GameUpdateEventsJs(BaseModel):
     reset_on_map_center: LeafletPoint | None
     game_unloaded: bool
     new_turn: bool
+    autosaves_completed: list[str]
+    autosaves_failed: list[str]
 
     @classmethod
     def from_events(
@@ -72,7 +74,8 @@ def from_events(
                 player: ThreatZonesJs.from_zones(zones, game.theater)
                 for player, zones in events.threat_zones_updated.items()
             }
-            updated_unculled_zones = UnculledZoneJs.from_game(game)
+            if events.unculled_zones_updated:
+                updated_unculled_zones = UnculledZoneJs.from_game(game)
             for node in events.updated_iads:
                 updated_iads.extend(IadsConnectionJs.connections_for_node(node))
             updated_front_lines = [
@@ -116,4 +119,6 @@ def from_events(
             reset_on_map_center=reset_on_map_center,
             game_unloaded=events.game_unloaded,
             new_turn=events.new_turn,
+            autosaves_completed=events.autosaves_completed,
+            autosaves_failed=events.autosaves_failed,
         )
@@ -1,11 +1,11 @@
 import asyncio
 from asyncio import wait, Future
 
-from fastapi import APIRouter, WebSocket
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Query, WebSocket
 
 from .eventstream import EventStream
 from .models import GameUpdateEventsJs
+from .wireformat import CompactEventEncoder, WireFormat, encode_json
 from .. import GameContext
 
 router: APIRouter = APIRouter()
@@ -13,7 +13,8 @@
 
 class ConnectionManager:
     def __init__(self) -> None:
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: dict[WebSocket, WireFormat] = {}
+        self.compact_encoder = CompactEventEncoder()
 
     async def shutdown(self) -> None:
         futures: list[Future[None]] = []
@@ -21,18 +22,29 @@ async def shutdown(self) -> None:
             futures.append(asyncio.create_task(connection.close()))
         await wait(futures)
 
-    async def connect(self, websocket: WebSocket) -> None:
+    async def connect(self, websocket: WebSocket, wire_format: WireFormat) -> None:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections[websocket] = wire_format
+        if wire_format is WireFormat.COMPACT:
+            self.compact_encoder.reset()
 
     def disconnect(self, websocket: WebSocket) -> None:
-        self.active_connections.remove(websocket)
+        del self.active_connections[websocket]
+
+    def encode(self, events: GameUpdateEventsJs, wire_format: WireFormat) -> str:
+        if wire_format is WireFormat.COMPACT:
+            return self.compact_encoder.encode(events)
+        return encode_json(events)
 
     async def broadcast(self, events: GameUpdateEventsJs) -> None:
+        # Encode once per format rather than once per connection.
+        encoded: dict[WireFormat, str] = {}
         futures = []
-        for connection in self.active_connections:
+        for connection, wire_format in self.active_connections.items():
+            if wire_format not in encoded:
+                encoded[wire_format] = self.encode(events, wire_format)
             futures.append(
-                asyncio.create_task(connection.send_json(jsonable_encoder(events)))
+                asyncio.create_task(connection.send_text(encoded[wire_format]))
             )
         await wait(futures)
 
@@ -41,8 +53,11 @@ async def broadcast(self, events: GameUpdateEventsJs) -> None:
 
 
 @router.websocket("/eventstream")
-async def event_stream(websocket: WebSocket) -> None:
-    await manager.connect(websocket)
+async def event_stream(
+    websocket: WebSocket,
+    wire_format: WireFormat = Query(WireFormat.JSON, alias="format"),
+) -> None:
+    await manager.connect(websocket, wire_format)
     while True:
         if not (events := await EventStream.get()).empty:
             if events.shutting_down:
@@ -0,0 +1,78 @@
+"""Encodings of the event stream sent to the map.
+
+The JSON format is GameUpdateEventsJs as-is. The compact format is for clients that
+receive every simulation tick, where most frames contain only flight positions:
+
+* Fields that are empty (or false, or null) are omitted. The client fills in the
+  empties.
+* Flight positions are sent as a list of IDs and a flat list of coordinates
+  (``[lat0, lng0, lat1, lng1, ...]``) under ``flight_positions`` rather than as a map
+  of objects.
+* Navmeshes and threat zones are omitted when they are identical to the last ones that
+  were sent, since the map already has them.
+
+Either way, events are encoded once per broadcast and the same text is sent to every
+client that uses that format.
+"""
+from __future__ import annotations
+
+import json
+from enum import Enum
+from typing import Any
+
+from .models import GameUpdateEventsJs
+
+
+class WireFormat(Enum):
+    JSON = "json"
+    COMPACT = "compact"
+
+
+class CompactEventEncoder:
+    #: Fields that contain whole geometries, keyed by coalition.
+    GEOMETRY_FIELDS = ("navmesh_updates", "threat_zones_updated")
+
+    def __init__(self) -> None:
+        self._sent_geometry: dict[tuple[str, str], Any] = {}
+
+    def reset(self) -> None:
+        """Forgets what has been sent, so all geometry is included in the next frame.
+
+        Called when a new client connects, since it has not received any of it.
+        """
+        self._sent_geometry.clear()
+
+    def encode(self, events: GameUpdateEventsJs) -> str:
+        data = events.model_dump(mode="json")
+        compact = {
+            name: value
+            for name, value in data.items()
+            if value and name != "updated_flight_positions"
+        }
+
+        positions = data["updated_flight_positions"]
+        if positions:
+            coords = []
+            for position in positions.values():
+                coords.append(position["lat"])
+                coords.append(position["lng"])
+            compact["flight_positions"] = {"ids": list(positions), "coords": coords}
+
+        for name in self.GEOMETRY_FIELDS:
+            if name not in compact:
+                continue
+            changed = {}
+            for player, geometry in compact[name].items():
+                if self._sent_geometry.get((name, player)) != geometry:
+                    self._sent_geometry[(name, player)] = geometry
+                    changed[player] = geometry
+            if changed:
+                compact[name] = changed
+            else:
+                del compact[name]
+
+        return json.dumps(compact, separators=(",", ":"))
+
+
+def encode_json(events: GameUpdateEventsJs) -> str:
+    return events.model_dump_json()
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-from typing import Union
-
+import threading
+import weakref
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from typing import Any, TypeVar, Union
+
+import numpy as np
+import numpy.typing as npt
+import shapely
 from dcs import Point
 from dcs.mapping import LatLng
+from dcs.terrain import Terrain
 from pydantic import BaseModel
+from pyproj import CRS, Transformer
 from shapely.geometry import LineString, MultiLineString, MultiPolygon, Polygon
+from shapely.geometry.base import BaseGeometry
 
 from game.theater import ConflictTheater
 
+T = TypeVar("T")
+
 
 class LeafletPoint(BaseModel):
     lat: float
@@ -36,44 +48,204 @@ def from_pydcs(point: Point) -> LeafletPoint:
 LeafletPoly = list[LeafletLine]
 
 
+class LatLngProjection:
+    """Vectorized projection of DCS X/Y coordinates to lat/lng.
+
+    Equivalent to calling Point.latlng() for each coordinate, but projects a whole
+    array of coordinates in one call. pyproj transformers are not thread safe, and the
+    server handles requests on a thread pool, so each thread gets its own.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def _transformer(cls, terrain: Terrain, inverse: bool = False) -> Transformer:
+        try:
+            transformers = cls._local.transformers
+        except AttributeError:
+            transformers = cls._local.transformers = {}
+        key = (terrain.name, inverse)
+        try:
+            return transformers[key]
+        except KeyError:
+            terrain_crs = terrain.projection_parameters.to_crs()
+            if inverse:
+                transformer = Transformer.from_crs(CRS("WGS84"), terrain_crs)
+            else:
+                transformer = Transformer.from_crs(terrain_crs, CRS("WGS84"))
+            transformers[key] = transformer
+            return transformer
+
+    @classmethod
+    def project(
+        cls, coords: npt.ArrayLike, terrain: Terrain
+    ) -> npt.NDArray[np.float64]:
+        """Projects an (N, 2) array of X/Y coordinates to an (N, 2) array of lat/lng."""
+        xy = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        lat, lng = cls._transformer(terrain).transform(xy[:, 0], xy[:, 1])
+        return np.column_stack((lat, lng))
+
+    @classmethod
+    def unproject(
+        cls, latlngs: npt.ArrayLike, terrain: Terrain
+    ) -> npt.NDArray[np.float64]:
+        """Projects an (N, 2) array of lat/lng to an (N, 2) array of X/Y coordinates."""
+        latlng = np.asarray(latlngs, dtype=np.float64).reshape(-1, 2)
+        x, y = cls._transformer(terrain, inverse=True).transform(
+            latlng[:, 0], latlng[:, 1]
+        )
+        return np.column_stack((x, y))
+
+
+class ProjectedGeometryCache:
+    """Projected geometries, kept for as long as the geometry is alive.
+
+    Threat zones, navmeshes and the landmap are only replaced when they change, but
+    are sent to the UI on every request and in every event that mentions them. Keying
+    the cache on the identity of the geometry means that each version of a geometry is
+    only projected once, and that the cache entry is dropped along with the geometry.
+
+    The cache is keyed by identity rather than by value because comparing large
+    geometries for equality is slower than projecting them.
+    """
+
+    # Reentrant because the weakref callback can run on any thread whenever an object
+    # is collected, including while this thread holds the lock.
+    _lock = threading.RLock()
+    _entries: dict[tuple[str, str, int], tuple[weakref.ref[BaseGeometry], Any]] = {}
+
+    @classmethod
+    def get(
+        cls,
+        kind: str,
+        geometry: BaseGeometry,
+        theater: ConflictTheater,
+        project: Callable[[], T],
+    ) -> T:
+        key = (kind, theater.terrain.name, id(geometry))
+        with cls._lock:
+            entry = cls._entries.get(key)
+        # The ID may have been reused by a new geometry before the old entry was
+        # removed, so check that the entry is for this geometry.
+        if entry is not None and entry[0]() is geometry:
+            return entry[1]
+
+        # Project without holding the lock. If two threads race to project the same
+        # geometry they will get the same result, so it doesn't matter which is kept.
+        projected = project()
+        ref = weakref.ref(geometry, lambda r: cls._remove(key, r))
+        with cls._lock:
+            cls._entries[key] = (ref, projected)
+        return projected
+
+    @classmethod
+    def _remove(cls, key: tuple[str, str, int], ref: weakref.ref[BaseGeometry]) -> None:
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del cls._entries[key]
+
+
 class ShapelyUtil:
     @staticmethod
     def latlng_to_leaflet(latlng: LatLng) -> LeafletPoint:
         return LeafletPoint(lat=latlng.lat, lng=latlng.lng)
 
+    @staticmethod
+    def _coords_to_leaflet(latlngs: npt.NDArray[np.float64]) -> LeafletLine:
+        return [LeafletPoint(lat=lat, lng=lng) for lat, lng in latlngs.tolist()]
+
     @classmethod
-    def poly_to_leaflet(cls, poly: Polygon, theater: ConflictTheater) -> LeafletPoly:
-        if poly.is_empty:
+    def _rings_to_leaflet(
+        cls, rings: Sequence[BaseGeometry], theater: ConflictTheater
+    ) -> list[LeafletLine]:
+        """Projects the coordinates of all the lines at once."""
+        if len(rings) == 0:
             return []
-        try:
-            lines = poly.boundary.geoms
-        except AttributeError:
-            lines = [poly.boundary]
-        return cls.lines_to_leaflet(MultiLineString(lines), theater)
+        counts = shapely.get_num_coordinates(rings)
+        latlngs = LatLngProjection.project(
+            shapely.get_coordinates(rings), theater.terrain
+        )
+        return [
+            cls._coords_to_leaflet(line)
+            for line in np.split(latlngs, np.cumsum(counts)[:-1])
+        ]
+
+    @classmethod
+    def poly_to_leaflet(cls, poly: Polygon, theater: ConflictTheater) -> LeafletPoly:
+        return ProjectedGeometryCache.get(
+            "poly", poly, theater, lambda: cls._polys_to_leaflet([poly], theater)[0]
+        )
 
     @classmethod
     def polys_to_leaflet(
         cls, poly: Union[Polygon, MultiPolygon], theater: ConflictTheater
     ) -> list[LeafletPoly]:
-        if isinstance(poly, MultiPolygon):
-            polys = poly.geoms
-        else:
-            polys = [poly]
-        return [cls.poly_to_leaflet(poly, theater) for poly in polys]
+        return ProjectedGeometryCache.get(
+            "polys",
+            poly,
+            theater,
+            lambda: cls._polys_to_leaflet(cls._polygon_parts(poly), theater),
+        )
+
+    @staticmethod
+    def _polygon_parts(geometry: BaseGeometry) -> Sequence[Polygon]:
+        """Returns the polygons that make up the geometry.
+
+        Boolean operations on polygons can return a GeometryCollection that includes
+        lines or points where the polygons touched. Those parts have no area to draw,
+        and would not line up with the polygons' rings.
+        """
+        parts = shapely.get_parts(geometry)
+        return parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+
+    @classmethod
+    def _polys_to_leaflet(
+        cls, polys: Sequence[Polygon], theater: ConflictTheater
+    ) -> list[LeafletPoly]:
+        """Projects the rings of all the polygons at once.
+
+        Each polygon is a list of its rings, exterior first. Empty polygons have no
+        rings.
+        """
+        ring_counts = np.where(
+            shapely.is_empty(polys), 0, shapely.get_num_interior_rings(polys) + 1
+        )
+        lines = cls._rings_to_leaflet(shapely.get_rings(polys), theater)
+        result = []
+        start = 0
+        for count in ring_counts.tolist():
+            result.append(lines[start : start + count])
+            start += count
+        return result
 
     @classmethod
     def line_to_leaflet(cls, line: LineString, theater: ConflictTheater) -> LeafletLine:
-        return [
-            cls.latlng_to_leaflet(Point(x, y, theater.terrain).latlng())
-            for x, y in line.coords
-        ]
+        return cls._rings_to_leaflet([line], theater)[0]
 
     @classmethod
     def lines_to_leaflet(
         cls, line_string: MultiLineString | LineString, theater: ConflictTheater
     ) -> list[LeafletLine]:
         if isinstance(line_string, MultiLineString):
-            lines = line_string.geoms
+            lines = list(line_string.geoms)
         else:
             lines = [line_string]
-        return [cls.line_to_leaflet(line, theater) for line in lines]
+        return cls._rings_to_leaflet(lines, theater)
+
+    @classmethod
+    def points_to_leaflet(
+        cls, points: Sequence[Point], theater: ConflictTheater
+    ) -> LeafletLine:
+        return cls._route_to_leaflet(theater.terrain, tuple((p.x, p.y) for p in points))
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _route_to_leaflet(
+        cls, terrain: Terrain, coords: tuple[tuple[float, float], ...]
+    ) -> LeafletLine:
+        # Supply routes are not shapely geometries, so they're cached by their
+        # coordinates instead. The routes rarely change during a campaign.
+        if not coords:
+            return []
+        return cls._coords_to_leaflet(LatLngProjection.project(coords, terrain))
@@ -1,10 +1,10 @@
-import logging
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from game import Game
+from game.persistence.paths import terrain_tile_cache_dir
 from game.server import GameContext
 from .models import MapZonesJs, ThreatZoneContainerJs, UnculledZoneJs
+from .tiles import TerrainLayer, TerrainTileCache, Tile
 from ..leaflet import ShapelyUtil
 
 router: APIRouter = APIRouter(prefix="/map-zones")
@@ -12,20 +12,6 @@
 
 @router.get("/terrain", operation_id="get_terrain_zones", response_model=MapZonesJs)
 def get_terrain(game: Game = Depends(GameContext.require)) -> MapZonesJs:
-    if game.theater.terrain.name == "Falklands":
-        # The new high fidelity landmap is far too expensive to send to the UI.
-        # Converting all the points from DCS X/Y to lat/lng and then serializing all
-        # that data takes minutes and gigabytes (!!) of RAM.
-        #
-        # It's not clear how much the rest of Liberation is affected by the landmap
-        # complexity yet. If the rest of the game is tolerable we will need to start
-        # baking images of the landmap that can be used as an overlay in the UI rather
-        # than drawing it from each point.
-        logging.debug(
-            "Not sending landmap to the UI for Falklands because it's too slow"
-        )
-        return MapZonesJs.empty()
-
     zones = game.theater.landmap
     if zones is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -37,6 +23,36 @@ def get_terrain(game: Game = Depends(GameContext.require)) -> MapZonesJs:
     )
 
 
+@router.get(
+    "/terrain/tiles/{z}/{x}/{y}.png",
+    operation_id="get_terrain_tile",
+    response_class=Response,
+    responses={200: {"content": {"image/png": {}}}},
+)
+def get_terrain_tile(
+    z: int,
+    x: int,
+    y: int,
+    layer: TerrainLayer | None = None,
+    game: Game = Depends(GameContext.require),
+) -> Response:
+    if game.theater.landmap is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    try:
+        tile = Tile(z, x, y)
+    except ValueError as ex:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from ex
+
+    cache = TerrainTileCache.for_theater(game.theater, terrain_tile_cache_dir())
+    return Response(
+        content=cache.get(tile, layer),
+        media_type="image/png",
+        # The URL is the same for every theater, so the browser must not reuse tiles
+        # from a previous game. Cached tiles are cheap to serve again.
+        headers={"Cache-Control": "no-store"},
+    )
+
+
 @router.get(
     "/unculled", operation_id="list_unculled_zones", response_model=list[UnculledZoneJs]
 )
@@ -0,0 +1,323 @@
+"""Raster tiles of the terrain landmap.
+
+The detailed landmaps (Falklands, Sinai, Normandy) have too many points for the UI to
+draw as vector polygons without slowing the whole map down, so the UI draws them as
+slippy map tile layers instead: https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
+
+Tiles are rendered on demand and cached on disk under the Liberation user directory,
+so each tile is rendered once per version of the landmap. Only the parts of the
+landmap that overlap a tile are drawn, clipped to the tile and simplified to the
+resolution of the tile, so the time and memory needed to render a tile is bounded by
+the tile size rather than by the complexity of the landmap. Tiles can also be baked
+ahead of time with resources/tools/bake_landmap_tiles.py.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import math
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+from PIL import Image, ImageDraw
+from shapely import STRtree
+
+from game.server.leaflet import LatLngProjection
+
+if TYPE_CHECKING:
+    from game.theater import ConflictTheater
+    from game.theater.landmap import CompactLandmap, Landmap
+
+TILE_SIZE = 256
+
+#: Number of points sampled along each edge of a tile to find the area it covers.
+EDGE_SAMPLES = 17
+
+
+class TerrainLayer(Enum):
+    INCLUSION = "inclusion"
+    EXCLUSION = "exclusion"
+    SEA = "sea"
+
+    @property
+    def fill(self) -> tuple[int, int, int, int]:
+        # Matches the colors used for the vector terrain zones in the UI.
+        return {
+            TerrainLayer.INCLUSION: (0x4B, 0x4B, 0x4B, 0xFF),
+            TerrainLayer.EXCLUSION: (0x30, 0x30, 0x30, 0xFF),
+            TerrainLayer.SEA: (0x34, 0x44, 0x55, 0xFF),
+        }[self]
+
+    def zones(self, landmap: Landmap | CompactLandmap) -> shapely.MultiPolygon:
+        return {
+            TerrainLayer.INCLUSION: landmap.inclusion_zones,
+            TerrainLayer.EXCLUSION: landmap.exclusion_zones,
+            TerrainLayer.SEA: landmap.sea_zones,
+        }[self]
+
+
+@dataclass(frozen=True)
+class Tile:
+    z: int
+    x: int
+    y: int
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.z <= 24:
+            raise ValueError(f"Invalid tile zoom level {self.z}")
+        if not (0 <= self.x < 2**self.z and 0 <= self.y < 2**self.z):
+            raise ValueError(f"Tile {self.x}/{self.y} is outside zoom level {self.z}")
+
+    def pixels_to_latlng(
+        self, pixels: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Converts (N, 2) pixel coordinates within the tile to lat/lng."""
+        world = 2**self.z * TILE_SIZE
+        px = pixels[:, 0] + self.x * TILE_SIZE
+        py = pixels[:, 1] + self.y * TILE_SIZE
+        lng = px / world * 360 - 180
+        lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * py / world))))
+        return np.column_stack((lat, lng))
+
+    def latlng_to_pixels(
+        self, latlngs: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Converts (N, 2) lat/lng to pixel coordinates within the tile."""
+        world = 2**self.z * TILE_SIZE
+        lat = np.radians(latlngs[:, 0])
+        px = (latlngs[:, 1] + 180) / 360 * world
+        py = (1 - np.arcsinh(np.tan(lat)) / np.pi) / 2 * world
+        return np.column_stack((px - self.x * TILE_SIZE, py - self.y * TILE_SIZE))
+
+    def edge_pixels(self) -> npt.NDArray[np.float64]:
+        steps = np.linspace(0, TILE_SIZE, EDGE_SAMPLES)
+        zeros = np.zeros_like(steps)
+        ends = np.full_like(steps, TILE_SIZE)
+        return np.concatenate(
+            [
+                np.column_stack((steps, zeros)),
+                np.column_stack((steps, ends)),
+                np.column_stack((zeros, steps)),
+                np.column_stack((ends, steps)),
+            ]
+        )
+
+    @staticmethod
+    def containing(lat: float, lng: float, z: int) -> Tile:
+        n = 2**z
+        lat_rad = math.radians(max(min(lat, 85.0511), -85.0511))
+        x = int((lng + 180) / 360 * n)
+        y = int((1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * n)
+        return Tile(z, min(max(x, 0), n - 1), min(max(y, 0), n - 1))
+
+
+@dataclass(frozen=True)
+class LayerIndex:
+    parts: npt.NDArray[np.object_]
+    tree: STRtree
+    #: The larger dimension of the envelope of each part, in meters.
+    sizes: npt.NDArray[np.float64]
+
+    @staticmethod
+    def build(zones: shapely.MultiPolygon) -> LayerIndex:
+        parts = shapely.get_parts(zones)
+        bounds = shapely.bounds(parts).reshape(-1, 4)
+        sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+        return LayerIndex(parts, STRtree(parts), sizes)
+
+
+class TerrainTileRenderer:
+    def __init__(self, theater: ConflictTheater) -> None:
+        if theater.landmap is None:
+            raise ValueError(f"{theater.terrain.name} has no landmap")
+        self.theater = theater
+        self.landmap = theater.landmap
+        self._lock = threading.Lock()
+        self._indexes: dict[TerrainLayer, LayerIndex] = {}
+
+    def _index(self, layer: TerrainLayer) -> LayerIndex:
+        with self._lock:
+            if layer not in self._indexes:
+                self._indexes[layer] = LayerIndex.build(layer.zones(self.landmap))
+            return self._indexes[layer]
+
+    def version(self) -> str:
+        """A digest of the landmap, used to invalidate cached tiles."""
+        digest = hashlib.sha256()
+        for layer in TerrainLayer:
+            digest.update(shapely.to_wkb(layer.zones(self.landmap)))
+        return digest.hexdigest()[:16]
+
+    def tile_bounds(self, tile: Tile) -> tuple[float, float, float, float]:
+        """Returns the DCS X/Y bounding box of the area covered by the tile.
+
+        The box is padded by a pixel so polygon edges just outside the tile are
+        still drawn.
+        """
+        xy = LatLngProjection.unproject(
+            tile.pixels_to_latlng(tile.edge_pixels()), self.theater.terrain
+        )
+        min_x, min_y = xy.min(axis=0)
+        max_x, max_y = xy.max(axis=0)
+        pad = max(max_x - min_x, max_y - min_y) / TILE_SIZE
+        return min_x - pad, min_y - pad, max_x + pad, max_y + pad
+
+    def render(self, tile: Tile, layers: list[TerrainLayer]) -> Image.Image:
+        image = Image.new("RGBA", (TILE_SIZE, TILE_SIZE), (0, 0, 0, 0))
+        bounds = self.tile_bounds(tile)
+        for layer in layers:
+            mask = self._render_mask(tile, layer, bounds)
+            if mask is not None:
+                image.paste(layer.fill, mask=mask)
+        return image
+
+    def _render_mask(
+        self,
+        tile: Tile,
+        layer: TerrainLayer,
+        bounds: tuple[float, float, float, float],
+    ) -> Optional[Image.Image]:
+        index = self._index(layer)
+        candidates = index.tree.query(shapely.box(*bounds))
+        meters_per_pixel = (bounds[2] - bounds[0]) / TILE_SIZE
+        # Polygons smaller than a pixel would not be visible, and at low zoom levels
+        # they are most of the landmap.
+        candidates = candidates[index.sizes[candidates] >= meters_per_pixel]
+        if not len(candidates):
+            return None
+
+        clipped = shapely.clip_by_rect(index.parts[candidates], *bounds)
+        # The result only needs to look right, so skip the (much slower) topology
+        # preserving simplification. Polygons that collapse are dropped below.
+        simplified = shapely.simplify(
+            clipped, meters_per_pixel / 2, preserve_topology=False
+        )
+        polys = shapely.get_parts(simplified)
+        polys = polys[
+            (shapely.get_type_id(polys) == shapely.GeometryType.POLYGON)
+            & ~shapely.is_empty(polys)
+        ]
+        if not len(polys):
+            return None
+
+        # Each polygon's holes are cleared from the mask after it is drawn, so a
+        # polygon that sits inside another polygon's hole must be drawn after it. Its
+        # envelope is always smaller.
+        envelopes = shapely.bounds(polys)
+        areas = (envelopes[:, 2] - envelopes[:, 0]) * (
+            envelopes[:, 3] - envelopes[:, 1]
+        )
+        polys = polys[np.argsort(-areas, kind="stable")]
+
+        ring_counts = shapely.get_num_interior_rings(polys) + 1
+        rings = shapely.get_rings(polys)
+        coord_counts = shapely.get_num_coordinates(rings)
+        pixels = tile.latlng_to_pixels(
+            LatLngProjection.project(
+                shapely.get_coordinates(rings), self.theater.terrain
+            )
+        )
+        ring_pixels = np.split(pixels, np.cumsum(coord_counts)[:-1])
+
+        mask = Image.new("L", (TILE_SIZE, TILE_SIZE), 0)
+        draw = ImageDraw.Draw(mask)
+        ring_index = 0
+        for count in ring_counts.tolist():
+            for i in range(count):
+                points = [tuple(p) for p in ring_pixels[ring_index + i].tolist()]
+                if len(points) >= 3:
+                    # The first ring is the exterior, the rest are holes.
+                    draw.polygon(points, fill=255 if i == 0 else 0)
+            ring_index += count
+        return mask
+
+    def tiles_covering(self, z: int) -> Iterator[Tile]:
+        """Yields every tile at the zoom level that overlaps the landmap."""
+        min_x, min_y, max_x, max_y = shapely.total_bounds(
+            [layer.zones(self.landmap) for layer in TerrainLayer]
+        )
+        corners = LatLngProjection.project(
+            [(min_x, min_y), (min_x, max_y), (max_x, min_y), (max_x, max_y)],
+            self.theater.terrain,
+        )
+        north_west = Tile.containing(corners[:, 0].max(), corners[:, 1].min(), z)
+        south_east = Tile.containing(corners[:, 0].min(), corners[:, 1].max(), z)
+        for x in range(north_west.x, south_east.x + 1):
+            for y in range(north_west.y, south_east.y + 1):
+                yield Tile(z, x, y)
+
+
+class TerrainTileCache:
+    """Rendered terrain tiles, cached on disk."""
+
+    _instance: Optional[TerrainTileCache] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, renderer: TerrainTileRenderer, directory: Path) -> None:
+        self.renderer = renderer
+        self.directory = directory / renderer.theater.terrain.name / renderer.version()
+
+    @classmethod
+    def for_theater(cls, theater: ConflictTheater, directory: Path) -> TerrainTileCache:
+        """Returns the tile cache for the theater's landmap.
+
+        The cache is reused until a theater with a different landmap is requested.
+        """
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance.renderer.landmap is not (
+                theater.landmap
+            ):
+                cls._instance = TerrainTileCache(
+                    TerrainTileRenderer(theater), directory
+                )
+            return cls._instance
+
+    def tile_path(self, tile: Tile, layer: Optional[TerrainLayer]) -> Path:
+        layer_name = "all" if layer is None else layer.value
+        return self.directory / layer_name / str(tile.z) / str(tile.x) / f"{tile.y}.png"
+
+    def get(self, tile: Tile, layer: Optional[TerrainLayer]) -> bytes:
+        """Returns the PNG for the tile, rendering it if it is not cached.
+
+        If layer is None, all the layers are drawn in the same tile.
+        """
+        path = self.tile_path(tile, layer)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+        layers = list(TerrainLayer) if layer is None else [layer]
+        buffer = io.BytesIO()
+        self.renderer.render(tile, layers).save(buffer, format="PNG", optimize=True)
+        data = buffer.getvalue()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that a concurrent request for the same
+        # tile never reads a partially written file.
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        return data
+
+    def bake(self, max_zoom: int) -> int:
+        """Renders every tile of every layer that overlaps the landmap.
+
+        Returns the number of tiles rendered.
+        """
+        count = 0
+        for z in range(max_zoom + 1):
+            for tile in self.renderer.tiles_covering(z):
+                for layer in TerrainLayer:
+                    if not self.tile_path(tile, layer).exists():
+                        self.get(tile, layer)
+                        count += 1
+        return count
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from game.profiling import Span, TraceRegistry
+
+
+class SpanJs(BaseModel):
+    name: str
+    thread_id: int
+    start: float
+    duration: Optional[float]
+    count: int
+    children: list[SpanJs]
+
+    class Config:
+        title = "Span"
+
+    @staticmethod
+    def from_span(span: Span) -> SpanJs:
+        return SpanJs(
+            name=span.name,
+            thread_id=span.thread_id,
+            start=span.start,
+            duration=None if span.end is None else span.duration.total_seconds(),
+            count=span.count,
+            children=[SpanJs.from_span(c) for c in span.children],
+        )
+
+
+class ProfileJs(BaseModel):
+    last_turn: Optional[SpanJs]
+    counters: dict[str, int]
+    histograms: dict[str, dict[str, Any]]
+
+    class Config:
+        title = "Profile"
+
+    @staticmethod
+    def from_registry(registry: TraceRegistry) -> ProfileJs:
+        last_turn = registry.last_span("Pass turn")
+        summary = registry.to_json()
+        return ProfileJs(
+            last_turn=None if last_turn is None else SpanJs.from_span(last_turn),
+            counters=summary["counters"],
+            histograms=summary["histograms"],
+        )
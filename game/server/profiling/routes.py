@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from game.profiling import TraceRegistry
+from .models import ProfileJs
+
+router: APIRouter = APIRouter(prefix="/debug/profile")
+
+
+@router.get("/", operation_id="get_debug_profile", response_model=ProfileJs)
+def get_profile() -> ProfileJs:
+    return ProfileJs.from_registry(TraceRegistry.get())
+
+
+@router.get("/chrome-trace", operation_id="get_debug_profile_chrome_trace")
+def get_chrome_trace() -> dict[str, Any]:
+    registry = TraceRegistry.get()
+    return registry.to_chrome_trace(registry.recent_root_spans())
@@ -7,7 +7,7 @@
 from dcs import Point
 from pydantic import BaseModel
 
-from game.server.leaflet import LeafletPoint
+from game.server.leaflet import LeafletPoint, ShapelyUtil
 
 if TYPE_CHECKING:
     from game import Game
@@ -92,7 +92,7 @@ def for_link(
             # https://reactjs.org/docs/lists-and-keys.html#keys
             # https://github.com/dcs-liberation/dcs_liberation/issues/2167
             id=uuid.uuid4(),
-            points=[LeafletPoint.from_pydcs(p) for p in points],
+            points=ShapelyUtil.points_to_leaflet(points, game.theater),
             front_active=not sea and a.front_is_active(b),
             is_sea=sea,
             blue=a.captured,
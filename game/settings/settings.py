@@ -236,6 +236,19 @@ class Settings:
             "future release."
         ),
     )
+    concurrent_coalition_planning: bool = boolean_option(
+        "Plan both coalitions concurrently",
+        page=CAMPAIGN_MANAGEMENT_PAGE,
+        section=GENERAL_SECTION,
+        default=False,
+        detail=(
+            "If checked, the threat zones and navmeshes of both coalitions are "
+            "computed at the same time at the start of each turn, and both "
+            "coalitions search for their first missions of the turn at the same time. "
+            "The planned missions are the same either way. This speeds up turn "
+            "initialization on machines with more than one core."
+        ),
+    )
     # Pilots and Squadrons
     ai_pilot_levelling: bool = boolean_option(
         "Allow AI pilot leveling",
@@ -10,7 +10,7 @@
 from game.ato.flightstate import (
     Uninitialized,
 )
-from .combat import CombatInitiator, FrozenCombat
+from .combat import CombatInitiator, EngagementZoneCache, FrozenCombat
 from .gameupdateevents import GameUpdateEvents
 from .simulationresults import SimulationResults
 
@@ -23,6 +23,7 @@ class AircraftSimulation:
     def __init__(self, game: Game) -> None:
         self.game = game
         self.combats: list[FrozenCombat] = []
+        self.engagement_zones = EngagementZoneCache(game)
         self.results = SimulationResults()
 
     def begin_simulation(self) -> None:
@@ -53,7 +54,9 @@ def on_game_tick(
 
         # Finish updating all flights before checking for combat so that the new
         # positions are used.
-        CombatInitiator(self.game, self.combats, events).update_active_combats()
+        CombatInitiator(
+            self.game, self.combats, events, self.engagement_zones
+        ).update_active_combats()
 
         # After updating all combat states, check for halts.
         for flight in self.iter_flights():
@@ -73,6 +76,7 @@ def reset(self) -> None:
         for flight in self.iter_flights():
             flight.set_state(Uninitialized(flight, self.game.settings))
         self.combats = []
+        self.engagement_zones.reset()
 
     def iter_flights(self) -> Iterator[Flight]:
         packages = itertools.chain(
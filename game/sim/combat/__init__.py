@@ -1,2 +1,3 @@
 from .combatinitiator import CombatInitiator
+from .engagementzonecache import EngagementZoneCache
 from .frozencombat import FrozenCombat
@@ -4,7 +4,7 @@
 from typing import Optional, TYPE_CHECKING
 
 from dcs import Point
-from shapely.ops import unary_union
+from shapely import STRtree
 
 from game.utils import dcs_to_shapely_point
 
@@ -18,48 +18,69 @@
 class AircraftEngagementZones:
     def __init__(self, individual_zones: dict[Flight, ThreatPoly]) -> None:
         self.individual_zones = individual_zones
-        self.threat_zones = self._make_combined_zone()
+        # Built lazily, since the zones may change several times between queries.
+        self._index: Optional[STRtree] = None
+        self._indexed_flights: list[Flight] = []
 
     def update_for_combat(self, combat: FrozenCombat) -> None:
         for flight in combat.iter_flights():
-            try:
-                del self.individual_zones[flight]
-            except KeyError:
-                pass
-        self.threat_zones = self._make_combined_zone()
+            self.remove_flight(flight)
 
     def remove_flight(self, flight: Flight) -> None:
         try:
             del self.individual_zones[flight]
         except KeyError:
-            pass
-        self.threat_zones = self._make_combined_zone()
-
-    def _make_combined_zone(self) -> ThreatPoly:
-        zones = []
-        for zone in self.individual_zones.values():
-            try:
-                zones.extend(zone.geoms)
-            except AttributeError:
-                zones.append(zone)
-        return unary_union(zones)
+            return
+        self._index = None
+
+    def update_from_ato(self, ato: AirTaskingOrder) -> None:
+        """Updates the zones to match the current commit regions of the ATO.
+
+        Commit regions only change when a flight changes state, so the spatial index
+        is only rebuilt if some flight's region actually changed.
+        """
+        zones = self.commit_regions(ato)
+        if zones.keys() == self.individual_zones.keys() and all(
+            zone is self.individual_zones[flight] for flight, zone in zones.items()
+        ):
+            return
+        self.individual_zones = zones
+        self._index = None
+
+    def _ensure_index(self) -> STRtree:
+        if self._index is None:
+            self._indexed_flights = list(self.individual_zones)
+            self._index = STRtree(list(self.individual_zones.values()))
+        return self._index
 
     def covers(self, position: Point) -> bool:
-        return self.threat_zones.intersects(dcs_to_shapely_point(position))
+        return bool(
+            len(
+                self._ensure_index().query(
+                    dcs_to_shapely_point(position), predicate="intersects"
+                )
+            )
+        )
 
     def iter_intercepting_flights(self, position: Point) -> Iterator[Flight]:
-        for flight, zone in self.individual_zones.items():
-            if zone.intersects(dcs_to_shapely_point(position)):
-                yield flight
+        indices = self._ensure_index().query(
+            dcs_to_shapely_point(position), predicate="intersects"
+        )
+        for idx in sorted(indices):
+            yield self._indexed_flights[idx]
 
     @classmethod
-    def from_ato(cls, ato: AirTaskingOrder) -> AircraftEngagementZones:
+    def commit_regions(cls, ato: AirTaskingOrder) -> dict[Flight, ThreatPoly]:
         zones = {}
         for package in ato.packages:
             for flight in package.flights:
                 if (region := cls.commit_region(flight)) is not None:
                     zones[flight] = region
-        return AircraftEngagementZones(zones)
+        return zones
+
+    @classmethod
+    def from_ato(cls, ato: AirTaskingOrder) -> AircraftEngagementZones:
+        return AircraftEngagementZones(cls.commit_regions(ato))
 
     @classmethod
     def commit_region(cls, flight: Flight) -> Optional[ThreatPoly]:
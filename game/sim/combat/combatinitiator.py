@@ -10,6 +10,7 @@
 from .aircraftengagementzones import AircraftEngagementZones
 from .atip import AtIp
 from .defendingsam import DefendingSam
+from .engagementzonecache import EngagementZoneCache
 from .joinablecombat import JoinableCombat
 from .samengagementzones import SamEngagementZones
 from ..gameupdateevents import GameUpdateEvents
@@ -22,17 +23,22 @@
 
 class CombatInitiator:
     def __init__(
-        self, game: Game, combats: list[FrozenCombat], events: GameUpdateEvents
+        self,
+        game: Game,
+        combats: list[FrozenCombat],
+        events: GameUpdateEvents,
+        zones: EngagementZoneCache,
     ) -> None:
         self.game = game
         self.combats = combats
         self.events = events
+        self.zones = zones
 
     def update_active_combats(self) -> None:
-        blue_a2a = AircraftEngagementZones.from_ato(self.game.blue.ato)
-        red_a2a = AircraftEngagementZones.from_ato(self.game.red.ato)
-        blue_sam = SamEngagementZones.from_theater(self.game.theater, player=True)
-        red_sam = SamEngagementZones.from_theater(self.game.theater, player=False)
+        blue_a2a = self.zones.aircraft_zones(player=True)
+        red_a2a = self.zones.aircraft_zones(player=False)
+        blue_sam = self.zones.sam_zones(player=True)
+        red_sam = self.zones.sam_zones(player=False)
 
         # Check each vulnerable flight to see if it has initiated combat. If any flight
         # initiates combat, a single FrozenCombat will be created for all involved
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .aircraftengagementzones import AircraftEngagementZones
+from .samengagementzones import SamEngagementZones
+
+if TYPE_CHECKING:
+    from game import Game
+
+
+class EngagementZoneCache:
+    """Engagement zones that are reused across the ticks of a simulation.
+
+    SAMs do not move during a simulation, so their zones are only rebuilt when one of
+    the TGOs is damaged or destroyed. Aircraft commit regions are updated from the ATO
+    each tick, but only rebuilt when a flight's region has changed.
+    """
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self._aircraft_zones: dict[bool, AircraftEngagementZones] = {}
+        self._sam_zones: dict[bool, SamEngagementZones] = {}
+
+    def reset(self) -> None:
+        self._aircraft_zones = {}
+        self._sam_zones = {}
+
+    def aircraft_zones(self, player: bool) -> AircraftEngagementZones:
+        ato = self.game.coalition_for(player).ato
+        zones = self._aircraft_zones.get(player)
+        if zones is None:
+            zones = AircraftEngagementZones.from_ato(ato)
+            self._aircraft_zones[player] = zones
+        else:
+            zones.update_from_ato(ato)
+        return zones
+
+    def sam_zones(self, player: bool) -> SamEngagementZones:
+        zones = self._sam_zones.get(player)
+        if zones is None or zones.is_stale():
+            zones = SamEngagementZones.from_theater(self.game.theater, player)
+            self._sam_zones[player] = zones
+        return zones
@@ -3,6 +3,7 @@
 from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
+import shapely
 from dcs import Point
 from shapely.ops import unary_union
 
@@ -21,6 +22,17 @@ def __init__(
     ) -> None:
         self.threat_zones = threat_zones
         self.individual_zones = individual_zones
+        # These zones are reused for every tick of the simulation, so preparing them
+        # is worth the up front cost.
+        shapely.prepare(self.threat_zones)
+
+    def is_stale(self) -> bool:
+        """Returns True if any of the SAMs have changed since the zones were built.
+
+        TGOs invalidate their cached threat poly when they are damaged or destroyed, so
+        the zones are stale if any TGO no longer returns the same poly.
+        """
+        return any(tgo.threat_poly() is not zone for tgo, zone in self.individual_zones)
 
     def covers(self, position: Point) -> bool:
         return self.threat_zones.intersects(dcs_to_shapely_point(position))
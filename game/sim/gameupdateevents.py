@@ -40,6 +40,10 @@ class GameUpdateEvents:
     reset_on_map_center: Point | None = None
     game_unloaded: bool = False
     new_turn: bool = False
+    # The names of the background saves that finished writing, and of those that
+    # could not be written. The client warns the player about failed saves.
+    autosaves_completed: list[str] = field(default_factory=list)
+    autosaves_failed: list[str] = field(default_factory=list)
     shutting_down: bool = False
 
     @property
@@ -147,6 +151,14 @@ def begin_new_turn(self) -> GameUpdateEvents:
         self.new_turn = True
         return self
 
+    def complete_autosave(self, name: str) -> GameUpdateEvents:
+        self.autosaves_completed.append(name)
+        return self
+
+    def fail_autosave(self, name: str) -> GameUpdateEvents:
+        self.autosaves_failed.append(name)
+        return self
+
     def shut_down(self) -> GameUpdateEvents:
         self.shutting_down = True
         return self
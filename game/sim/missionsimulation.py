@@ -7,6 +7,7 @@
 
 from game.debriefing import Debriefing
 from game.missiongenerator import MissionGenerator
+from game.missiongenerator.generationstages import StageReport
 from game.unitmap import UnitMap
 from .aircraftsimulation import AircraftSimulation
 from .missionresultsprocessor import MissionResultsProcessor
@@ -29,6 +30,7 @@ class MissionSimulation:
     def __init__(self, game: Game) -> None:
         self.game = game
         self.unit_map: Optional[UnitMap] = None
+        self.generation_report: Optional[StageReport] = None
         self.aircraft_simulation = AircraftSimulation(self.game)
         self.completed = False
         self.time = self.game.conditions.start_time
@@ -47,7 +49,9 @@ def tick(self, events: GameUpdateEvents) -> GameUpdateEvents:
 
     def generate_miz(self, output: Path) -> None:
         with logged_duration("Mission generation"):
-            self.unit_map = MissionGenerator(self.game, self.time).generate_miz(output)
+            generator = MissionGenerator(self.game, self.time)
+            self.unit_map = generator.generate_miz(output)
+            self.generation_report = generator.stage_report
 
     def debrief_current_state(
         self, state_path: Path, force_end: bool = False
@@ -2,9 +2,11 @@
 
 import math
 from datetime import timezone
-from typing import Iterator, List, Optional, TYPE_CHECKING, Tuple
+from typing import Iterable, Iterator, List, Optional, TYPE_CHECKING, Tuple
 from uuid import UUID
 
+import numpy as np
+import numpy.typing as npt
 from dcs.mapping import Point
 from dcs.terrain.terrain import Terrain
 from shapely import geometry, ops
@@ -12,7 +14,7 @@
 from .daytimemap import DaytimeMap
 from .frontline import FrontLine
 from .iadsnetwork.iadsnetwork import IadsNetwork
-from .landmap import Landmap, poly_contains
+from .landmap import CompactLandmap, LandClass, Landmap
 from .seasonalconditions import SeasonalConditions
 from ..utils import Heading
 
@@ -27,7 +29,7 @@ class ConflictTheater:
     def __init__(
         self,
         terrain: Terrain,
-        landmap: Landmap | None,
+        landmap: Landmap | CompactLandmap | None,
         time_zone: timezone,
         seasonal_conditions: SeasonalConditions,
         daytime_map: DaytimeMap,
@@ -62,57 +64,48 @@ def is_in_sea(self, point: Point) -> bool:
         if not self.landmap:
             return False
 
-        if self.is_on_land(point):
+        if self.landmap.in_exclusion_zone(point.x, point.y):
             return False
 
-        for exclusion_zone in self.landmap.exclusion_zones.geoms:
-            if poly_contains(point.x, point.y, exclusion_zone):
-                return False
-
-        for sea in self.landmap.sea_zones.geoms:
-            if poly_contains(point.x, point.y, sea):
-                return True
+        if self.landmap.in_inclusion_zone(point.x, point.y):
+            return False
 
-        return False
+        return self.landmap.in_sea_zone(point.x, point.y)
 
     def is_on_land(self, point: Point) -> bool:
         if not self.landmap:
             return True
 
-        is_point_included = False
-        if poly_contains(point.x, point.y, self.landmap.inclusion_zones):
-            is_point_included = True
-
-        if not is_point_included:
+        if not self.landmap.in_inclusion_zone(point.x, point.y):
             return False
 
-        for exclusion_zone in self.landmap.exclusion_zones.geoms:
-            if poly_contains(point.x, point.y, exclusion_zone):
-                return False
+        return not self.landmap.in_exclusion_zone(point.x, point.y)
 
-        return True
+    def classify_points(self, points: Iterable[Point]) -> npt.NDArray[np.uint8]:
+        """Classifies all the points at once, returning an array of LandClass values.
+
+        Equivalent to calling is_on_land and is_in_sea for each point, but much faster
+        for more than a handful of points.
+        """
+        xy = np.array([(p.x, p.y) for p in points], dtype=float).reshape(-1, 2)
+        if not self.landmap:
+            return np.full(len(xy), LandClass.LAND, dtype=np.uint8)
+        return self.landmap.classify_points(xy)
 
     def nearest_land_pos(self, near: Point, extend_dist: int = 50) -> Point:
         """Returns the nearest point inside a land exclusion zone from point
         `extend_dist` determines how far inside the zone the point should be placed"""
         if self.is_on_land(near):
             return near
-        point = geometry.Point(near.x, near.y)
-        nearest_points = []
         if not self.landmap:
             raise RuntimeError("Landmap not initialized")
-        for inclusion_zone in self.landmap.inclusion_zones.geoms:
-            nearest_pair = ops.nearest_points(point, inclusion_zone)
-            nearest_points.append(nearest_pair[1])
-        min_distance = point.distance(nearest_points[0])  # type: geometry.Point
-        nearest_point = nearest_points[0]  # type: geometry.Point
-        for pt in nearest_points[1:]:
-            distance = point.distance(pt)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_point = pt
-        assert isinstance(nearest_point, geometry.Point)
-        point = Point(point.x, point.y, self.terrain)
+        inclusion_zone = self.landmap.inclusion.nearest(near.x, near.y)
+        if inclusion_zone is None:
+            raise RuntimeError("Landmap has no inclusion zones")
+        _, nearest_point = ops.nearest_points(
+            geometry.Point(near.x, near.y), inclusion_zone
+        )
+        point = Point(near.x, near.y, self.terrain)
         nearest_point = Point(nearest_point.x, nearest_point.y, self.terrain)
         new_point = point.point_from_heading(
             point.heading_between_point(nearest_point),
@@ -941,6 +941,7 @@ def process_turn(self, game: Game) -> None:
         runway_status = self.runway_status
         if runway_status is not None:
             runway_status.process_turn()
+            ObjectiveDistanceCache.update_operational_status(self)
 
         # Process movements for ships control points group
         if self.target_position is not None:
@@ -1168,6 +1169,7 @@ def describe_runway_status(self) -> str:
 
     def damage_runway(self) -> None:
         self.runway_status.damage()
+        ObjectiveDistanceCache.update_operational_status(self)
 
     def active_runway(
         self,
@@ -1,11 +1,20 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from enum import IntEnum
+import mmap
 import pickle
+import struct
 from functools import cached_property
-from typing import Optional, Tuple, Union
+from typing import Any, BinaryIO, Optional, Tuple, Union
 import logging
 from pathlib import Path
 from typing import List
 
+import numpy as np
+import numpy.typing as npt
+import shapely
 from shapely import geometry
 from shapely.geometry import MultiPolygon, Polygon
 
@@ -30,12 +39,324 @@ def __post_init__(self) -> None:
         if not self.sea_zones.is_valid:
             raise RuntimeError("Sea zones not valid")
 
+    def __getstate__(self) -> dict[str, Any]:
+        # The layers are indexes over the zones, and are rebuilt on first use.
+        state = self.__dict__.copy()
+        for layer in ("inclusion", "exclusion", "sea"):
+            state.pop(layer, None)
+        return state
+
+    @cached_property
+    def inclusion(self) -> PreparedLandmapLayer:
+        return PreparedLandmapLayer(self.inclusion_zones)
+
+    @cached_property
+    def exclusion(self) -> PreparedLandmapLayer:
+        return PreparedLandmapLayer(self.exclusion_zones)
+
+    @cached_property
+    def sea(self) -> PreparedLandmapLayer:
+        return PreparedLandmapLayer(self.sea_zones)
+
     @cached_property
     def inclusion_zone_only(self) -> MultiPolygon:
         return self.inclusion_zones - self.exclusion_zones - self.sea_zones
 
+    def in_inclusion_zone(self, x: float, y: float) -> bool:
+        return self.inclusion.contains(x, y)
+
+    def in_exclusion_zone(self, x: float, y: float) -> bool:
+        return self.exclusion.contains(x, y)
+
+    def in_sea_zone(self, x: float, y: float) -> bool:
+        return self.sea.contains(x, y)
+
+    def classify_points(self, points: npt.ArrayLike) -> npt.NDArray[np.uint8]:
+        return classify_points(self.inclusion, self.exclusion, self.sea, points)
+
+
+class LandClass(IntEnum):
+    """The classification of a point by classify_points."""
+
+    #: Outside every zone, so neither land nor sea.
+    NONE = 0
+    #: In an inclusion zone and not in an exclusion zone.
+    LAND = 1
+    #: In a sea zone and in neither an inclusion nor an exclusion zone.
+    SEA = 2
+    #: In an exclusion zone. Such points are neither land nor sea.
+    EXCLUDED = 3
+
+
+class LandmapLayer(ABC):
+    """The polygons of one zone type of a landmap, indexed by their bounding boxes.
+
+    Each polygon is a single part of the zone, so a query only has to test the few
+    polygons with bounding boxes that contain the point rather than the whole zone.
+    """
+
+    def __init__(self, bounds: npt.NDArray[np.float64]) -> None:
+        self.bounds = bounds
+        self._tree: Optional[shapely.STRtree] = None
 
-def load_landmap(filename: Path) -> Optional[Landmap]:
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    @abstractmethod
+    def polygon(self, index: int) -> Polygon:
+        """Returns the polygon at the given index, prepared for point queries."""
+        ...
+
+    def candidates(self, x: float, y: float) -> npt.NDArray[np.intp]:
+        """Returns the indices of the polygons with bounding boxes containing x, y."""
+        b = self.bounds
+        return np.flatnonzero(
+            (b[:, 0] <= x) & (x <= b[:, 2]) & (b[:, 1] <= y) & (y <= b[:, 3])
+        )
+
+    def contains(self, x: float, y: float) -> bool:
+        return any(
+            shapely.contains_xy(self.polygon(i), x, y) for i in self.candidates(x, y)
+        )
+
+    def contains_points(self, points: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+        """Returns a boolean array of whether each of the (n, 2) points is in a polygon.
+
+        The candidates for every point are found with one query of an STRtree of the
+        bounding boxes, and all candidates are tested with one call to contains_xy.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        result = np.zeros(len(points), dtype=bool)
+        if not len(points) or not len(self):
+            return result
+        if self._tree is None:
+            self._tree = shapely.STRtree(shapely.box(*self.bounds.T))
+        point_indices, polygon_indices = self._tree.query(shapely.points(points))
+        if not len(point_indices):
+            return result
+        candidates, inverse = np.unique(polygon_indices, return_inverse=True)
+        polygons = np.empty(len(candidates), dtype=object)
+        polygons[:] = [self.polygon(i) for i in candidates]
+        inside = shapely.contains_xy(
+            polygons[inverse],
+            points[point_indices, 0],
+            points[point_indices, 1],
+        )
+        result[point_indices[inside]] = True
+        return result
+
+    def nearest(self, x: float, y: float) -> Optional[Polygon]:
+        """Returns the polygon closest to x, y, or None if the layer is empty.
+
+        A polygon can be no closer than its bounding box, so polygons are checked in
+        order of the distance to their bounding box until the rest are all further
+        away than the closest polygon found.
+        """
+        b = self.bounds
+        box_distances = np.hypot(
+            np.maximum(np.maximum(b[:, 0] - x, x - b[:, 2]), 0),
+            np.maximum(np.maximum(b[:, 1] - y, y - b[:, 3]), 0),
+        )
+        point = geometry.Point(x, y)
+        nearest = None
+        nearest_distance = np.inf
+        for index in np.argsort(box_distances):
+            if box_distances[index] >= nearest_distance:
+                break
+            polygon = self.polygon(index)
+            distance = polygon.distance(point)
+            if distance < nearest_distance:
+                nearest = polygon
+                nearest_distance = distance
+        return nearest
+
+    def to_multipolygon(self) -> MultiPolygon:
+        return MultiPolygon([self.polygon(i) for i in range(len(self))])
+
+
+class PreparedLandmapLayer(LandmapLayer):
+    """A layer of a Landmap, built from zones that are already in memory."""
+
+    def __init__(self, zones: Union[MultiPolygon, Polygon]) -> None:
+        self.polygons = shapely.get_parts(zones)
+        shapely.prepare(self.polygons)
+        super().__init__(shapely.bounds(self.polygons).reshape(-1, 4))
+
+    def polygon(self, index: int) -> Polygon:
+        return self.polygons[index]
+
+
+class CompactLandmapLayer(LandmapLayer):
+    """One zone type of a CompactLandmap.
+
+    Polygons are stored as WKB and are only parsed the first time a query touches
+    their bounding box.
+    """
+
+    def __init__(
+        self,
+        bounds: npt.NDArray[np.float64],
+        offsets: npt.NDArray[np.int64],
+        data: mmap.mmap,
+    ) -> None:
+        super().__init__(bounds)
+        self.offsets = offsets
+        self.data = data
+        self._polygons: dict[int, Polygon] = {}
+
+    @property
+    def materialized_count(self) -> int:
+        return len(self._polygons)
+
+    def polygon(self, index: int) -> Polygon:
+        try:
+            return self._polygons[index]
+        except KeyError:
+            pass
+        start, end = self.offsets[index], self.offsets[index + 1]
+        polygon = shapely.from_wkb(self.data[start:end])
+        shapely.prepare(polygon)
+        self._polygons[index] = polygon
+        return polygon
+
+
+class CompactLandmap:
+    """A landmap backed by a memory-mapped file in the compact landmap format.
+
+    Unlike the pickled Landmap, loading this does not parse any geometry. Point
+    queries use the bounding box index to parse only the polygons that might contain
+    the point, which for the detailed landmaps (Falklands, Sinai) is a tiny fraction of
+    the map.
+
+    The full zones are still available for the code that needs them, but are parsed
+    on first use.
+
+    The file format is a header followed by, for each zone type, the bounding boxes
+    (minx, miny, maxx, maxy as float64) and the offsets into the WKB data of each
+    polygon (n + 1 int64), followed by the WKB data. All values are little endian.
+    """
+
+    MAGIC = b"LIBLMAP1"
+    HEADER = struct.Struct("<8s3Q")
+
+    # The layers of the pickled landmap are used instead if the file can't be opened
+    # when the game is loaded. See __setstate__.
+    inclusion: LandmapLayer
+    exclusion: LandmapLayer
+    sea: LandmapLayer
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._open()
+
+    def _open(self) -> None:
+        with self.path.open("rb") as landmap_file:
+            self._data = mmap.mmap(landmap_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, *counts = self.HEADER.unpack_from(self._data)
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a compact landmap")
+        offset = self.HEADER.size
+        layers = []
+        for count in counts:
+            bounds = np.frombuffer(self._data, "<f8", count * 4, offset)
+            offset += bounds.nbytes
+            offsets = np.frombuffer(self._data, "<i8", count + 1, offset)
+            offset += offsets.nbytes
+            layers.append(
+                CompactLandmapLayer(bounds.reshape(-1, 4), offsets, self._data)
+            )
+        self.inclusion, self.exclusion, self.sea = layers
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The landmap is part of the theater, so it's pickled with the game. Save only
+        # the path rather than the whole map.
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.path = state["path"]
+        try:
+            self._open()
+        except (OSError, ValueError, struct.error):
+            # The compact landmap may have been removed or replaced with a newer
+            # format since the game was saved. Don't make the save unloadable.
+            fallback_path = self.path.with_suffix(".p")
+            logging.warning(
+                "Could not load compact landmap %s, falling back to %s",
+                self.path,
+                fallback_path,
+                exc_info=True,
+            )
+            fallback = load_landmap(fallback_path)
+            if fallback is None:
+                raise
+            self.inclusion = fallback.inclusion
+            self.exclusion = fallback.exclusion
+            self.sea = fallback.sea
+            self.__dict__.update(
+                inclusion_zones=fallback.inclusion_zones,
+                exclusion_zones=fallback.exclusion_zones,
+                sea_zones=fallback.sea_zones,
+            )
+
+    @cached_property
+    def inclusion_zones(self) -> MultiPolygon:
+        return self.inclusion.to_multipolygon()
+
+    @cached_property
+    def exclusion_zones(self) -> MultiPolygon:
+        return self.exclusion.to_multipolygon()
+
+    @cached_property
+    def sea_zones(self) -> MultiPolygon:
+        return self.sea.to_multipolygon()
+
+    @cached_property
+    def inclusion_zone_only(self) -> MultiPolygon:
+        return self.inclusion_zones - self.exclusion_zones - self.sea_zones
+
+    def in_inclusion_zone(self, x: float, y: float) -> bool:
+        return self.inclusion.contains(x, y)
+
+    def in_exclusion_zone(self, x: float, y: float) -> bool:
+        return self.exclusion.contains(x, y)
+
+    def in_sea_zone(self, x: float, y: float) -> bool:
+        return self.sea.contains(x, y)
+
+    def classify_points(self, points: npt.ArrayLike) -> npt.NDArray[np.uint8]:
+        return classify_points(self.inclusion, self.exclusion, self.sea, points)
+
+    @classmethod
+    def write(cls, landmap: Landmap, output: BinaryIO) -> None:
+        layers = [
+            list(landmap.inclusion_zones.geoms),
+            list(landmap.exclusion_zones.geoms),
+            list(landmap.sea_zones.geoms),
+        ]
+        output.write(cls.HEADER.pack(cls.MAGIC, *(len(p) for p in layers)))
+        # Offsets are relative to the start of the file, so the size of the index has
+        # to be known before they can be computed.
+        data_start = cls.HEADER.size + sum(len(p) * 40 + 8 for p in layers)
+        blobs = []
+        for polygons in layers:
+            wkbs = [shapely.to_wkb(p) for p in polygons]
+            bounds = np.array([p.bounds for p in polygons], "<f8").reshape(-1, 4)
+            offsets = data_start + np.cumsum([0] + [len(w) for w in wkbs], dtype="<i8")
+            data_start = int(offsets[-1])
+            output.write(bounds.tobytes())
+            output.write(offsets.astype("<i8").tobytes())
+            blobs.extend(wkbs)
+        for blob in blobs:
+            output.write(blob)
+
+
+def load_landmap(filename: Path) -> Optional[Landmap | CompactLandmap]:
+    compact_path = filename.with_suffix(".lmap")
+    if compact_path.exists():
+        try:
+            return CompactLandmap(compact_path)
+        except:
+            logging.exception(f"Failed to load compact landmap {compact_path}")
     try:
         with open(filename, "rb") as f:
             return pickle.load(f)
@@ -44,6 +365,21 @@ def load_landmap(filename: Path) -> Optional[Landmap]:
         return None
 
 
+def classify_points(
+    inclusion: LandmapLayer,
+    exclusion: LandmapLayer,
+    sea: LandmapLayer,
+    points: npt.ArrayLike,
+) -> npt.NDArray[np.uint8]:
+    """Classifies each of the (n, 2) points, returning an array of LandClass values."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    classes = np.full(len(points), LandClass.NONE, dtype=np.uint8)
+    classes[sea.contains_points(points)] = LandClass.SEA
+    classes[inclusion.contains_points(points)] = LandClass.LAND
+    classes[exclusion.contains_points(points)] = LandClass.EXCLUDED
+    return classes
+
+
 def poly_contains(x: float, y: float, poly: Union[MultiPolygon, Polygon]) -> bool:
     return poly.contains(geometry.Point(x, y))
 
@@ -6,7 +6,6 @@
 from pathlib import Path
 from typing import Any
 
-import yaml
 from dcs.terrain import (
     Caucasus,
     Falklands,
@@ -19,6 +18,7 @@
     TheChannel,
 )
 
+from game.resourcecache import load_yaml
 from .conflicttheater import ConflictTheater
 from .daytimemap import DaytimeMap
 from .landmap import load_landmap
@@ -92,16 +92,18 @@ def each(cls) -> Iterator[ConflictTheater]:
     def landmap_path(self) -> Path:
         return self.descriptor_path.with_name("landmap.p")
 
+    @property
+    def compact_landmap_path(self) -> Path:
+        return self.landmap_path.with_suffix(".lmap")
+
     @property
     def menu_thumbnail_dcs_relative_path(self) -> Path:
-        with self.descriptor_path.open(encoding="utf-8") as descriptor_file:
-            data = yaml.safe_load(descriptor_file)
+        data = load_yaml(self.descriptor_path)
         name = data.get("pydcs_name", data["name"])
         return Path("Mods/terrains") / name / "Theme/icon.png"
 
     def load(self) -> ConflictTheater:
-        with self.descriptor_path.open(encoding="utf-8") as descriptor_file:
-            data = yaml.safe_load(descriptor_file)
+        data = load_yaml(self.descriptor_path)
         return ConflictTheater(
             TERRAINS_BY_NAME[data.get("pydcs_name", data["name"])],
             load_landmap(self.landmap_path),
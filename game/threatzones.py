@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from functools import singledispatchmethod
-from typing import Iterable, Optional, TYPE_CHECKING, Union
+from typing import Iterable, Iterator, Optional, Sequence, TYPE_CHECKING, Union
 
+import numpy as np
+import shapely
 from dcs.mapping import Point as DcsPoint
+from numpy.typing import ArrayLike, NDArray
+from shapely import STRtree
 from shapely.geometry import (
     LineString,
     MultiPolygon,
@@ -31,6 +36,54 @@
 ThreatPoly = Union[MultiPolygon, Polygon]
 
 
+@dataclass(frozen=True)
+class AirDefenseThreat:
+    """The threat zones projected by a single air defense TGO."""
+
+    air_defense: Optional[ThreatPoly]
+    radar_sam: Optional[ThreatPoly]
+
+    @property
+    def footprint(self) -> ThreatPoly:
+        return unary_union(
+            [p for p in (self.air_defense, self.radar_sam) if p is not None]
+        )
+
+
+class AirDefenseSources:
+    """Tracks which TGOs contributed to the air defense threat zones.
+
+    The spatial index is built once when the threat zones are generated and is shared
+    by every set of sources derived from it, so removing a source only copies the
+    mapping of remaining sources.
+    """
+
+    def __init__(
+        self,
+        threats: dict[TheaterGroundObject, AirDefenseThreat],
+        index: Optional[STRtree] = None,
+        indexed_tgos: Optional[list[TheaterGroundObject]] = None,
+    ) -> None:
+        self.threats = threats
+        if index is None or indexed_tgos is None:
+            indexed_tgos = list(threats)
+            index = STRtree([t.footprint for t in threats.values()])
+        self._index = index
+        self._indexed_tgos = indexed_tgos
+
+    def without(self, tgo: TheaterGroundObject) -> AirDefenseSources:
+        threats = dict(self.threats)
+        del threats[tgo]
+        return AirDefenseSources(threats, self._index, self._indexed_tgos)
+
+    def intersecting(self, poly: BaseGeometry) -> Iterator[AirDefenseThreat]:
+        """Iterates over the remaining sources whose threat intersects the poly."""
+        for idx in self._index.query(poly, predicate="intersects"):
+            threat = self.threats.get(self._indexed_tgos[idx])
+            if threat is not None:
+                yield threat
+
+
 class ThreatZones:
     def __init__(
         self,
@@ -38,12 +91,153 @@ def __init__(
         airbases: ThreatPoly,
         air_defenses: ThreatPoly,
         radar_sam_threats: ThreatPoly,
+        air_defense_sources: Optional[AirDefenseSources] = None,
+        all_threats: Optional[ThreatPoly] = None,
     ) -> None:
         self.theater = theater
         self.airbases = airbases
         self.air_defenses = air_defenses
         self.radar_sam_threats = radar_sam_threats
-        self.all = unary_union([airbases, air_defenses])
+        self.air_defense_sources = air_defense_sources
+        if all_threats is None:
+            all_threats = unary_union([airbases, air_defenses])
+        self.all = all_threats
+        # Prepared geometries make repeated intersection tests against the same zone
+        # much cheaper, for both the scalar and the batched checks below.
+        for zone in (
+            self.all,
+            self.airbases,
+            self.air_defenses,
+            self.radar_sam_threats,
+        ):
+            shapely.prepare(zone)
+
+    def without_air_defense(self, tgo: TheaterGroundObject) -> ThreatZones:
+        """Returns the threat zones that remain if the given TGO is eliminated.
+
+        Rather than re-unioning every threat in the theater, only the region covered
+        by the removed TGO is recomputed from the sources that overlap it. The
+        existing zones are not modified, since they may be shared with other owners.
+        """
+        sources = self.air_defense_sources
+        if sources is None or tgo not in sources.threats:
+            # The TGO did not contribute to these threat zones.
+            return self
+
+        removed = sources.threats[tgo]
+        remaining = sources.without(tgo)
+        neighbors = list(remaining.intersecting(removed.footprint))
+        neighbor_air_defenses = [n.air_defense for n in neighbors]
+        return ThreatZones(
+            self.theater,
+            self.airbases,
+            self._subtract(
+                self.air_defenses, removed.air_defense, neighbor_air_defenses
+            ),
+            self._subtract(
+                self.radar_sam_threats,
+                removed.radar_sam,
+                [n.radar_sam for n in neighbors],
+            ),
+            remaining,
+            all_threats=self._subtract(
+                self.all, removed.air_defense, [self.airbases] + neighbor_air_defenses
+            ),
+        )
+
+    @staticmethod
+    def _subtract(
+        zone: ThreatPoly,
+        removed: Optional[ThreatPoly],
+        others: Iterable[Optional[ThreatPoly]],
+    ) -> ThreatPoly:
+        """Removes a threat from the zone, keeping the area still covered by others.
+
+        Only the area of the removed threat can change, so the result is the zone
+        outside the removed threat plus whatever part of the removed threat is still
+        covered by the other threats that overlap it.
+        """
+        if removed is None:
+            return zone
+        return unary_union(
+            [zone.difference(removed)]
+            + [o.intersection(removed) for o in others if o is not None]
+        )
+
+    @staticmethod
+    def waypoint_coords(waypoints: Iterable[FlightWaypoint]) -> NDArray[np.float64]:
+        """Returns the (x, y) coordinates of the waypoints as an Nx2 array."""
+        return np.array(
+            [(p.position.x, p.position.y) for p in waypoints], dtype=float
+        ).reshape(-1, 2)
+
+    @staticmethod
+    def _points_intersecting(
+        zone: BaseGeometry, coords: ArrayLike
+    ) -> NDArray[np.bool_]:
+        points = shapely.points(np.asarray(coords, dtype=float).reshape(-1, 2))
+        return shapely.intersects(zone, points)
+
+    @staticmethod
+    def _paths_intersecting(
+        zone: BaseGeometry, paths: Sequence[ArrayLike]
+    ) -> NDArray[np.bool_]:
+        result = np.zeros(len(paths), dtype=bool)
+        path_coords = []
+        path_indices = []
+        for idx, path in enumerate(paths):
+            coords = np.asarray(path, dtype=float).reshape(-1, 2)
+            if not len(coords):
+                continue
+            if len(coords) == 1:
+                # A line needs at least two points. A degenerate line intersects the
+                # zone exactly when the point does.
+                coords = np.repeat(coords, 2, axis=0)
+            path_coords.append(coords)
+            path_indices.append(idx)
+        if not path_coords:
+            return result
+        lines = shapely.linestrings(
+            np.concatenate(path_coords),
+            indices=np.repeat(
+                np.arange(len(path_coords)), [len(c) for c in path_coords]
+            ),
+        )
+        result[path_indices] = shapely.intersects(zone, lines)
+        return result
+
+    def points_threatened(self, coords: ArrayLike) -> NDArray[np.bool_]:
+        """Returns whether each of the Nx2 (x, y) coordinates is threatened."""
+        return self._points_intersecting(self.all, coords)
+
+    def points_threatened_by_aircraft(self, coords: ArrayLike) -> NDArray[np.bool_]:
+        return self._points_intersecting(self.airbases, coords)
+
+    def points_threatened_by_radar_sam(self, coords: ArrayLike) -> NDArray[np.bool_]:
+        return self._points_intersecting(self.radar_sam_threats, coords)
+
+    def paths_threatened(self, paths: Sequence[ArrayLike]) -> NDArray[np.bool_]:
+        """Returns whether each of the paths passes through the threat zone.
+
+        Each path is an Nx2 array of the (x, y) coordinates of its waypoints, such as
+        those returned by waypoint_coords. All paths are checked in a single batch.
+        """
+        return self._paths_intersecting(self.all, paths)
+
+    def paths_threatened_by_aircraft(
+        self, paths: Sequence[ArrayLike]
+    ) -> NDArray[np.bool_]:
+        return self._paths_intersecting(self.airbases, paths)
+
+    def paths_threatened_by_radar_sam(
+        self, paths: Sequence[ArrayLike]
+    ) -> NDArray[np.bool_]:
+        return self._paths_intersecting(self.radar_sam_threats, paths)
+
+    def geometries_threatened(
+        self, geometries: Sequence[BaseGeometry]
+    ) -> NDArray[np.bool_]:
+        return shapely.intersects(self.all, np.asarray(geometries, dtype=object))
 
     def closest_boundary(self, point: DcsPoint) -> DcsPoint:
         boundary, _ = nearest_points(
@@ -234,12 +428,15 @@ def for_threats(
         air_threats = []
         air_defense_threats = []
         radar_sam_threats = []
+        sources: dict[TheaterGroundObject, AirDefenseThreat] = {}
         for barcap in barcap_locations:
             point = ShapelyPoint(barcap.position.x, barcap.position.y)
             cap_threat_range = cls.barcap_threat_range(doctrine, barcap)
             air_threats.append(point.buffer(cap_threat_range.meters))
 
         for tgo in air_defenses:
+            tgo_air_defense_threats = []
+            tgo_radar_sam_threats = []
             for group in tgo.groups:
                 threat_range = group.max_threat_range()
                 # Any system with a shorter range than this is not worth
@@ -247,18 +444,30 @@ def for_threats(
                 if threat_range > nautical_miles(3):
                     point = ShapelyPoint(tgo.position.x, tgo.position.y)
                     threat_zone = point.buffer(threat_range.meters)
-                    air_defense_threats.append(threat_zone)
+                    tgo_air_defense_threats.append(threat_zone)
                 radar_threat_range = group.max_threat_range(radar_only=True)
                 if radar_threat_range > nautical_miles(3):
                     point = ShapelyPoint(tgo.position.x, tgo.position.y)
                     threat_zone = point.buffer(radar_threat_range.meters)
-                    radar_sam_threats.append(threat_zone)
+                    tgo_radar_sam_threats.append(threat_zone)
+            air_defense_threats.extend(tgo_air_defense_threats)
+            radar_sam_threats.extend(tgo_radar_sam_threats)
+            if tgo_air_defense_threats or tgo_radar_sam_threats:
+                sources[tgo] = AirDefenseThreat(
+                    unary_union(tgo_air_defense_threats)
+                    if tgo_air_defense_threats
+                    else None,
+                    unary_union(tgo_radar_sam_threats)
+                    if tgo_radar_sam_threats
+                    else None,
+                )
 
         return ThreatZones(
             theater,
             airbases=unary_union(air_threats),
             air_defenses=unary_union(air_defense_threats),
             radar_sam_threats=unary_union(radar_sam_threats),
+            air_defense_sources=AirDefenseSources(sources),
         )
 
     @staticmethod
@@ -0,0 +1,145 @@
+"""Headless benchmark of full campaign turns.
+
+Runs the simulation to first contact, generates the mission, and passes the turn for
+a number of turns, reporting the time spent in each phase as JSON. The phases are the
+events timed with logged_duration and MultiEventTracer, so any phase that is already
+logged at debug level is included in the report.
+
+If requested, the report for each turn also includes the duration of each stage of
+mission generation and the critical path through them, which bounds how much faster
+generation could be made by running more of its stages concurrently.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, TYPE_CHECKING
+
+from game.profiling import DurationRecorder, Timer, logged_duration
+from game.server import EventStream
+from game.sim.gameloop import GameLoop
+from game.sim.gameupdatecallbacks import GameUpdateCallbacks
+
+if TYPE_CHECKING:
+    from game import Game
+
+
+@dataclass
+class PhaseTiming:
+    count: int
+    total_seconds: float
+    average_seconds: float
+
+
+@dataclass
+class TurnBenchmarkResult:
+    turn: int
+    wall_seconds: float
+    phases: dict[str, PhaseTiming]
+    allocated_blocks: int
+    peak_traced_bytes: Optional[int]
+    mission_generation: Optional[dict[str, Any]] = None
+
+
+@dataclass
+class TurnBenchmarkReport:
+    turns: list[TurnBenchmarkResult] = field(default_factory=list)
+    peak_rss_bytes: Optional[int] = None
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Returns the peak resident set size of the process, if it can be measured."""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows.
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+class TurnBenchmark:
+    def __init__(
+        self,
+        game: Game,
+        turns: int,
+        miz_output: Optional[Path],
+        trace_allocations: bool = False,
+        report_generation_stages: bool = False,
+    ) -> None:
+        self.game = game
+        self.turns = turns
+        self.miz_output = miz_output
+        self.trace_allocations = trace_allocations
+        self.report_generation_stages = report_generation_stages
+
+    def run(self) -> TurnBenchmarkReport:
+        report = TurnBenchmarkReport()
+        if self.trace_allocations:
+            tracemalloc.start()
+        try:
+            for _ in range(self.turns):
+                report.turns.append(self.run_turn())
+        finally:
+            if self.trace_allocations:
+                tracemalloc.stop()
+        report.peak_rss_bytes = peak_rss_bytes()
+        return report
+
+    def run_turn(self) -> TurnBenchmarkResult:
+        turn = self.game.turn
+        logging.info("Benchmarking turn %d", turn)
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+        blocks_before = sys.getallocatedblocks()
+        timer = Timer()
+        with DurationRecorder() as recorder, timer:
+            game_loop = self.simulate_turn()
+            self.game.pass_turn(no_action=True)
+        # Nothing is listening to the event stream, so don't let it accumulate.
+        EventStream.drain()
+
+        peak_traced_bytes = None
+        if self.trace_allocations:
+            _, peak_traced_bytes = tracemalloc.get_traced_memory()
+        mission_generation = None
+        stage_report = game_loop.sim.generation_report
+        if self.report_generation_stages and stage_report is not None:
+            mission_generation = stage_report.to_json()
+        return TurnBenchmarkResult(
+            turn,
+            timer.duration.total_seconds(),
+            {
+                name: PhaseTiming(
+                    event.count,
+                    event.duration.total_seconds(),
+                    event.average.total_seconds(),
+                )
+                for name, event in recorder.events.items()
+            },
+            sys.getallocatedblocks() - blocks_before,
+            peak_traced_bytes,
+            mission_generation,
+        )
+
+    def simulate_turn(self) -> GameLoop:
+        game_loop = GameLoop(
+            self.game,
+            GameUpdateCallbacks(
+                on_simulation_complete=lambda: None, on_update=lambda _: None
+            ),
+        )
+        with logged_duration("Simulating to first contact"):
+            game_loop.run_to_first_contact()
+        if self.miz_output is not None:
+            game_loop.pause_and_generate_miz(self.miz_output)
+        return game_loop
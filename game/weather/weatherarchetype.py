@@ -4,8 +4,7 @@
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from game.resourcecache import load_yaml
 from .windspeedgenerators import WindSpeedGenerator
 
 
@@ -31,8 +30,7 @@ def from_data(data: dict[str, Any]) -> WeatherArchetype:
 
     @staticmethod
     def from_yaml(path: Path) -> WeatherArchetype:
-        with path.open(encoding="utf-8") as yaml_file:
-            data = yaml.safe_load(yaml_file)
+        data = load_yaml(path)
         return WeatherArchetype.from_data(data)
 
 
@@ -1,7 +1,16 @@
+import os
 import shutil
+import struct
+import warnings
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from zipfile import ZipFile
+from typing import Optional
+from zipfile import ZipFile, ZipInfo
+
+# The fixed size part of a zip member's local file header, which is followed by the
+# file name and extra field.
+LOCAL_HEADER_SIZE = 30
+DATA_DESCRIPTOR_FLAG = 0x08
 
 
 class ZipFileExt:
@@ -32,3 +41,86 @@ def remove_member(path: Path, name: str, missing_ok: bool = False) -> None:
                 "zip",
                 root_dir=temp_dir_str,
             )
+
+    @staticmethod
+    def replace_member(
+        path: Path,
+        name: str,
+        data: bytes,
+        compression: int,
+        compresslevel: Optional[int] = None,
+    ) -> None:
+        """Appends a new version of a member to the archive.
+
+        Unlike remove_member, this does not rewrite the other members of the archive.
+        The previous version of the member is left in the archive as a duplicate entry
+        that is shadowed by the new one: ZipFile always reads the last entry with a
+        given name. The space used by shadowed entries can be reclaimed with compact.
+        """
+        with ZipFile(path, "a") as zip_file:
+            with warnings.catch_warnings():
+                # ZipFile warns about the duplicate name, which is what we want.
+                warnings.simplefilter("ignore", UserWarning)
+                zip_file.writestr(
+                    name, data, compress_type=compression, compresslevel=compresslevel
+                )
+
+    @staticmethod
+    def shadowed_bytes(path: Path) -> tuple[int, int]:
+        """Returns the compressed sizes of the shadowed and live members."""
+        with ZipFile(path, "r") as zip_file:
+            infos = zip_file.infolist()
+        # Later entries take precedence, as they do in ZipFile.getinfo.
+        live = {i.filename: i for i in infos}
+        live_size = sum(i.compress_size for i in live.values())
+        total_size = sum(i.compress_size for i in infos)
+        return total_size - live_size, live_size
+
+    @staticmethod
+    def compact(path: Path) -> None:
+        """Rewrites the archive without the entries shadowed by replace_member.
+
+        The compressed data of the live members is copied as is rather than being
+        decompressed and compressed again. Members keep the compression method and
+        level they were written with, and old LZMA members are not recompressed, which
+        would be slower than writing the member that caused the compaction.
+        """
+        with TemporaryDirectory() as temp_dir_str:
+            compacted_path = Path(temp_dir_str) / path.name
+            with ZipFile(path, "r") as source, ZipFile(compacted_path, "w") as dest:
+                # Later entries take precedence, as they do in ZipFile.getinfo.
+                live = {i.filename: i for i in source.infolist()}
+                for info in live.values():
+                    ZipFileExt._copy_compressed_member(source, dest, info)
+            shutil.copy(compacted_path, path)
+
+    @staticmethod
+    def _copy_compressed_member(source: ZipFile, dest: ZipFile, info: ZipInfo) -> None:
+        """Copies a member's compressed data from one archive to the end of another.
+
+        ZipFile has no API for this, so this writes the local header and data itself
+        and registers the member so that ZipFile writes its central directory entry.
+        """
+        assert source.fp is not None and dest.fp is not None
+        source.fp.seek(info.header_offset)
+        local_header = source.fp.read(LOCAL_HEADER_SIZE)
+        name_length, extra_length = struct.unpack_from("<HH", local_header, 26)
+        source.fp.seek(name_length + extra_length, os.SEEK_CUR)
+        data = source.fp.read(info.compress_size)
+
+        copied = ZipInfo(info.filename, info.date_time)
+        copied.compress_type = info.compress_type
+        # The sizes and CRC are known, so they're written in the local header rather
+        # than in a data descriptor after the data.
+        copied.flag_bits = info.flag_bits & ~DATA_DESCRIPTOR_FLAG
+        copied.CRC = info.CRC
+        copied.compress_size = info.compress_size
+        copied.file_size = info.file_size
+        copied.external_attr = info.external_attr
+        copied.header_offset = dest.fp.tell()
+        dest.fp.write(copied.FileHeader())
+        dest.fp.write(data)
+        dest.filelist.append(copied)
+        dest.NameToInfo[copied.filename] = copied
+        dest.start_dir = dest.fp.tell()
+        dest._didModify = True  # type: ignore[attr-defined]
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
+import multiprocessing
 import ntpath
 import os
+import shutil
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 import yaml
 from PySide6 import QtWidgets
@@ -19,16 +25,21 @@
 from game import Game, VERSION, logging_config, persistence
 from game.ato import FlightType
 from game.campaignloader.campaign import Campaign, DEFAULT_BUDGET
+from game.commander.plannerbenchmark import PlannerBenchmark
 from game.data.weapons import Pylon, Weapon, WeaponGroup
 from game.dcs.aircrafttype import AircraftType
 from game.factions.factions import Factions
-from game.persistence.paths import liberation_user_dir
+from game.persistence import SaveManager
+from game.persistence.autosaveworker import AutosaveWorker
+from game.persistence.paths import liberation_user_dir, resource_data_cache_path
 from game.plugins import LuaPluginManager
-from game.profiling import logged_duration
+from game.profiling import TraceRegistry, logged_duration
+from game.resourcecache import ResourceDataCache
 from game.server import EventStream, Server
 from game.settings import Settings
 from game.sim import GameUpdateEvents
 from game.theater.start_generator import GameGenerator, GeneratorSettings, ModSettings
+from game.turnbenchmark import TurnBenchmark
 from pydcs_extensions import load_mods
 from qt_ui import (
     liberation_install,
@@ -70,6 +81,14 @@ def on_game_load(game: Game | None) -> None:
     EventStream.put_nowait(GameUpdateEvents().game_loaded(game))
 
 
+def log_startup_report() -> None:
+    """Logs the duration of everything that was timed during startup."""
+    spans = TraceRegistry.get().recent_root_spans()
+    logging.info(
+        "Startup timings:\n%s", "\n".join(span.format_tree() for span in spans)
+    )
+
+
 def run_ui(create_game_params: CreateGameParams | None, ui_flags: UiFlags) -> None:
     os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"  # Potential fix for 4K screens
     QApplication.setHighDpiScaleFactorRoundingPolicy(
@@ -107,10 +126,12 @@ def run_ui(create_game_params: CreateGameParams | None, ui_flags: UiFlags) -> No
     splash.show()
 
     # Once splash screen is up : load resources & setup stuff
-    uiconstants.load_icons()
-    uiconstants.load_event_icons()
-    uiconstants.load_aircraft_icons()
-    uiconstants.load_vehicle_icons()
+    ResourceDataCache.get().preload(resource_data_cache_path())
+    with logged_duration("Loading icons"):
+        uiconstants.load_icons()
+        uiconstants.load_event_icons()
+        uiconstants.load_aircraft_icons()
+        uiconstants.load_vehicle_icons()
 
     # Show warning if no DCS Installation directory was set
     if liberation_install.get_dcs_install_directory() == "":
@@ -158,11 +179,16 @@ def run_ui(create_game_params: CreateGameParams | None, ui_flags: UiFlags) -> No
             game = create_game(create_game_params)
 
     # Start window
-    window = QLiberationWindow(game, ui_flags)
-    window.showMaximized()
+    with logged_duration("Creating main window"):
+        window = QLiberationWindow(game, ui_flags)
+        window.showMaximized()
     splash.finish(window)
+    log_startup_report()
     qt_execution_code = app.exec_()
 
+    # Don't lose checkpoints that are still being written.
+    AutosaveWorker.get().flush()
+
     # Restore Mission Scripting file
     logging.info("QT App terminated with status code : " + str(qt_execution_code))
     logging.info("Attempt to restore original mission scripting file")
@@ -274,6 +300,73 @@ def path_arg(arg: str) -> Path:
 
     subparsers.add_parser("dump-task-priorities")
 
+    def add_benchmark_game_arguments(benchmark: argparse.ArgumentParser) -> None:
+        benchmark_source = benchmark.add_mutually_exclusive_group(required=True)
+        benchmark_source.add_argument(
+            "--campaign", type=path_arg, help="Path to the campaign to benchmark."
+        )
+        benchmark_source.add_argument(
+            "--save", type=path_arg, help="Path to the save game to benchmark."
+        )
+        benchmark.add_argument(
+            "--blue", default="USA 2005", help="Name of the blue faction."
+        )
+        benchmark.add_argument(
+            "--red", default="Russia 1990", help="Name of the red faction."
+        )
+        benchmark.add_argument(
+            "--output",
+            type=Path,
+            help="Path to write the JSON report to. Defaults to stdout.",
+        )
+
+    benchmark = subparsers.add_parser(
+        "benchmark-turns",
+        help="Runs full turns without the UI and reports the time spent in each phase.",
+    )
+    add_benchmark_game_arguments(benchmark)
+    benchmark.add_argument(
+        "--turns", type=int, default=3, help="Number of turns to benchmark."
+    )
+    benchmark.add_argument(
+        "--skip-mission-generation",
+        action="store_true",
+        help="Do not generate the mission file for each turn.",
+    )
+    benchmark.add_argument(
+        "--generate-miz-benchmark",
+        action="store_true",
+        help=(
+            "Report the time spent in each stage of mission generation and the "
+            "critical path through them."
+        ),
+    )
+    benchmark.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Report peak traced memory per turn. Slows down the benchmark.",
+    )
+    benchmark.add_argument(
+        "--chrome-trace",
+        type=Path,
+        help="Path to write a Chrome trace (viewable with Perfetto) of the run to.",
+    )
+
+    benchmark_planner = subparsers.add_parser(
+        "benchmark-planner",
+        help=(
+            "Runs the theater commander's planner without the UI and reports how long "
+            "it takes to find a plan."
+        ),
+    )
+    add_benchmark_game_arguments(benchmark_planner)
+    benchmark_planner.add_argument(
+        "--iterations",
+        type=int,
+        default=10,
+        help="Number of times to plan for each coalition.",
+    )
+
     return parser.parse_args()
 
 
@@ -406,6 +499,7 @@ def dump_task_priorities() -> None:
             "Cannot dump task priorities without configuring DCS Liberation. Start the"
             "UI for the first run configuration."
         )
+    ResourceDataCache.get().preload(resource_data_cache_path())
 
     data: dict[str, dict[str, int]] = {}
     for task in FlightType:
@@ -420,6 +514,97 @@ def dump_task_priorities() -> None:
         yaml.dump(data, output, sort_keys=False, allow_unicode=True)
 
 
+@contextmanager
+def benchmark_game(args: argparse.Namespace) -> Iterator[Game]:
+    """Loads the game to benchmark, with its saves redirected to a scratch directory.
+
+    Benchmarking a turn saves the game just as playing it would. Those saves are
+    written to a temporary directory that is deleted after the benchmark, so that
+    neither the benchmarked save nor the player's autosave is modified.
+    """
+    first_start = liberation_install.init()
+    if first_start:
+        sys.exit(
+            "Cannot run benchmarks without configuring DCS Liberation. Start the UI "
+            "for the first run configuration."
+        )
+    ResourceDataCache.get().preload(resource_data_cache_path())
+    inject_custom_payloads(Path(persistence.base_path()))
+
+    with TemporaryDirectory(prefix="liberation-benchmark-") as scratch_dir:
+        scratch_save = Path(scratch_dir) / "benchmark.liberation.zip"
+        if args.save is not None:
+            with logged_duration("Loading save game"):
+                shutil.copyfile(args.save, scratch_save)
+                game = SaveManager.load_player_save(scratch_save)
+        else:
+            with logged_duration("New game creation"):
+                game = create_game(
+                    CreateGameParams(
+                        args.campaign,
+                        args.blue,
+                        args.red,
+                        unit_multiplier=1.0,
+                        supercarrier=False,
+                        auto_procurement=True,
+                        inverted=False,
+                        cheats=False,
+                        start_date=datetime.today(),
+                        restrict_weapons_by_date=False,
+                        advanced_iads=False,
+                        show_air_wing_config=False,
+                    )
+                )
+            game.save_manager.player_save_location = scratch_save
+        try:
+            yield game
+        finally:
+            # Checkpoints are written in the background, so wait for them before the
+            # scratch directory is deleted.
+            AutosaveWorker.get().flush()
+
+
+def write_benchmark_report(args: argparse.Namespace, report_json: str) -> None:
+    if args.output is None:
+        print(report_json)
+    else:
+        args.output.write_text(report_json, encoding="utf-8")
+
+
+def benchmark_turns(args: argparse.Namespace) -> None:
+    if args.generate_miz_benchmark and args.skip_mission_generation:
+        sys.exit(
+            "--generate-miz-benchmark cannot be used with --skip-mission-generation."
+        )
+
+    miz_output = None
+    if not args.skip_mission_generation:
+        miz_output = persistence.mission_path_for("liberation_benchmark.miz")
+    with benchmark_game(args) as game:
+        report = TurnBenchmark(
+            game,
+            args.turns,
+            miz_output,
+            args.trace_allocations,
+            report_generation_stages=args.generate_miz_benchmark,
+        ).run()
+    write_benchmark_report(args, json.dumps(report.to_json(), indent=2))
+    if args.chrome_trace is not None:
+        registry = TraceRegistry.get()
+        args.chrome_trace.write_text(
+            json.dumps(registry.to_chrome_trace(registry.recent_root_spans())),
+            encoding="utf-8",
+        )
+
+
+def benchmark_planner(args: argparse.Namespace) -> None:
+    if args.iterations < 1:
+        sys.exit("--iterations must be at least 1.")
+    with benchmark_game(args) as game:
+        report = PlannerBenchmark(game, args.iterations).run()
+    write_benchmark_report(args, json.dumps(report.to_json(), indent=2))
+
+
 def main():
     logging_config.init_logging(VERSION)
 
@@ -438,7 +623,8 @@ def main():
     if args.warn_missing_weapon_data:
         lint_all_weapon_data()
 
-    load_mods()
+    with logged_duration("Loading mods"):
+        load_mods()
 
     if args.subcommand == "lint-weapons":
         lint_weapon_data_for_aircraft(AircraftType.named(args.aircraft))
@@ -446,6 +632,12 @@ def main():
     if args.subcommand == "dump-task-priorities":
         dump_task_priorities()
         return
+    if args.subcommand == "benchmark-turns":
+        benchmark_turns(args)
+        return
+    if args.subcommand == "benchmark-planner":
+        benchmark_planner(args)
+        return
 
     with Server().run_in_thread():
         run_ui(
@@ -455,4 +647,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for process pools to work in the PyInstaller build.
+    multiprocessing.freeze_support()
     main()
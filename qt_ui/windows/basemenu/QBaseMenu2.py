@@ -14,6 +14,7 @@
 )
 
 from game import Game
+from game.ato.closestairfields import ObjectiveDistanceCache
 from game.ato.flighttype import FlightType
 from game.config import RUNWAY_REPAIR_COST
 from game.server import EventStream
@@ -189,6 +190,7 @@ def on_cheat_runway_state(self) -> None:
             self.cp.runway_status.repair()
         else:
             self.cp.runway_status.damage()
+        ObjectiveDistanceCache.update_operational_status(self.cp)
         self.update_cheat_runway_state_text()
         self.update_repair_button()
         self.update_intel_summary()
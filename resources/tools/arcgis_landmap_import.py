@@ -14,6 +14,7 @@
 
 from game.profiling import logged_duration
 from game.theater import ConflictTheater, Landmap
+from game.theater.landmap import CompactLandmap
 from game.theater.theaterloader import TheaterLoader
 from resources.tools.generate_landmap import to_multipoly
 
@@ -187,8 +188,11 @@ def _terrain_multipoly_for(self, shape_type: ShapeType) -> MultiPolygon:
 
 
 def write_landmap(theater_name: str, landmap: Landmap) -> None:
-    with TheaterLoader(theater_name).landmap_path.open("wb") as landmap_file:
+    loader = TheaterLoader(theater_name)
+    with loader.landmap_path.open("wb") as landmap_file:
         pickle.dump(landmap, landmap_file)
+    with loader.compact_landmap_path.open("wb") as compact_file:
+        CompactLandmap.write(landmap, compact_file)
 
 
 def parse_args() -> argparse.Namespace:
@@ -0,0 +1,70 @@
+"""Renders the terrain tiles of landmaps ahead of time.
+
+The server renders and caches terrain tiles as the UI requests them, so this is not
+required, but baking the low zoom levels of the detailed landmaps avoids the first
+view of the map waiting for them.
+"""
+import argparse
+import logging
+from pathlib import Path
+
+from game.persistence import set_dcs_save_game_directory
+from game.persistence.paths import terrain_tile_cache_dir
+from game.profiling import logged_duration
+from game.server.mapzones.tiles import TerrainTileCache
+from game.theater.theaterloader import TheaterLoader
+from resources.tools.arcgis_landmap_import import ALL_THEATER_NAMES
+
+
+def bake_tiles(theater_name: str, max_zoom: int) -> None:
+    theater = TheaterLoader(theater_name).load()
+    if theater.landmap is None:
+        logging.warning("%s has no landmap", theater_name)
+        return
+    cache = TerrainTileCache.for_theater(theater, terrain_tile_cache_dir())
+    count = cache.bake(max_zoom)
+    logging.info("Rendered %d tiles to %s", count, cache.directory)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--saved-games",
+        type=Path,
+        required=True,
+        help="Path to the DCS saved games directory that Liberation is configured to use.",
+    )
+
+    parser.add_argument(
+        "--max-zoom",
+        type=int,
+        default=9,
+        help="Highest zoom level to render. Each level has about four times as many "
+        "tiles as the one before it.",
+    )
+
+    parser.add_argument(
+        "theaters",
+        nargs="*",
+        choices=ALL_THEATER_NAMES,
+        default=ALL_THEATER_NAMES,
+        help="Names of the theaters to render. Defaults to all theaters.",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.DEBUG)
+
+    args = parse_args()
+    set_dcs_save_game_directory(args.saved_games)
+
+    for theater in args.theaters:
+        with logged_duration(f"Rendering {theater} terrain tiles"):
+            bake_tiles(theater, args.max_zoom)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Converts pickled landmaps to the compact landmap format.
+
+The pickled landmap (landmap.p) remains the source of truth that the landmap tools
+read and write. The game prefers the compact landmap (landmap.lmap) when both exist,
+so this must be re-run whenever a landmap.p is changed.
+"""
+import argparse
+import logging
+
+from game.profiling import logged_duration
+from game.theater.landmap import CompactLandmap, Landmap, load_landmap
+from game.theater.theaterloader import TheaterLoader
+from resources.tools.arcgis_landmap_import import ALL_THEATER_NAMES
+
+
+def convert_landmap(theater_name: str) -> None:
+    loader = TheaterLoader(theater_name)
+    compact_path = loader.compact_landmap_path
+    # load_landmap prefers the compact landmap, so remove the stale one first.
+    compact_path.unlink(missing_ok=True)
+    landmap = load_landmap(loader.landmap_path)
+    if not isinstance(landmap, Landmap):
+        raise RuntimeError(f"Could not load {loader.landmap_path}")
+    with compact_path.open("wb") as compact_file:
+        CompactLandmap.write(landmap, compact_file)
+    logging.info(
+        "Converted %s (%d bytes) to %s (%d bytes)",
+        loader.landmap_path,
+        loader.landmap_path.stat().st_size,
+        compact_path,
+        compact_path.stat().st_size,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "theaters",
+        nargs="*",
+        choices=ALL_THEATER_NAMES,
+        default=ALL_THEATER_NAMES,
+        help="Names of the theaters to convert. Defaults to all theaters.",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.DEBUG)
+
+    args = parse_args()
+
+    for theater in args.theaters:
+        with logged_duration(f"Converting {theater} landmap"):
+            convert_landmap(theater)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import math
+from random import Random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from game.ato.closestairfields import (
+    ClosestAirfields,
+    ControlPointDistances,
+    ObjectiveDistanceCache,
+)
+from game.utils import meters
+
+
+def target(name: str, x: float, y: float) -> Any:
+    return SimpleNamespace(name=name, position=SimpleNamespace(x=x, y=y))
+
+
+def operational(control_points: list[Any]) -> list[Any]:
+    for cp in control_points:
+        cp.runway_is_operational = lambda: True
+    return control_points
+
+
+@pytest.fixture
+def control_points() -> list[Any]:
+    return operational([target("A", 0, 0), target("B", 1000, 0), target("C", 0, 5000)])
+
+
+def test_distances_match_point_distances(control_points: list[Any]) -> None:
+    tgo = target("TGO", 300, 400)
+    ad_hoc = target("Ad hoc", -3000, 4000)
+    distances = ControlPointDistances(control_points, [tgo])
+    result = distances.distances([ad_hoc, tgo])
+    for row, t in zip(result, [ad_hoc, tgo]):
+        for distance, cp in zip(row, control_points):
+            assert distance == pytest.approx(
+                math.hypot(cp.position.x - t.position.x, cp.position.y - t.position.y)
+            )
+
+
+def test_sorted_by_distance_to_nearest_control_point(
+    control_points: list[Any],
+) -> None:
+    near_b = target("Near B", 1100, 0)
+    near_c = target("Near C", 0, 5050)
+    far = target("Far", 20000, 20000)
+    distances = ControlPointDistances(control_points, [far, near_c])
+    targets = [far, near_c, near_b]
+    assert distances.sorted_by_distance(targets, control_points[1:]) == [
+        near_c,
+        near_b,
+        far,
+    ]
+    assert distances.sorted_by_distance(targets, control_points[:1]) == [
+        near_b,
+        near_c,
+        far,
+    ]
+    # Without any control points to measure from, the order is unchanged.
+    assert distances.sorted_by_distance(targets, []) == targets
+
+
+def test_closest_airfields_match_sorted_distances() -> None:
+    random = Random(0)
+    # Duplicate positions check that ties are ordered as the control points are.
+    positions = [(random.randint(0, 20), random.randint(0, 20)) for _ in range(60)]
+    control_points = operational(
+        [target(f"CP {i}", x, y) for i, (x, y) in enumerate(positions)]
+    )
+    distances = ControlPointDistances(control_points, control_points)
+    for x, y in [(0, 0), (10, 10), (7, 3), (-50, 100)]:
+        expected = sorted(
+            control_points,
+            key=lambda cp: math.hypot(cp.position.x - x, cp.position.y - y),
+        )
+        closest = ClosestAirfields(target("Location", x, y), distances)
+        assert closest.closest_airfields == expected
+
+
+def test_closest_airfields(control_points: list[Any]) -> None:
+    control_points[0].runway_is_operational = lambda: False
+    location = target("Location", 100, 0)
+    distances = ControlPointDistances(control_points, control_points)
+    closest = ClosestAirfields(location, distances)
+    assert closest.closest_airfields == control_points
+    assert list(closest.all_airfields_within(meters(1000))) == control_points[:2]
+    assert list(closest.operational_airfields_within(meters(1000))) == [
+        control_points[1]
+    ]
+
+    control_points[0].runway_is_operational = lambda: True
+    distances.update_operational_status(control_points[0])
+    assert list(closest.operational_airfields) == control_points
+
+
+def test_cache_is_bounded(
+    control_points: list[Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    theater = SimpleNamespace(
+        controlpoints=control_points,
+        ground_objects=[],
+        conflicts=lambda: [],
+    )
+    monkeypatch.setattr(ObjectiveDistanceCache, "MAX_CACHED_TARGETS", 2)
+    ObjectiveDistanceCache.set_theater(theater)  # type: ignore
+    try:
+        first, second, third = control_points
+        closest = ObjectiveDistanceCache.get_closest_airfields(first)
+        ObjectiveDistanceCache.get_closest_airfields(second)
+        assert ObjectiveDistanceCache.get_closest_airfields(first) is closest
+        ObjectiveDistanceCache.get_closest_airfields(third)
+        assert list(ObjectiveDistanceCache.closest_airfields) == ["A", "C"]
+    finally:
+        ObjectiveDistanceCache.theater = None
+        ObjectiveDistanceCache.invalidate_distances()
@@ -0,0 +1,63 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from game.commander.tasks.primitive.strike import PlanStrike
+from game.commander.theaterstate import TheaterState
+
+
+def make_state(squadron: Any, strike_targets: list[Any]) -> TheaterState:
+    context = MagicMock()
+    context.coalition.player = False
+    context.defer_flight_plans = True
+    context.settings.max_active_aircraft_limit = 100
+    context.coalition.air_wing.best_squadrons_for.return_value = [squadron]
+    threat_zones = context.coalition.opponent.threat_zone
+    threat_zones.paths_threatened_by_aircraft.return_value = np.array([False])
+    threat_zones.paths_threatened_by_radar_sam.return_value = np.array([False])
+    return TheaterState(
+        context=context,
+        barcaps_needed={},
+        active_front_lines=[],
+        front_line_stances={},
+        vulnerable_front_lines=[],
+        aewc_targets=[],
+        refueling_targets=[],
+        enemy_air_defenses=[],
+        threatening_air_defenses=[],
+        detecting_air_defenses=[],
+        enemy_convoys=[],
+        enemy_shipping=[],
+        enemy_ships=[],
+        enemy_battle_positions={},
+        oca_targets=[],
+        strike_targets=strike_targets,
+        enemy_barcaps=[],
+        threat_zones=MagicMock(),
+        reserved_aircraft={},
+        unplannable_tasks=set(),
+    )
+
+
+def test_estimates_reserve_aircraft() -> None:
+    squadron = MagicMock()
+    # Enough aircraft for two strikes of two aircraft each.
+    squadron.can_fulfill_flight.side_effect = lambda count: count <= 4
+    targets = [MagicMock() for _ in range(3)]
+    state = make_state(squadron, targets)
+
+    assert PlanStrike(targets[0]).preconditions_met(state)
+    assert state.reserved_aircraft == {squadron: 2}
+    clone = state.clone()
+    assert PlanStrike(targets[1]).preconditions_met(state)
+    assert state.reserved_aircraft == {squadron: 4}
+    # The aircraft reserved by the first two strikes are not available to the third.
+    assert not PlanStrike(targets[2]).preconditions_met(state)
+    assert state.reserved_aircraft == {squadron: 4}
+    # Reservations made after a state is cloned do not apply to the clone.
+    assert clone.reserved_aircraft == {squadron: 2}
+    assert PlanStrike(targets[2]).preconditions_met(clone)
+
+    state.release_reserved_aircraft()
+    assert not state.reserved_aircraft
@@ -0,0 +1,155 @@
+from collections.abc import Iterator
+from typing import Any, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from game.commander.packagefulfiller import PackageFulfiller
+from game.commander.tasks.primitive.strike import PlanStrike
+from game.commander.theatercommander import TheaterCommander
+from game.commander.theaterstate import TheaterState
+from game.htn import CompoundTask, Method
+from game.profiling import TraceRegistry
+
+
+class StrikeTogetherOrAlone(CompoundTask[TheaterState]):
+    """Plans every strike in one round if possible, otherwise one at a time."""
+
+    def each_valid_method(self, state: TheaterState) -> Iterator[Method[TheaterState]]:
+        yield [PlanStrike(target) for target in state.strike_targets]
+        for target in state.strike_targets:
+            yield [PlanStrike(target)]
+
+
+def make_state(strike_targets: list[Any]) -> TheaterState:
+    context = MagicMock()
+    context.coalition.player = False
+    context.defer_flight_plans = True
+    return TheaterState(
+        context=context,
+        barcaps_needed={},
+        active_front_lines=[],
+        front_line_stances={},
+        vulnerable_front_lines=[],
+        aewc_targets=[],
+        refueling_targets=[],
+        enemy_air_defenses=[],
+        threatening_air_defenses=[],
+        detecting_air_defenses=[],
+        enemy_convoys=[],
+        enemy_shipping=[],
+        enemy_ships=[],
+        enemy_battle_positions={},
+        oca_targets=[],
+        strike_targets=strike_targets,
+        enemy_barcaps=[],
+        threat_zones=MagicMock(),
+        reserved_aircraft={},
+        unplannable_tasks=set(),
+    )
+
+
+@pytest.fixture(name="registry")
+def registry_fixture(monkeypatch: pytest.MonkeyPatch) -> TraceRegistry:
+    registry = TraceRegistry()
+    monkeypatch.setattr(TraceRegistry, "_instance", registry)
+    return registry
+
+
+def test_unplannable_package_is_replanned_without_it(
+    monkeypatch: pytest.MonkeyPatch, registry: TraceRegistry
+) -> None:
+    first, unplannable, last = MagicMock(), MagicMock(), MagicMock()
+    state = make_state([first, unplannable, last])
+    packages = {first: MagicMock(), last: MagicMock()}
+
+    def estimate_mission(*args: Any) -> dict[Any, int]:
+        return {}
+
+    def plan_mission(
+        fulfiller: PackageFulfiller, mission: Any, *args: Any
+    ) -> Optional[Any]:
+        return packages.get(mission.location)
+
+    monkeypatch.setattr(PackageFulfiller, "estimate_mission", estimate_mission)
+    monkeypatch.setattr(PackageFulfiller, "plan_mission", plan_mission)
+    monkeypatch.setattr(TheaterState, "from_game", lambda *args: state)
+
+    game = MagicMock()
+    commander = TheaterCommander(game, player=False)
+    commander.main_task = StrikeTogetherOrAlone()
+    commander.plan_missions(MagicMock(), MagicMock())
+
+    # The first package was added before the second failed, so the rest of the
+    # first plan was discarded. It was planned again without the failed task, but
+    # keeping the effects of the first.
+    ato = game.coalition_for.return_value.ato
+    assert [c.args[0] for c in ato.add_package.call_args_list] == [
+        packages[first],
+        packages[last],
+    ]
+    assert (PlanStrike, id(unplannable)) in state.unplannable_tasks
+    assert registry.counters["Package plans generated"] == 3
+    assert registry.counters["Package plans kept"] == 2
+
+
+def test_packages_are_only_planned_for_the_chosen_plan(
+    monkeypatch: pytest.MonkeyPatch, registry: TraceRegistry
+) -> None:
+    first, unplannable, last = MagicMock(), MagicMock(), MagicMock()
+    state = make_state([first, unplannable, last])
+
+    def estimate_mission(
+        fulfiller: PackageFulfiller, mission: Any, *args: Any
+    ) -> Optional[dict[Any, int]]:
+        if mission.location is unplannable:
+            return None
+        return {}
+
+    plan_mission = MagicMock()
+    monkeypatch.setattr(PackageFulfiller, "estimate_mission", estimate_mission)
+    monkeypatch.setattr(PackageFulfiller, "plan_mission", plan_mission)
+    monkeypatch.setattr(TheaterState, "from_game", lambda *args: state)
+
+    commander = TheaterCommander(MagicMock(), player=False)
+    commander.main_task = StrikeTogetherOrAlone()
+    commander.plan_missions(MagicMock(), MagicMock())
+
+    # The first target was estimated as part of the plan to strike every target, but
+    # that plan was abandoned when the second target could not be planned.
+    assert [c.args[0].location for c in plan_mission.call_args_list] == [first, last]
+    assert registry.counters["Package plans generated"] == 2
+    assert registry.counters["Package plans kept"] == 2
+
+
+def test_first_round_can_be_searched_before_planning(
+    monkeypatch: pytest.MonkeyPatch, registry: TraceRegistry
+) -> None:
+    first, unplannable, last = MagicMock(), MagicMock(), MagicMock()
+    state = make_state([first, unplannable, last])
+
+    def estimate_mission(
+        fulfiller: PackageFulfiller, mission: Any, *args: Any
+    ) -> Optional[dict[Any, int]]:
+        if mission.location is unplannable:
+            return None
+        return {}
+
+    plan_mission = MagicMock()
+    monkeypatch.setattr(PackageFulfiller, "estimate_mission", estimate_mission)
+    monkeypatch.setattr(PackageFulfiller, "plan_mission", plan_mission)
+    monkeypatch.setattr(TheaterState, "from_game", lambda *args: state)
+
+    commander = TheaterCommander(MagicMock(), player=False)
+    commander.main_task = StrikeTogetherOrAlone()
+    first_round = commander.begin_planning(MagicMock(), MagicMock())
+
+    # The first round is found but none of its packages are planned until the round
+    # is executed.
+    assert first_round.result is not None
+    assert first_round.result.tasks
+    plan_mission.assert_not_called()
+
+    commander.plan_missions(MagicMock(), MagicMock(), first_round)
+    assert [c.args[0].location for c in plan_mission.call_args_list] == [first, last]
+    assert registry.counters["Package plans kept"] == 2
@@ -0,0 +1,80 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from game.commander.battlepositions import BattlePositions
+from game.commander.theaterstate import TheaterState
+
+
+def make_state(control_point: Any, battle_positions: list[Any]) -> TheaterState:
+    return TheaterState(
+        context=MagicMock(),
+        barcaps_needed={control_point: 2},
+        active_front_lines=[],
+        front_line_stances={},
+        vulnerable_front_lines=[],
+        aewc_targets=[],
+        refueling_targets=[],
+        enemy_air_defenses=[],
+        threatening_air_defenses=[],
+        detecting_air_defenses=[],
+        enemy_convoys=[],
+        enemy_shipping=[],
+        enemy_ships=[],
+        enemy_battle_positions={control_point: BattlePositions(battle_positions, [])},
+        oca_targets=[control_point],
+        strike_targets=list(battle_positions),
+        enemy_barcaps=[],
+        threat_zones=MagicMock(),
+        reserved_aircraft={},
+        unplannable_tasks=set(),
+    )
+
+
+def test_clone_shares_containers_until_modified() -> None:
+    control_point = MagicMock()
+    state = make_state(control_point, [])
+    clone = state.clone()
+    assert clone.oca_targets is state.oca_targets
+    assert clone.barcaps_needed is state.barcaps_needed
+
+    state.remove_oca_target(control_point)
+    assert state.oca_targets == []
+    assert clone.oca_targets == [control_point]
+    assert clone.barcaps_needed is state.barcaps_needed
+
+    clone.cover_barcap_target(control_point)
+    assert clone.barcaps_needed[control_point] == 1
+    assert state.barcaps_needed[control_point] == 2
+
+
+def test_modifications_after_copy_do_not_copy_again() -> None:
+    control_point = MagicMock()
+    first, second = MagicMock(), MagicMock()
+    state = make_state(control_point, [first, second])
+    clone = state.clone()
+
+    state.remove_strike_target(first)
+    strike_targets = state.strike_targets
+    state.remove_strike_target(second)
+    assert state.strike_targets is strike_targets
+    assert state.strike_targets == []
+    assert clone.strike_targets == [first, second]
+
+
+def test_eliminated_battle_positions_are_not_shared() -> None:
+    control_point = MagicMock()
+    battle_position = MagicMock(control_point=control_point)
+    state = make_state(control_point, [battle_position])
+    clone = state.clone()
+
+    state.eliminate_battle_position(battle_position)
+    assert not state.has_battle_position(battle_position)
+    assert clone.has_battle_position(battle_position)
+
+
+def test_persistent_properties_are_shared() -> None:
+    state = make_state(MagicMock(), [])
+    clone = state.clone()
+    assert clone.threatening_air_defenses is state.threatening_air_defenses
+    assert clone.detecting_air_defenses is state.detecting_air_defenses
+    assert clone.unplannable_tasks is state.unplannable_tasks
@@ -0,0 +1,32 @@
+import datetime
+
+from game.data.weapons import WeaponWSType
+
+
+def test_available_weapons_is_memoized() -> None:
+    date = datetime.date(1990, 1, 1)
+    weapons = WeaponWSType.available_weapons(date, restrict_by_date=True)
+    assert WeaponWSType.available_weapons(date, restrict_by_date=True) is weapons
+
+
+def test_available_weapons_filters_by_date() -> None:
+    all_weapons = WeaponWSType.available_weapons(
+        datetime.date(1950, 1, 1), restrict_by_date=False
+    )
+    assert list(all_weapons) == WeaponWSType.populate_weapons()
+
+    early = WeaponWSType.available_weapons(
+        datetime.date(1950, 1, 1), restrict_by_date=True
+    )
+    late = WeaponWSType.available_weapons(
+        datetime.date(2020, 1, 1), restrict_by_date=True
+    )
+    assert set(w.name for w in early) < set(w.name for w in late)
+    assert set(w.name for w in late) <= set(w.name for w in all_weapons)
+
+
+def test_get_clsids_matches_by_substring() -> None:
+    mapping = WeaponWSType.get_clsid_mapping()
+    name, clsid = next(iter(mapping.items()))
+    weapon = WeaponWSType(name.upper(), 0, 0, 0, 0)
+    assert clsid in weapon.get_clsids(filter_unregistered=False)
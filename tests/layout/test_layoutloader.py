@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from game.layout import layoutloader
+from game.layout.layout import NavalLayout, TgoLayout
+from game.layout.layoutloader import LayoutLoader
+from game.layout.layoutmapping import LayoutMapping
+from game.persistence import set_dcs_save_game_directory
+
+MAPPING = """name: {name}
+tasks:
+  - Navy
+groups:
+  - Ships:
+    - name: {name} 0
+      unit_count:
+        - 1
+      unit_classes:
+        - Destroyer
+"""
+
+
+@pytest.fixture
+def layout_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    set_dcs_save_game_directory(tmp_path)
+    layout_dir = tmp_path / "layouts"
+    layout_dir.mkdir()
+    for name in ("One", "Two"):
+        (layout_dir / f"{name}.yaml").write_text(
+            MAPPING.format(name=name), encoding="utf-8"
+        )
+        (layout_dir / f"{name}.miz").write_bytes(name.encode("utf-8"))
+    monkeypatch.setattr(layoutloader, "LAYOUT_DIR", str(layout_dir))
+    return layout_dir
+
+
+def test_only_changed_miz_are_imported(
+    layout_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    imported: list[str] = []
+
+    def import_all(
+        mizs: list[str], mappings: dict[str, list[LayoutMapping]]
+    ) -> list[dict[str, TgoLayout]]:
+        imported.extend(Path(m).name for m in mizs)
+        return [
+            {m.name: NavalLayout(m.name, m.description) for m in mappings[miz]}
+            for miz in mizs
+        ]
+
+    monkeypatch.setattr(LayoutLoader, "_import_all", staticmethod(import_all))
+
+    LayoutLoader().load_templates()
+    assert imported == ["One.miz", "Two.miz"]
+
+    imported.clear()
+    loader = LayoutLoader()
+    loader.load_templates()
+    assert not imported
+    assert [layout.name for layout in loader.layouts] == ["One", "Two"]
+
+    (layout_dir / "Two.miz").write_bytes(b"changed")
+    LayoutLoader().load_templates()
+    assert imported == ["Two.miz"]
+
+    imported.clear()
+    (layout_dir / "One.yaml").write_text(
+        MAPPING.format(name="One") + "generic: true\n", encoding="utf-8"
+    )
+    LayoutLoader().load_templates()
+    assert imported == ["One.miz"]
@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from game.missiongenerator.generationstages import (
+    GenerationStage,
+    StageGraph,
+    StageReport,
+    StageTiming,
+)
+
+
+def test_serial_stages_run_in_declaration_order() -> None:
+    order: list[str] = []
+    StageGraph(
+        [
+            GenerationStage("a", lambda: order.append("a")),
+            GenerationStage("b", lambda: order.append("b")),
+            GenerationStage("c", lambda: order.append("c"), depends_on=("a",)),
+        ]
+    ).run()
+    assert order == ["a", "b", "c"]
+
+
+def test_dependencies_must_be_declared_first() -> None:
+    with pytest.raises(ValueError):
+        StageGraph(
+            [
+                GenerationStage("a", lambda: None, depends_on=("b",)),
+                GenerationStage("b", lambda: None),
+            ]
+        )
+
+
+def test_stage_names_must_be_unique() -> None:
+    with pytest.raises(ValueError):
+        StageGraph(
+            [GenerationStage("a", lambda: None), GenerationStage("a", lambda: None)]
+        )
+
+
+def test_concurrent_stages_overlap_serial_stages() -> None:
+    started = threading.Event()
+
+    def wait_for_concurrent_stage() -> None:
+        started.wait(timeout=10)
+
+    # The serial stage can only complete if the concurrent stage is running at the
+    # same time.
+    report = StageGraph(
+        [
+            GenerationStage("concurrent", started.set, concurrent=True),
+            GenerationStage("serial", wait_for_concurrent_stage),
+        ]
+    ).run()
+    assert started.is_set()
+    assert set(report.timings) == {"concurrent", "serial"}
+
+
+def test_concurrent_stages_wait_for_dependencies() -> None:
+    order: list[str] = []
+    StageGraph(
+        [
+            GenerationStage("first", lambda: order.append("first"), concurrent=True),
+            GenerationStage(
+                "second",
+                lambda: order.append("second"),
+                depends_on=("first",),
+                concurrent=True,
+            ),
+            GenerationStage(
+                "last", lambda: order.append("last"), depends_on=("second",)
+            ),
+        ]
+    ).run()
+    assert order == ["first", "second", "last"]
+
+
+def test_concurrent_stage_errors_are_raised() -> None:
+    def fail() -> None:
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError, match="failed"):
+        StageGraph(
+            [
+                GenerationStage("fail", fail, concurrent=True),
+                GenerationStage("serial", lambda: None),
+            ]
+        ).run()
+
+
+def test_critical_path_follows_longest_chain() -> None:
+    report = StageReport(
+        {"a": (), "b": (), "c": ("a",), "d": ("b", "c")},
+        {
+            "a": StageTiming(0, 3),
+            "b": StageTiming(3, 4),
+            "c": StageTiming(4, 5),
+            "d": StageTiming(5, 7),
+        },
+        wall_seconds=7,
+    )
+    assert report.critical_path() == ["a", "c", "d"]
+    assert report.to_json()["critical_path_seconds"] == 6
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from game.missiongenerator.kneeboard import (
+    KneeboardPageWriter,
+    load_font,
+    render_kneeboard_pages,
+)
+
+
+def make_writer(title: str) -> KneeboardPageWriter:
+    writer = KneeboardPageWriter()
+    writer.title(title)
+    writer.table([["a", "1"], ["b", "2"]], headers=["Name", "Value"])
+    return writer
+
+
+def test_identical_pages_have_equal_content() -> None:
+    assert make_writer("Notes").content() == make_writer("Notes").content()
+    assert hash(make_writer("Notes").content()) == hash(make_writer("Notes").content())
+    assert make_writer("Notes").content() != make_writer("Package").content()
+
+
+def test_fonts_are_cached() -> None:
+    font = KneeboardPageWriter.TABLE_FONT
+    assert load_font(font.path, font.size) is font.load()
+
+
+def test_fonts_are_not_shared_between_threads() -> None:
+    font = KneeboardPageWriter.TABLE_FONT
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_thread_font = executor.submit(font.load).result()
+    assert other_thread_font is not font.load()
+
+
+def test_parallel_render_matches_serial_render(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    serial_path = tmp_path / "serial.png"
+    make_writer("Page 0").write(serial_path)
+
+    pages = {
+        make_writer(f"Page {i}").content(): tmp_path / f"page{i:02}.png"
+        for i in range(4)
+    }
+    render_kneeboard_pages(pages)
+
+    for path in pages.values():
+        assert path.exists()
+    with Image.open(serial_path) as serial, Image.open(
+        tmp_path / "page00.png"
+    ) as parallel:
+        assert serial.tobytes() == parallel.tobytes()
+    for i, path in enumerate(pages.values()):
+        with Image.open(path) as page:
+            assert (
+                page.tobytes() == make_writer(f"Page {i}").content().render().tobytes()
+            )
@@ -0,0 +1,78 @@
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from game.persistence.autosaveworker import AutosaveWorker
+from game.server import EventStream
+from game.sim import GameUpdateEvents
+
+
+@pytest.fixture(autouse=True)
+def drain_event_stream() -> Iterator[None]:
+    yield
+    EventStream.drain()
+
+
+def test_flush_waits_for_pending_saves() -> None:
+    worker = AutosaveWorker()
+    written: list[str] = []
+
+    def record(name: str) -> Callable[[], None]:
+        def write() -> None:
+            written.append(name)
+
+        return write
+
+    for name in ("a", "b", "c"):
+        worker.submit(Path("bundle"), name, record(name))
+    worker.flush()
+    assert written == ["a", "b", "c"]
+
+
+def test_superseded_saves_are_dropped() -> None:
+    worker = AutosaveWorker()
+    release = threading.Event()
+    written: list[str] = []
+
+    def block() -> None:
+        release.wait()
+
+    # Keep the worker busy so that the remaining saves stay pending.
+    worker.submit(Path("bundle"), "blocker", block)
+    worker.submit(Path("bundle"), "a", lambda: written.append("first"))
+    worker.submit(Path("bundle"), "b", lambda: written.append("other"))
+    worker.submit(Path("bundle"), "a", lambda: written.append("second"))
+    worker.submit(Path("other"), "a", lambda: written.append("other bundle"))
+    release.set()
+    worker.flush()
+    assert written == ["second", "other", "other bundle"]
+
+
+def test_failed_save_does_not_stop_worker() -> None:
+    worker = AutosaveWorker()
+    written = []
+
+    def fail() -> None:
+        raise RuntimeError
+
+    worker.submit(Path("bundle"), "a", fail)
+    worker.submit(Path("bundle"), "b", lambda: written.append("b"))
+    worker.flush()
+    assert written == ["b"]
+
+
+def test_failed_save_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    worker = AutosaveWorker()
+    events: list[GameUpdateEvents] = []
+    monkeypatch.setattr(EventStream, "put_nowait", events.append)
+
+    def fail() -> None:
+        raise OSError("disk full")
+
+    worker.submit(Path("bundle"), "a", fail)
+    worker.submit(Path("bundle"), "b", lambda: None)
+    worker.flush()
+    assert [e.autosaves_failed for e in events] == [["a"], []]
+    assert [e.autosaves_completed for e in events] == [[], ["b"]]
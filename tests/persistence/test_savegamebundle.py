@@ -1,11 +1,14 @@
 import datetime
+import random
+import timeit
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_LZMA, ZIP_STORED, ZipFile
 
 import pytest
 
 from game import Game
-from game.persistence.savegamebundle import SaveGameBundle
+from game.persistence.savegamebundle import SaveCodec, SaveGameBundle
+from game.zipfileext import ZipFileExt
 
 
 @pytest.fixture
@@ -112,3 +115,68 @@ def test_load_from_absent_member_raises(game: Game, tmp_bundle: SaveGameBundle)
     tmp_bundle.save_start_of_turn(game)
     with pytest.raises(KeyError):
         tmp_bundle.load_last_turn()
+
+
+def test_checkpoint_codec_is_used_for_checkpoints(game: Game, tmp_zip: Path) -> None:
+    bundle = SaveGameBundle(
+        tmp_zip,
+        player_codec=SaveCodec.lzma(),
+        checkpoint_codec=SaveCodec.uncompressed(),
+    )
+    bundle.save_start_of_turn(game)
+    bundle.save_player(game, copy_from=bundle)
+
+    with ZipFile(bundle.bundle_path, "r") as zip_file:
+        start_of_turn = zip_file.getinfo(SaveGameBundle.START_OF_TURN_SAVE_NAME)
+        assert start_of_turn.compress_type == ZIP_STORED
+        player = zip_file.getinfo(SaveGameBundle.MANUAL_SAVE_NAME)
+        assert player.compress_type == ZIP_LZMA
+
+
+def test_loads_members_written_with_any_codec(game: Game, tmp_zip: Path) -> None:
+    SaveGameBundle(tmp_zip, checkpoint_codec=SaveCodec.lzma()).save_last_turn(game)
+    game.date = datetime.date.today()
+    SaveGameBundle(tmp_zip).save_start_of_turn(game)
+
+    bundle = SaveGameBundle(tmp_zip)
+    assert bundle.load_last_turn().date == datetime.date.min
+    assert bundle.load_start_of_turn().date == datetime.date.today()
+
+
+def test_repeated_saves_do_not_grow_bundle(
+    game: Game, tmp_bundle: SaveGameBundle
+) -> None:
+    tmp_bundle.save_last_turn(game)
+    tmp_bundle.save_start_of_turn(game)
+    for _ in range(10):
+        tmp_bundle.save_pre_sim_checkpoint(game)
+
+    shadowed, live = ZipFileExt.shadowed_bytes(tmp_bundle.bundle_path)
+    assert shadowed <= live
+    assert tmp_bundle.load_last_turn().date == datetime.date.min
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "codec",
+    [SaveCodec.lzma(), SaveCodec.zlib(6), SaveCodec.zlib(1), SaveCodec.uncompressed()],
+    ids=["lzma", "zlib-6", "zlib-1", "uncompressed"],
+)
+def test_benchmark_save_and_load(codec: SaveCodec, game: Game, tmp_zip: Path) -> None:
+    rng = random.Random(0)
+    # Roughly the size and compressibility of a pickled game object, which is mostly
+    # object references and short strings.
+    game.payload = [  # type: ignore
+        {"name": f"unit-{i}", "position": (rng.random(), rng.random())}
+        for i in range(200_000)
+    ]
+    bundle = SaveGameBundle(tmp_zip, player_codec=codec, checkpoint_codec=codec)
+    bundle.save_last_turn(game)
+    bundle.save_start_of_turn(game)
+
+    save = timeit.timeit(lambda: bundle.save_pre_sim_checkpoint(game), number=3)
+    load = timeit.timeit(bundle.load_pre_sim_checkpoint, number=3)
+    print(
+        f"\n{codec}: save {save / 3:.3f}s, load {load / 3:.3f}s, "
+        f"bundle {bundle.bundle_path.stat().st_size / 1024 / 1024:.1f} MiB"
+    )
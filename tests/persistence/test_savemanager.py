@@ -177,3 +177,14 @@ def test_save_after_loading_foreign_save(
     game = SaveManager.load_player_save(good_save_path)
     assert game.save_manager.player_save_location == good_save_path
     game.save_manager.save_player()
+
+
+def test_checkpoint_is_snapshotted_when_requested(save_manager: SaveManager) -> None:
+    expect_date = datetime.date.today()
+    save_manager.game.date = expect_date
+    save_manager.save_start_of_turn()
+    # The write happens in the background, but changes made to the game after
+    # requesting the save must not be included.
+    save_manager.game.date = datetime.date.min
+    start_of_turn = SaveManager.load_start_of_turn(save_manager.default_save_location)
+    assert start_of_turn.date == expect_date
@@ -0,0 +1,86 @@
+from collections.abc import Sequence
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from dcs.mapping import Point
+from dcs.terrain import Caucasus
+from shapely.geometry import GeometryCollection, LineString, MultiPolygon, Polygon
+
+from game.server.leaflet import LatLngProjection, LeafletPoint, ShapelyUtil
+
+
+@pytest.fixture(name="theater", scope="module")
+def theater_fixture() -> Any:
+    return SimpleNamespace(terrain=Caucasus())
+
+
+def project_each(
+    coords: Sequence[tuple[float, float]], theater: Any
+) -> list[LeafletPoint]:
+    points = []
+    for x, y in coords:
+        latlng = Point(x, y, theater.terrain).latlng()
+        points.append(LeafletPoint(lat=latlng.lat, lng=latlng.lng))
+    return points
+
+
+def test_projection_matches_point_latlng(theater: Any) -> None:
+    coords = [(0.0, 0.0), (10_000.0, -25_000.0), (-300_000.0, 450_000.0)]
+    projected = LatLngProjection.project(coords, theater.terrain)
+    assert [
+        LeafletPoint(lat=lat, lng=lng) for lat, lng in projected.tolist()
+    ] == project_each(coords, theater)
+
+
+def test_polys_to_leaflet(theater: Any) -> None:
+    exterior = [(0, 0), (10_000, 0), (10_000, 10_000), (0, 0)]
+    hole = [(100, 100), (200, 100), (200, 200), (100, 100)]
+    other = [
+        (-50_000, -50_000),
+        (-40_000, -50_000),
+        (-40_000, -40_000),
+        (-50_000, -50_000),
+    ]
+    zones = MultiPolygon([Polygon(exterior, [hole]), Polygon(other)])
+    assert ShapelyUtil.polys_to_leaflet(zones, theater) == [
+        [project_each(exterior, theater), project_each(hole, theater)],
+        [project_each(other, theater)],
+    ]
+    assert ShapelyUtil.poly_to_leaflet(Polygon(), theater) == []
+
+
+def test_polys_to_leaflet_skips_parts_without_area(theater: Any) -> None:
+    exterior = [(0, 0), (10_000, 0), (10_000, 10_000), (0, 0)]
+    zones = GeometryCollection(
+        [LineString([(0, 0), (-1000, -1000)]), Polygon(exterior)]
+    )
+    assert ShapelyUtil.polys_to_leaflet(zones, theater) == [
+        [project_each(exterior, theater)]
+    ]
+
+
+def test_line_to_leaflet(theater: Any) -> None:
+    coords = [(0, 0), (100_000, 200_000)]
+    assert ShapelyUtil.line_to_leaflet(LineString(coords), theater) == project_each(
+        coords, theater
+    )
+
+
+def test_projected_geometry_is_cached(theater: Any) -> None:
+    poly = Polygon([(0, 0), (1000, 0), (1000, 1000), (0, 0)])
+    projected = ShapelyUtil.polys_to_leaflet(poly, theater)
+    assert ShapelyUtil.polys_to_leaflet(poly, theater) is projected
+    # Equal geometries are projected again. Comparing large geometries is slower than
+    # projecting them.
+    copy = Polygon(poly.exterior.coords)
+    assert ShapelyUtil.polys_to_leaflet(copy, theater) is not projected
+    assert ShapelyUtil.polys_to_leaflet(copy, theater) == projected
+
+
+def test_points_to_leaflet(theater: Any) -> None:
+    points = [Point(1, 2, theater.terrain), Point(100_000, -30_000, theater.terrain)]
+    assert ShapelyUtil.points_to_leaflet(points, theater) == project_each(
+        [(p.x, p.y) for p in points], theater
+    )
+    assert ShapelyUtil.points_to_leaflet([], theater) == []
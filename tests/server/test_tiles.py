@@ -0,0 +1,83 @@
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+from PIL import Image
+from dcs.terrain import Caucasus
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from game.server.leaflet import LatLngProjection
+from game.server.mapzones.tiles import (
+    TILE_SIZE,
+    TerrainLayer,
+    TerrainTileCache,
+    TerrainTileRenderer,
+    Tile,
+)
+from game.theater.landmap import Landmap
+
+
+@pytest.fixture(name="theater", scope="module")
+def theater_fixture() -> Any:
+    # A square island with a lake, surrounded by sea.
+    island = Polygon(
+        box(-100_000, -100_000, 100_000, 100_000).exterior.coords,
+        [box(-10_000, -10_000, 10_000, 10_000).exterior.coords],
+    )
+    sea = Polygon(
+        box(-300_000, -300_000, 300_000, 300_000).exterior.coords,
+        [box(-100_000, -100_000, 100_000, 100_000).exterior.coords],
+    )
+    return SimpleNamespace(
+        terrain=Caucasus(),
+        landmap=Landmap(MultiPolygon([island]), MultiPolygon(), MultiPolygon([sea])),
+    )
+
+
+def pixel_at(image: Image.Image, x: float, y: float, theater: Any, tile: Tile) -> Any:
+    latlng = LatLngProjection.project([(x, y)], theater.terrain)
+    px, py = tile.latlng_to_pixels(latlng)[0]
+    return image.getpixel((int(px), int(py)))
+
+
+def test_tile_pixels_round_trip() -> None:
+    tile = Tile(8, 150, 92)
+    pixels = np.array([[0.0, 0.0], [128.0, 64.0], [256.0, 256.0]])
+    assert tile.latlng_to_pixels(tile.pixels_to_latlng(pixels)) == pytest.approx(pixels)
+    lat, lng = tile.pixels_to_latlng(np.array([[128.0, 128.0]]))[0]
+    assert Tile.containing(lat, lng, 8) == tile
+
+
+def test_invalid_tile() -> None:
+    with pytest.raises(ValueError):
+        Tile(2, 4, 0)
+
+
+def test_render(theater: Any) -> None:
+    renderer = TerrainTileRenderer(theater)
+    lat, lng = LatLngProjection.project([(50_000, 50_000)], theater.terrain)[0]
+    tile = Tile.containing(lat, lng, 7)
+    image = renderer.render(tile, list(TerrainLayer))
+    assert image.size == (TILE_SIZE, TILE_SIZE)
+    assert pixel_at(image, 50_000, 50_000, theater, tile) == TerrainLayer.INCLUSION.fill
+    assert pixel_at(image, 0, 0, theater, tile) == (0, 0, 0, 0)
+    assert pixel_at(image, 150_000, 0, theater, tile) == TerrainLayer.SEA.fill
+
+
+def test_tiles_covering(theater: Any) -> None:
+    renderer = TerrainTileRenderer(theater)
+    assert list(renderer.tiles_covering(0)) == [Tile(0, 0, 0)]
+    assert len(list(renderer.tiles_covering(8))) > 1
+
+
+def test_cache(theater: Any, tmp_path: Path) -> None:
+    cache = TerrainTileCache.for_theater(theater, tmp_path)
+    assert TerrainTileCache.for_theater(theater, tmp_path) is cache
+    tile = Tile(0, 0, 0)
+    data = cache.get(tile, TerrainLayer.SEA)
+    assert cache.tile_path(tile, TerrainLayer.SEA).read_bytes() == data
+    assert Image.open(io.BytesIO(data)).size == (TILE_SIZE, TILE_SIZE)
+    assert cache.bake(1) == len(TerrainLayer) * 2 - 1
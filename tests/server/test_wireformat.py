@@ -0,0 +1,92 @@
+import json
+from typing import Any
+from uuid import uuid4
+
+from game.server.eventstream.models import GameUpdateEventsJs
+from game.server.eventstream.wireformat import CompactEventEncoder, encode_json
+from game.server.leaflet import LeafletPoint
+from game.server.mapzones.models import ThreatZonesJs
+
+
+def make_events(**kwargs: Any) -> GameUpdateEventsJs:
+    fields: dict[str, Any] = {
+        "updated_flight_positions": {},
+        "new_combats": [],
+        "updated_combats": [],
+        "ended_combats": [],
+        "navmesh_updates": {},
+        "updated_unculled_zones": [],
+        "threat_zones_updated": {},
+        "new_flights": [],
+        "updated_flights": [],
+        "deleted_flights": set(),
+        "selected_flight": None,
+        "deselected_flight": False,
+        "updated_front_lines": [],
+        "deleted_front_lines": set(),
+        "updated_tgos": [],
+        "updated_control_points": [],
+        "updated_iads": [],
+        "deleted_iads": set(),
+        "reset_on_map_center": None,
+        "game_unloaded": False,
+        "new_turn": False,
+        "autosaves_completed": [],
+        "autosaves_failed": [],
+    }
+    fields.update(kwargs)
+    return GameUpdateEventsJs(**fields)
+
+
+def make_threat_zones(lat: float) -> ThreatZonesJs:
+    poly = [[LeafletPoint(lat=lat, lng=0), LeafletPoint(lat=lat, lng=1)]]
+    return ThreatZonesJs(full=[poly], aircraft=[], air_defenses=[], radar_sams=[])
+
+
+def test_empty_fields_are_omitted() -> None:
+    encoded = CompactEventEncoder().encode(make_events(new_turn=True))
+    assert json.loads(encoded) == {"new_turn": True}
+
+
+def test_flight_positions_are_flattened() -> None:
+    first = uuid4()
+    second = uuid4()
+    encoded = CompactEventEncoder().encode(
+        make_events(
+            updated_flight_positions={
+                first: LeafletPoint(lat=1, lng=2),
+                second: LeafletPoint(lat=3, lng=4),
+            }
+        )
+    )
+    assert json.loads(encoded) == {
+        "flight_positions": {
+            "ids": [str(first), str(second)],
+            "coords": [1, 2, 3, 4],
+        }
+    }
+
+
+def test_unchanged_geometry_is_not_resent() -> None:
+    encoder = CompactEventEncoder()
+    events = make_events(threat_zones_updated={True: make_threat_zones(1)})
+    assert "threat_zones_updated" in json.loads(encoder.encode(events))
+    assert json.loads(encoder.encode(events)) == {}
+
+    changed = make_events(
+        threat_zones_updated={True: make_threat_zones(1), False: make_threat_zones(2)}
+    )
+    assert list(json.loads(encoder.encode(changed))["threat_zones_updated"]) == [
+        "false"
+    ]
+
+    encoder.reset()
+    assert "threat_zones_updated" in json.loads(encoder.encode(events))
+
+
+def test_json_format_is_unchanged() -> None:
+    events = make_events(deleted_flights={uuid4()}, new_turn=True)
+    decoded = json.loads(encode_json(events))
+    assert decoded["new_turn"] is True
+    assert decoded["updated_tgos"] == []
+    assert len(decoded["deleted_flights"]) == 1
@@ -0,0 +1,30 @@
+import pickle
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from game import coalition as coalition_module
+from game.coalition import Coalition
+
+
+def test_unpickled_coalition_can_compute_nav_meshes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    coalition = Coalition.__new__(Coalition)
+    coalition.__dict__.update(
+        faction=SimpleNamespace(locales=None),
+        faker=None,
+        _threat_zone=MagicMock(),
+        _navmesh=MagicMock(),
+    )
+    loaded = pickle.loads(pickle.dumps(coalition))
+    assert loaded._threat_zone is None
+    assert loaded._navmesh is None
+
+    # Navmeshes are built from the opponent's threat zone over the game's theater.
+    loaded.__dict__.update(_opponent=MagicMock(), game=MagicMock(), player=True)
+    navmesh = MagicMock()
+    monkeypatch.setattr(coalition_module, "NavMesh", navmesh)
+    loaded.compute_nav_meshes(MagicMock())
+    assert loaded.nav_mesh is navmesh.from_threat_zones.return_value
@@ -0,0 +1,44 @@
+import pickle
+import random
+
+from dcs.mapping import Point
+from dcs.terrain import Caucasus
+
+from game.cullingzones import CullingZones
+
+
+def test_no_zones() -> None:
+    zones = CullingZones([])
+    assert not zones.any_within(Point(0, 0, Caucasus()), 1_000_000)
+
+
+def test_any_within_matches_linear_search() -> None:
+    terrain = Caucasus()
+    rng = random.Random(0)
+    for count in (1, 2, 7, 100):
+        points = [
+            Point(rng.uniform(0, 100_000), rng.uniform(0, 100_000), terrain)
+            for _ in range(count)
+        ]
+        zones = CullingZones(points)
+        for _ in range(200):
+            position = Point(rng.uniform(0, 100_000), rng.uniform(0, 100_000), terrain)
+            radius = rng.uniform(0, 30_000)
+            expected = any(p.distance_to_point(position) < radius for p in points)
+            assert zones.any_within(position, radius) == expected
+
+
+def test_radius_is_exclusive() -> None:
+    terrain = Caucasus()
+    zones = CullingZones([Point(0, 0, terrain)])
+    assert not zones.any_within(Point(1000, 0, terrain), 1000)
+    assert zones.any_within(Point(999, 0, terrain), 1000)
+
+
+def test_index_is_not_pickled() -> None:
+    terrain = Caucasus()
+    zones = CullingZones([Point(0, 0, terrain)])
+    assert zones.any_within(Point(10, 0, terrain), 100)
+    restored = pickle.loads(pickle.dumps(zones))
+    assert restored._index is None
+    assert restored.any_within(Point(10, 0, terrain), 100)
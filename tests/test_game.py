@@ -0,0 +1,188 @@
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Optional, cast
+
+from game.game import Game
+from game.navmesh import NavMesh
+from game.sim import GameUpdateEvents
+from game.threatzones import ThreatZones
+from game.utils import Distance, nautical_miles
+
+
+@dataclass(frozen=True)
+class FakePosition:
+    x: float
+    y: float
+
+
+class FakeGroup:
+    def __init__(self, threat_range: Distance) -> None:
+        self.threat_range = threat_range
+
+    def max_threat_range(self, radar_only: bool = False) -> Distance:
+        return self.threat_range
+
+
+class FakeTgo:
+    def __init__(self, x: float, y: float, group: FakeGroup) -> None:
+        self.position = FakePosition(x, y)
+        self.groups = [group]
+
+
+@dataclass
+class FakeCoalition:
+    theater: Any
+    air_defenses: list[FakeTgo]
+    opponent: Optional["FakeCoalition"] = None
+    threat_zone: Optional[ThreatZones] = None
+    nav_mesh: Optional[NavMesh] = None
+    threads: set[str] = field(default_factory=set)
+
+    def compute_threat_zones(self, events: Any) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.threat_zone = ThreatZones.for_threats(
+            self.theater, None, [], self.air_defenses  # type: ignore
+        )
+
+    def compute_nav_meshes(self, events: Any) -> None:
+        self.threads.add(threading.current_thread().name)
+        assert self.opponent is not None and self.opponent.threat_zone is not None
+        self.nav_mesh = NavMesh.from_threat_zones(
+            self.opponent.threat_zone, self.theater
+        )
+
+
+class FakeGame:
+    # Game.compute_threat_zones calls this through self.
+    for_each_coalition = Game.for_each_coalition
+
+    def __init__(self, concurrent: bool) -> None:
+        rng = random.Random(0)
+        sam = FakeGroup(nautical_miles(20))
+
+        def air_defenses(x_offset: float) -> list[FakeTgo]:
+            return [
+                FakeTgo(
+                    x_offset + rng.uniform(0, nautical_miles(100).meters),
+                    rng.uniform(0, nautical_miles(300).meters),
+                    sam,
+                )
+                for _ in range(20)
+            ]
+
+        blue_air_defenses = air_defenses(0)
+        red_air_defenses = air_defenses(nautical_miles(200).meters)
+        theater = SimpleNamespace(
+            controlpoints=[
+                SimpleNamespace(position=t.position, ground_objects=[])
+                for t in blue_air_defenses + red_air_defenses
+            ]
+        )
+        self.settings = SimpleNamespace(concurrent_coalition_planning=concurrent)
+        self.blue = FakeCoalition(theater, blue_air_defenses)
+        self.red = FakeCoalition(theater, red_air_defenses, opponent=self.blue)
+        self.blue.opponent = self.red
+
+
+def compute_threat_zones(game: FakeGame) -> None:
+    Game.compute_threat_zones(cast(Game, game), GameUpdateEvents())
+
+
+def navmesh_polys(navmesh: Optional[NavMesh]) -> list[tuple[bytes, bool]]:
+    assert navmesh is not None
+    return [(p.poly.wkb, p.threatened) for p in navmesh.polys]
+
+
+def test_concurrent_threat_zones_match_serial() -> None:
+    serial = FakeGame(concurrent=False)
+    compute_threat_zones(serial)
+    concurrent = FakeGame(concurrent=True)
+    compute_threat_zones(concurrent)
+
+    for expected, actual in [
+        (serial.blue, concurrent.blue),
+        (serial.red, concurrent.red),
+    ]:
+        assert expected.threads == {threading.current_thread().name}
+        assert threading.current_thread().name not in actual.threads
+        assert expected.threat_zone is not None and actual.threat_zone is not None
+        assert actual.threat_zone.all.equals(expected.threat_zone.all)
+        assert navmesh_polys(actual.nav_mesh) == navmesh_polys(expected.nav_mesh)
+
+
+class PlanningCoalition:
+    def __init__(self, name: str, calls: list[tuple[str, str]]) -> None:
+        self.name = name
+        self.calls = calls
+        self.search_threads: set[str] = set()
+
+    def initialize_turn(self, is_turn_0: bool) -> None:
+        self.calls.append((self.name, f"initialize_turn({is_turn_0})"))
+
+    def prepare_turn(self) -> None:
+        self.calls.append((self.name, "prepare_turn"))
+
+    def search_missions(self, now: datetime) -> str:
+        self.search_threads.add(threading.current_thread().name)
+        self.calls.append((self.name, "search_missions"))
+        return f"{self.name} first round"
+
+    def plan_missions(self, now: datetime, first_round: Optional[str] = None) -> None:
+        self.calls.append((self.name, f"plan_missions({first_round})"))
+
+    def plan_procurement(self) -> None:
+        self.calls.append((self.name, "plan_procurement"))
+
+
+class PlanningGame:
+    # Game.initialize_coalition_turns calls this through self.
+    for_each_coalition = Game.for_each_coalition
+
+    def __init__(self, turn: int, concurrent: bool) -> None:
+        self.turn = turn
+        self.conditions = SimpleNamespace(start_time=datetime(2020, 1, 1))
+        self.settings = SimpleNamespace(concurrent_coalition_planning=concurrent)
+        self.calls: list[tuple[str, str]] = []
+        self.blue = PlanningCoalition("blue", self.calls)
+        self.red = PlanningCoalition("red", self.calls)
+
+    def initialize_coalition_turns(self, coalitions: list[PlanningCoalition]) -> None:
+        Game.initialize_coalition_turns(cast(Game, self), cast(Any, coalitions))
+
+
+def test_concurrent_coalition_planning_searches_first_round_concurrently() -> None:
+    game = PlanningGame(turn=1, concurrent=True)
+    game.initialize_coalition_turns([game.blue, game.red])
+
+    assert game.calls[:2] == [("blue", "prepare_turn"), ("red", "prepare_turn")]
+    # The searches may finish in either order.
+    assert sorted(game.calls[2:4]) == [
+        ("blue", "search_missions"),
+        ("red", "search_missions"),
+    ]
+    # The plans are executed and procurement planned for blue and then red.
+    assert game.calls[4:] == [
+        ("blue", "plan_missions(blue first round)"),
+        ("blue", "plan_procurement"),
+        ("red", "plan_missions(red first round)"),
+        ("red", "plan_procurement"),
+    ]
+    for coalition in [game.blue, game.red]:
+        assert coalition.search_threads
+        assert threading.current_thread().name not in coalition.search_threads
+
+
+def test_coalition_planning_is_serial_unless_planning_both_coalitions() -> None:
+    for game, coalitions in [
+        (PlanningGame(turn=1, concurrent=False), ["blue", "red"]),
+        (PlanningGame(turn=0, concurrent=True), ["blue", "red"]),
+        (PlanningGame(turn=1, concurrent=True), ["red"]),
+    ]:
+        game.initialize_coalition_turns([getattr(game, name) for name in coalitions])
+        is_turn_0 = game.turn == 0
+        assert game.calls == [
+            (name, f"initialize_turn({is_turn_0})") for name in coalitions
+        ]
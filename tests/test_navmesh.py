@@ -0,0 +1,101 @@
+import random
+import timeit
+from typing import Any, Optional
+
+import pytest
+from dcs.mapping import Point
+from dcs.terrain import Caucasus
+from shapely.geometry import MultiPoint, Point as ShapelyPoint
+from shapely.ops import triangulate
+
+from game.navmesh import NavMesh, NavMeshPoly
+
+
+def make_navmesh(size: int, num_vertices: int, theater: Any = None) -> NavMesh:
+    rng = random.Random(0)
+    vertices: list[tuple[float, float]] = [(0, 0), (0, size), (size, 0), (size, size)]
+    vertices.extend(
+        (rng.uniform(0, size), rng.uniform(0, size)) for _ in range(num_vertices)
+    )
+    polys = triangulate(MultiPoint(vertices))
+    navpolys = [NavMeshPoly(i, p, threatened=False) for i, p in enumerate(polys)]
+    NavMesh.associate_neighbors(navpolys)
+    return NavMesh(navpolys, theater)
+
+
+def linear_localize(navmesh: NavMesh, point: Point) -> Optional[NavMeshPoly]:
+    p = ShapelyPoint(point.x, point.y)
+    for navpoly in navmesh.polys:
+        if navpoly.poly.intersects(p):
+            return navpoly
+    return None
+
+
+def test_localize_matches_linear_scan() -> None:
+    terrain = Caucasus()
+    navmesh = make_navmesh(1000, 100)
+    rng = random.Random(0)
+    points = [
+        Point(rng.uniform(-100, 1100), rng.uniform(-100, 1100), terrain)
+        for _ in range(500)
+    ]
+    # Include points on poly vertices, which are shared by several polys.
+    points.extend(Point(x, y, terrain) for x, y in [(0, 0), (0, 1000), (1000, 0)])
+
+    expected = [linear_localize(navmesh, p) for p in points]
+    assert navmesh.localize_many(points) == expected
+    assert [navmesh.localize(p) for p in points] == expected
+
+
+def test_localize_outside_mesh() -> None:
+    navmesh = make_navmesh(1000, 100)
+    terrain = Caucasus()
+    assert navmesh.localize(Point(-1, -1, terrain)) is None
+    assert navmesh.localize(Point(500, 1001, terrain)) is None
+    assert navmesh.localize_many([]) == []
+
+
+def test_shortest_path_cache(mocker: Any) -> None:
+    terrain = Caucasus()
+    theater = mocker.Mock()
+    theater.terrain = terrain
+    navmesh = make_navmesh(1000, 100, theater)
+    origin = Point(10, 10, terrain)
+    destination = Point(990, 990, terrain)
+
+    path = navmesh.shortest_path(origin, destination)
+    assert navmesh.path_cache_stats.misses == 1
+    assert navmesh.path_cache_stats.hits == 0
+
+    nearby_destination = Point(990.2, 989.9, terrain)
+    cached_path = navmesh.shortest_path(origin, nearby_destination)
+    assert navmesh.path_cache_stats.misses == 1
+    assert navmesh.path_cache_stats.hits == 1
+    assert cached_path[1:-1] == path[1:-1]
+    assert cached_path[0] == origin
+    assert cached_path[-1] == nearby_destination
+
+    navmesh.shortest_path(destination, origin)
+    assert navmesh.path_cache_stats.misses == 2
+
+
+@pytest.mark.benchmark
+def test_benchmark_localize() -> None:
+    terrain = Caucasus()
+    navmesh = make_navmesh(100_000, 5000)
+    rng = random.Random(0)
+    points = [
+        Point(rng.uniform(0, 100_000), rng.uniform(0, 100_000), terrain)
+        for _ in range(1000)
+    ]
+
+    linear = timeit.timeit(
+        lambda: [linear_localize(navmesh, p) for p in points], number=3
+    )
+    indexed = timeit.timeit(lambda: [navmesh.localize(p) for p in points], number=3)
+    batched = timeit.timeit(lambda: navmesh.localize_many(points), number=3)
+    print(
+        f"\nLocalized {len(points)} points in {len(navmesh.polys)} polys: "
+        f"linear {linear / 3:.4f}s, indexed {indexed / 3:.4f}s, "
+        f"batched {batched / 3:.4f}s"
+    )
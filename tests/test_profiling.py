@@ -0,0 +1,90 @@
+from game.profiling import (
+    DurationRecorder,
+    MultiEventTracer,
+    Span,
+    TraceRegistry,
+    logged_duration,
+)
+
+
+def test_duration_recorder_collects_events() -> None:
+    with DurationRecorder() as recorder:
+        with logged_duration("foo"):
+            pass
+        with logged_duration("foo"):
+            pass
+        with MultiEventTracer() as tracer:
+            with tracer.trace("bar"):
+                pass
+
+    assert recorder.events["foo"].count == 2
+    assert recorder.events["bar"].count == 1
+
+
+def test_duration_recorder_inactive_after_exit() -> None:
+    with DurationRecorder() as recorder:
+        pass
+    with logged_duration("foo"):
+        pass
+    assert not recorder.events
+
+
+def test_trace_registry_span_tree() -> None:
+    registry = TraceRegistry()
+    with registry.span("turn"):
+        with registry.span("planning"):
+            pass
+        with registry.span("planning"):
+            pass
+    with registry.span("other"):
+        pass
+
+    turn = registry.last_span("turn")
+    assert turn is not None
+    assert [c.name for c in turn.children] == ["planning", "planning"]
+    assert registry.last_span("planning") is turn.children[-1]
+    assert registry.last_span("missing") is None
+    assert registry.histograms["planning"].count == 2
+
+    trace = registry.to_chrome_trace(registry.recent_root_spans())
+    assert [e["name"] for e in trace["traceEvents"]] == [
+        "turn",
+        "planning",
+        "planning",
+        "other",
+    ]
+
+
+def test_trace_registry_counters() -> None:
+    registry = TraceRegistry()
+    registry.increment("hits")
+    registry.increment("hits", 2)
+    registry.observe("size", 3)
+    summary = registry.to_json()
+    assert summary["counters"] == {"hits": 3}
+    assert summary["histograms"]["size"]["buckets"] == {"4.0": 1}
+
+
+def test_trace_registry_folds_repeated_children() -> None:
+    registry = TraceRegistry()
+    tasks = ["strike", "bai", "barcap"]
+    estimates = 10_000
+    with registry.span("Pass turn"):
+        for i in range(estimates):
+            with registry.span(f"red {tasks[i % len(tasks)]} estimate"):
+                with registry.span("Threat zone update"):
+                    pass
+
+    turn = registry.last_span("Pass turn")
+    assert turn is not None
+    assert len(turn.children) <= Span.MAX_CHILDREN + len(tasks)
+    # Each child keeps at most MAX_CHILDREN children of its own.
+    children_bound = Span.MAX_CHILDREN + len(tasks)
+    assert len(list(turn.iter_spans())) <= 1 + children_bound * (1 + Span.MAX_CHILDREN)
+    assert sum(c.count for c in turn.children) == estimates
+    assert sum(
+        s.count for s in turn.iter_spans() if s.name == "Threat zone update"
+    ) == (estimates)
+    assert registry.histograms["red strike estimate"].count == len(
+        range(0, estimates, len(tasks))
+    )
@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from game import resourcecache
+from game.resourcecache import ResourceDataCache
+
+
+@pytest.fixture
+def resources(tmp_path: Path) -> Path:
+    root = tmp_path / "resources"
+    (root / "units").mkdir(parents=True)
+    (root / "units/a.yaml").write_text("name: A\nprice: 1\n", encoding="utf-8")
+    (root / "b.yaml").write_text("- 1\n- 2\n", encoding="utf-8")
+    return root
+
+
+def fail_to_parse(path: Path) -> Any:
+    raise AssertionError(f"{path} should have been loaded from the cache")
+
+
+def test_load_returns_independent_copies(resources: Path) -> None:
+    cache = ResourceDataCache(resources)
+    data = cache.load(resources / "units/a.yaml")
+    assert data == {"name": "A", "price": 1}
+    data["price"] = 2
+    assert cache.load(resources / "units/a.yaml") == {"name": "A", "price": 1}
+
+
+def test_load_reparses_changed_files(resources: Path) -> None:
+    cache = ResourceDataCache(resources)
+    path = resources / "units/a.yaml"
+    assert cache.load(path)["price"] == 1
+    path.write_text("name: A\nprice: 100\n", encoding="utf-8")
+    assert cache.load(path)["price"] == 100
+
+
+def test_preload_reads_cache_file(
+    resources: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_path = tmp_path / "cache/resources.p"
+    ResourceDataCache(resources).preload(cache_path)
+    assert cache_path.exists()
+
+    monkeypatch.setattr(resourcecache, "_parse_pickled", fail_to_parse)
+    cache = ResourceDataCache(resources)
+    cache.preload(cache_path)
+    assert cache.load(resources / "units/a.yaml") == {"name": "A", "price": 1}
+    assert cache.load(resources / "b.yaml") == [1, 2]
+
+
+def test_preload_drops_deleted_files(resources: Path, tmp_path: Path) -> None:
+    cache_path = tmp_path / "resources.p"
+    cache = ResourceDataCache(resources)
+    cache.preload(cache_path)
+    (resources / "b.yaml").unlink()
+    cache.preload(cache_path)
+    assert cache._documents.keys() == {"units/a.yaml"}
+
+
+def test_files_outside_resources_are_not_cached(
+    resources: Path, tmp_path: Path
+) -> None:
+    path = tmp_path / "faction.yaml"
+    path.write_text("name: Custom\n", encoding="utf-8")
+    cache = ResourceDataCache(resources)
+    assert cache.load(path) == {"name": "Custom"}
+    assert not cache._documents
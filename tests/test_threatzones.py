@@ -0,0 +1,105 @@
+import random
+from dataclasses import dataclass
+
+import numpy as np
+from shapely.geometry import LineString, Point as ShapelyPoint
+
+from game.threatzones import ThreatZones
+from game.utils import Distance, nautical_miles
+
+
+@dataclass(frozen=True)
+class FakePosition:
+    x: float
+    y: float
+
+
+class FakeGroup:
+    def __init__(self, threat_range: Distance, radar_range: Distance) -> None:
+        self.threat_range = threat_range
+        self.radar_range = radar_range
+
+    def max_threat_range(self, radar_only: bool = False) -> Distance:
+        if radar_only:
+            return self.radar_range
+        return self.threat_range
+
+
+class FakeTgo:
+    def __init__(self, x: float, y: float, group: FakeGroup) -> None:
+        self.position = FakePosition(x, y)
+        self.groups = [group]
+
+
+def test_without_air_defense_matches_rebuild() -> None:
+    sam = FakeGroup(nautical_miles(20), nautical_miles(20))
+    aaa = FakeGroup(nautical_miles(5), nautical_miles(0))
+    tgos = [
+        FakeTgo(0, 0, sam),
+        FakeTgo(nautical_miles(15).meters, 0, sam),
+        FakeTgo(nautical_miles(30).meters, 0, aaa),
+        FakeTgo(nautical_miles(200).meters, 0, sam),
+    ]
+    zones = ThreatZones.for_threats(None, None, [], tgos)  # type: ignore
+
+    for removed in tgos:
+        remaining = [t for t in tgos if t is not removed]
+        expected = ThreatZones.for_threats(None, None, [], remaining)  # type: ignore
+        actual = zones.without_air_defense(removed)  # type: ignore
+        for name in ("air_defenses", "radar_sam_threats", "all"):
+            difference = getattr(actual, name).symmetric_difference(
+                getattr(expected, name)
+            )
+            assert difference.area < 1, name
+
+
+def test_without_air_defense_chained_removals() -> None:
+    sam = FakeGroup(nautical_miles(20), nautical_miles(20))
+    tgos = [FakeTgo(nautical_miles(10 * i).meters, 0, sam) for i in range(5)]
+    zones = ThreatZones.for_threats(None, None, [], tgos)  # type: ignore
+    for tgo in tgos:
+        zones = zones.without_air_defense(tgo)  # type: ignore
+    assert zones.all.area < 1
+
+
+def test_without_air_defense_ignores_unknown_tgo() -> None:
+    sam = FakeGroup(nautical_miles(20), nautical_miles(20))
+    zones = ThreatZones.for_threats(
+        None, None, [], [FakeTgo(0, 0, sam)]  # type: ignore
+    )
+    unknown = FakeTgo(0, 0, sam)
+    assert zones.without_air_defense(unknown) is zones  # type: ignore
+
+
+def test_batched_checks_match_scalar_checks() -> None:
+    sam = FakeGroup(nautical_miles(20), nautical_miles(20))
+    aaa = FakeGroup(nautical_miles(5), nautical_miles(0))
+    zones = ThreatZones.for_threats(
+        None,  # type: ignore
+        None,  # type: ignore
+        [],
+        [FakeTgo(0, 0, sam), FakeTgo(nautical_miles(40).meters, 0, aaa)],  # type: ignore
+    )
+    distance = nautical_miles(60).meters
+    rng = random.Random(0)
+    coords = np.array(
+        [
+            (rng.uniform(-distance, distance), rng.uniform(-distance, distance))
+            for _ in range(200)
+        ]
+    )
+    expected = [zones.threatened(ShapelyPoint(x, y)) for x, y in coords]
+    assert list(zones.points_threatened(coords)) == expected
+    expected = [zones.threatened_by_radar_sam(ShapelyPoint(x, y)) for x, y in coords]
+    assert list(zones.points_threatened_by_radar_sam(coords)) == expected
+
+    paths = [coords[i : i + 3] for i in range(0, len(coords), 3)]
+    expected = [zones.threatened(LineString(p)) for p in paths]
+    assert list(zones.paths_threatened(paths)) == expected
+    expected = [zones.threatened_by_radar_sam(LineString(p)) for p in paths]
+    assert list(zones.paths_threatened_by_radar_sam(paths)) == expected
+    assert not zones.paths_threatened([np.zeros((0, 2))]).any()
+    assert list(zones.paths_threatened([[(0, 0)], [(distance, distance)]])) == [
+        True,
+        False,
+    ]
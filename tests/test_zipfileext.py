@@ -1,5 +1,5 @@
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile
 
 import pytest
 
@@ -31,3 +31,54 @@ def test_remove_member(tmp_zip: Path) -> None:
         # requires an intermediate file. It's hard to write bytes, and hard to read str.
         # This is all the single-byte range of UTF-8 anyway, so it doesn't matter.
         assert zip_file.read("b") == b"bar"
+
+
+def test_replace_member_shadows_previous_entry(tmp_zip: Path) -> None:
+    with ZipFile(tmp_zip, "w") as zip_file:
+        zip_file.writestr("a", "foo")
+        zip_file.writestr("b", "bar")
+
+    ZipFileExt.replace_member(tmp_zip, "a", b"baz", ZIP_DEFLATED, 1)
+
+    with ZipFile(tmp_zip, "r") as zip_file:
+        assert zip_file.read("a") == b"baz"
+        assert zip_file.read("b") == b"bar"
+        assert zip_file.getinfo("a").compress_type == ZIP_DEFLATED
+    assert ZipFileExt.shadowed_bytes(tmp_zip)[0] > 0
+
+
+def test_compact_drops_shadowed_entries(tmp_zip: Path) -> None:
+    with ZipFile(tmp_zip, "w") as zip_file:
+        zip_file.writestr("a", "foo")
+        zip_file.writestr("b", "bar")
+    ZipFileExt.replace_member(tmp_zip, "a", b"baz", ZIP_STORED)
+
+    ZipFileExt.compact(tmp_zip)
+
+    assert ZipFileExt.shadowed_bytes(tmp_zip)[0] == 0
+    with ZipFile(tmp_zip, "r") as zip_file:
+        assert zip_file.namelist() == ["a", "b"]
+        assert zip_file.read("a") == b"baz"
+        assert zip_file.read("b") == b"bar"
+
+
+def test_compact_does_not_recompress_members(tmp_zip: Path) -> None:
+    data = bytes(range(256)) * 1000
+    with ZipFile(tmp_zip, "w") as zip_file:
+        zip_file.writestr("fast", data, compress_type=ZIP_DEFLATED, compresslevel=1)
+        zip_file.writestr("lzma", data, compress_type=ZIP_LZMA)
+        zip_file.writestr("shadowed", "foo")
+    ZipFileExt.replace_member(tmp_zip, "shadowed", b"bar", ZIP_STORED)
+    with ZipFile(tmp_zip, "r") as zip_file:
+        before = {i.filename: i for i in zip_file.infolist()}
+
+    ZipFileExt.compact(tmp_zip)
+
+    with ZipFile(tmp_zip, "r") as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.read("fast") == data
+        assert zip_file.read("lzma") == data
+        assert zip_file.read("shadowed") == b"bar"
+        for info in zip_file.infolist():
+            assert info.compress_type == before[info.filename].compress_type
+            assert info.compress_size == before[info.filename].compress_size
@@ -1,7 +1,10 @@
 import os
+import pickle
+from pathlib import Path
+
 import pytest
 
-from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry import MultiPolygon, Polygon, box
 
 from dcs.terrain.caucasus.caucasus import Caucasus
 from game.theater import landmap
@@ -30,3 +33,126 @@ def test_miz() -> None:
 
     if os.path.isfile(test_filename):
         os.remove(test_filename)
+
+
+def test_compact_landmap_matches_landmap(tmp_path: Path) -> None:
+    test_map = landmap.Landmap(
+        inclusion_zones=MultiPolygon(
+            [box(0, 0, 10, 10), box(20, 0, 30, 10), box(40, 0, 50, 10)]
+        ),
+        exclusion_zones=MultiPolygon([box(2, 2, 4, 4), box(22, 2, 24, 4)]),
+        sea_zones=MultiPolygon([box(-100, -100, -1, 100)]),
+    )
+    compact_path = tmp_path / "landmap.lmap"
+    with compact_path.open("wb") as compact_file:
+        landmap.CompactLandmap.write(test_map, compact_file)
+    compact_map = landmap.CompactLandmap(compact_path)
+
+    for x, y in [(1, 1), (3, 3), (-5, 5), (15, 5), (23, 3), (45, 5), (60, 60)]:
+        assert compact_map.in_inclusion_zone(x, y) == test_map.in_inclusion_zone(x, y)
+        assert compact_map.in_exclusion_zone(x, y) == test_map.in_exclusion_zone(x, y)
+        assert compact_map.in_sea_zone(x, y) == test_map.in_sea_zone(x, y)
+
+    # Only the polygons near the queried points were parsed.
+    assert isinstance(compact_map.inclusion, landmap.CompactLandmapLayer)
+    assert isinstance(compact_map.exclusion, landmap.CompactLandmapLayer)
+    assert compact_map.inclusion.materialized_count == 3
+    assert compact_map.exclusion.materialized_count == 2
+
+    assert compact_map.inclusion_zones.equals(test_map.inclusion_zones)
+    assert compact_map.exclusion_zones.equals(test_map.exclusion_zones)
+    assert compact_map.sea_zones.equals(test_map.sea_zones)
+
+
+def test_compact_landmap_pickles_path_only(tmp_path: Path) -> None:
+    test_map = landmap.Landmap(
+        inclusion_zones=MultiPolygon([box(0, 0, 10, 10)]),
+        exclusion_zones=MultiPolygon([]),
+        sea_zones=MultiPolygon([]),
+    )
+    compact_path = tmp_path / "landmap.lmap"
+    with compact_path.open("wb") as compact_file:
+        landmap.CompactLandmap.write(test_map, compact_file)
+
+    data = pickle.dumps(landmap.CompactLandmap(compact_path))
+    assert len(data) < 1024
+    loaded = pickle.loads(data)
+    assert loaded.in_inclusion_zone(5, 5)
+    assert not loaded.in_sea_zone(5, 5)
+
+
+def test_compact_landmap_falls_back_to_pickle_when_missing(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    test_map = landmap.Landmap(
+        inclusion_zones=MultiPolygon([box(0, 0, 10, 10)]),
+        exclusion_zones=MultiPolygon([box(2, 2, 4, 4)]),
+        sea_zones=MultiPolygon([box(-100, -100, -1, 100)]),
+    )
+    compact_path = tmp_path / "landmap.lmap"
+    with compact_path.open("wb") as compact_file:
+        landmap.CompactLandmap.write(test_map, compact_file)
+    with (tmp_path / "landmap.p").open("wb") as pickle_file:
+        pickle.dump(test_map, pickle_file)
+
+    data = pickle.dumps(landmap.CompactLandmap(compact_path))
+    compact_path.unlink()
+    loaded = pickle.loads(data)
+
+    assert "falling back to" in caplog.text
+    assert loaded.in_inclusion_zone(5, 5)
+    assert loaded.in_exclusion_zone(3, 3)
+    assert loaded.in_sea_zone(-5, 5)
+    assert loaded.inclusion_zones.equals(test_map.inclusion_zones)
+    assert list(loaded.classify_points([(5, 5), (60, 60)])) == [
+        landmap.LandClass.LAND,
+        landmap.LandClass.NONE,
+    ]
+
+
+def test_classify_points_matches_point_queries(tmp_path: Path) -> None:
+    test_map = landmap.Landmap(
+        inclusion_zones=MultiPolygon([box(0, 0, 10, 10), box(20, 0, 30, 10)]),
+        exclusion_zones=MultiPolygon([box(2, 2, 4, 4)]),
+        sea_zones=MultiPolygon([box(-100, -100, 0.5, 100)]),
+    )
+    compact_path = tmp_path / "landmap.lmap"
+    with compact_path.open("wb") as compact_file:
+        landmap.CompactLandmap.write(test_map, compact_file)
+    compact_map = landmap.CompactLandmap(compact_path)
+
+    points = [(5, 5), (3, 3), (-5, 5), (0.25, 5), (15, 5), (25, 5), (60, 60)]
+    expected = [
+        landmap.LandClass.LAND,
+        landmap.LandClass.EXCLUDED,
+        landmap.LandClass.SEA,
+        landmap.LandClass.LAND,
+        landmap.LandClass.NONE,
+        landmap.LandClass.LAND,
+        landmap.LandClass.NONE,
+    ]
+    assert list(test_map.classify_points(points)) == expected
+    assert list(compact_map.classify_points(points)) == expected
+    assert len(test_map.classify_points([])) == 0
+
+
+def test_nearest_polygon() -> None:
+    layer = landmap.PreparedLandmapLayer(
+        MultiPolygon([box(0, 0, 10, 10), box(20, 0, 30, 10), box(0, 40, 100, 50)])
+    )
+    assert layer.nearest(17, 5) == box(20, 0, 30, 10)
+    assert layer.nearest(5, 30) == box(0, 40, 100, 50)
+    assert layer.nearest(5, 5) == box(0, 0, 10, 10)
+    assert landmap.PreparedLandmapLayer(MultiPolygon([])).nearest(0, 0) is None
+
+
+def test_landmap_does_not_pickle_index() -> None:
+    test_map = landmap.Landmap(
+        inclusion_zones=MultiPolygon([box(0, 0, 10, 10)]),
+        exclusion_zones=MultiPolygon([]),
+        sea_zones=MultiPolygon([]),
+    )
+    assert test_map.in_inclusion_zone(5, 5)
+    loaded = pickle.loads(pickle.dumps(test_map))
+    assert "inclusion" not in loaded.__dict__
+    assert loaded.in_inclusion_zone(5, 5)